@@ -131,6 +131,32 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Caches
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Anonymous API responses (blog/response_cache.py). LocMemCache is per
+    # process; to share entries and invalidations between worker processes
+    # on one host use the file backend instead:
+    #   'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    #   'LOCATION': BASE_DIR / 'var' / 'api_cache',
+    'blog_api': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blog-api',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+BLOG_API_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'blog_api',
+    'TIMEOUT': 60,
+}
+
+
 # Add this for Django Filter backend
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -148,4 +174,21 @@ REST_FRAMEWORK = {
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
     "http://127.0.0.1:3000",
-]
\ No newline at end of file
+]
+# Buffered post-view tracking (see blog/view_tracking.py)
+BLOG_VIEW_TRACKING = {
+    'BATCH_SIZE': 500,
+    'FLUSH_INTERVAL': 2.0,
+    'MAX_PENDING': 50000,
+    'SAMPLE_RATE': 1.0,
+    'SPOOL_DIR': BASE_DIR / 'var' / 'post_views',
+}
+
+# Hourly/daily post view rollups (see blog/rollups.py); run
+# `manage.py rollup_post_views --compact` from cron, e.g. every 5 minutes
+BLOG_VIEW_ROLLUPS = {
+    'BATCH_SIZE': 20000,
+    'RAW_RETENTION_DAYS': 30,
+    'HOURLY_RETENTION_DAYS': 90,
+    'ARCHIVE_DIR': BASE_DIR / 'var' / 'post_view_archive',
+}
@@ -0,0 +1,120 @@
+"""Search latency of GET /blog/api/posts/?search= : LIKE vs full-text index.
+
+Creates a throwaway test database (the configured PostgreSQL database, or
+SQLite with --sqlite), bulk-loads --posts synthetic posts whose words follow
+a Zipf-like distribution, builds the search index and then times the first
+page of `?search=` for terms of different frequency, once with the previous
+LIKE search (BLOG_SEARCH BACKEND 'like') and once with the full-text
+backend of that database.
+
+    python bench_search.py --posts 100000            # PostgreSQL (settings.py)
+    python bench_search.py --posts 100000 --sqlite   # SQLite FTS5
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+
+def make_vocabulary(size, rng):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(letters) for _ in range(rng.randint(4, 10))))
+    return sorted(words)
+
+
+def load_posts(n, words_per_post, rng):
+    from django.contrib.auth.models import User
+
+    from blog.models import Post
+
+    vocab = make_vocabulary(20000, rng)
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    author = User.objects.create(username='bench')
+    batch = []
+    for i in range(n):
+        words = rng.choices(vocab, weights, k=words_per_post)
+        batch.append(Post(
+            title=' '.join(words[:6]), slug=f'post-{i}', excerpt=' '.join(words[6:30]),
+            content=' '.join(words), author=author, status='published',
+        ))
+        if len(batch) == 2000:
+            Post.objects.bulk_create(batch)
+            batch = []
+    Post.objects.bulk_create(batch)
+    return vocab
+
+
+def time_search(client, term, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get('/blog/api/posts/', {'search': term})
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.status_code
+    return statistics.median(samples), len(response.data['results'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--words', type=int, default=150, help='Words per post')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--sqlite', action='store_true', help='Use SQLite/FTS5 instead of settings.DATABASES')
+    args = parser.parse_args()
+
+    from django.conf import settings
+    if args.sqlite:
+        settings.DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}}
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.BLOG_API_CACHE = {'ENABLED': False}
+
+    import django
+    django.setup()
+    from django.db import connection
+    from django.test import Client, override_settings
+    from django.test.utils import setup_databases, teardown_databases
+
+    from blog.search import reindex, search_backend
+
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        rng = random.Random(42)
+        start = time.perf_counter()
+        vocab = load_posts(args.posts, args.words, rng)
+        loaded = time.perf_counter() - start
+        start = time.perf_counter()
+        reindex()
+        indexed = time.perf_counter() - start
+        if connection.vendor == 'postgresql':
+            # Planner statistics, as autovacuum keeps them on a live database
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        backend = search_backend()
+        print(f"{connection.vendor}: {args.posts} posts loaded in {loaded:.1f}s, "
+              f"{backend} index built in {indexed:.1f}s")
+
+        terms = {
+            'common': vocab[0],
+            'mid': vocab[200],
+            'rare': vocab[15000],
+            'two words': f'{vocab[3]} {vocab[50]}',
+            'absent': 'zzzzqqqq',
+        }
+        client = Client()
+        print(f"{'term':<12}{'like ms':>10}{backend + ' ms':>14}{'speedup':>10}")
+        for label, term in terms.items():
+            with override_settings(BLOG_SEARCH={'BACKEND': 'like'}):
+                like_ms, _ = time_search(client, term, args.repeat)
+            fts_ms, _ = time_search(client, term, args.repeat)
+            print(f"{label:<12}{like_ms:>10.1f}{fts_ms:>14.1f}{like_ms / fts_ms:>9.1f}x")
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,19 @@
 from django.contrib import admin
-from .models import Category, Tag, Post, Comment, PostView
+from .counters import recount_comments
+from .models import Category, Tag, Post, Comment, PostView, PostViewRollup
+from .response_cache import evict
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ['name', 'slug', 'created_at']
+    list_display = ['name', 'slug', 'published_post_count', 'created_at']
     prepopulated_fields = {'slug': ('name',)}
     search_fields = ['name']
 
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    list_display = ['name', 'slug', 'created_at']
+    list_display = ['name', 'slug', 'published_post_count', 'created_at']
     prepopulated_fields = {'slug': ('name',)}
     search_fields = ['name']
 
@@ -24,7 +26,8 @@ class CommentInline(admin.TabularInline):
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ['title', 'author', 'category', 'status', 'publish_date', 'created_at']
+    list_display = ['title', 'author', 'category', 'status', 'publish_date',
+                    'comment_count', 'view_count', 'created_at']
     list_filter = ['status', 'category', 'tags', 'publish_date']
     search_fields = ['title', 'content', 'excerpt']
     prepopulated_fields = {'slug': ('title',)}
@@ -57,7 +60,10 @@ class CommentAdmin(admin.ModelAdmin):
     actions = ['approve_comments']
 
     def approve_comments(self, request, queryset):
+        post_ids = set(queryset.values_list('post_id', flat=True))
         queryset.update(is_approved=True)
+        recount_comments(post_ids)  # update() skips the counter signals
+        evict(*(f'post:{pk}' for pk in post_ids))
     approve_comments.short_description = "Approve selected comments"
 
 
@@ -65,4 +71,12 @@ class CommentAdmin(admin.ModelAdmin):
 class PostViewAdmin(admin.ModelAdmin):
     list_display = ['post', 'ip_address', 'viewed_at']
     list_filter = ['viewed_at']
-    search_fields = ['post__title', 'ip_address']
\ No newline at end of file
+    search_fields = ['post__title', 'ip_address']
+
+
+@admin.register(PostViewRollup)
+class PostViewRollupAdmin(admin.ModelAdmin):
+    list_display = ['post', 'period', 'bucket', 'views']
+    list_filter = ['period', 'bucket']
+    search_fields = ['post__title']
+    raw_id_fields = ['post']
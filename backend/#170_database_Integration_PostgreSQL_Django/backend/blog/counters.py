@@ -0,0 +1,94 @@
+"""Denormalized counters on Post, Category and Tag.
+
+`Post.comment_count` (approved comments), `Post.view_count` (recorded views,
+including those whose PostView rows were pruned after being rolled up) and
+`Category/Tag.published_post_count` are read by the serializers instead of
+running a COUNT per object. They are kept current incrementally: the
+receivers in blog.signals and the view tracker call `adjust()`, which issues
+one `UPDATE ... SET n = n + delta` per distinct delta.
+
+Bulk `QuerySet.update()`/raw SQL bypass the signals; callers doing that
+recount the affected rows (see `recount_comments`), and
+`manage.py recount_blog_counters` recomputes everything from scratch.
+"""
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Category, Comment, Post, PostView, PostViewRollup, Tag
+from .rollups import get_state
+
+
+def adjust(model, field, deltas):
+    """Add `deltas[pk]` to `field` of each row, grouping pks by delta."""
+    by_delta = defaultdict(list)
+    for pk, delta in deltas.items():
+        if pk is not None and delta:
+            by_delta[delta].append(pk)
+    for delta, pks in by_delta.items():
+        rows = model.objects.filter(pk__in=pks)
+        if delta < 0:
+            rows = rows.filter(**{f'{field}__gte': -delta})  # never below zero
+        rows.update(**{field: F(field) + delta})
+
+
+def add_views(post_ids):
+    """Count freshly inserted PostView rows (an iterable of post ids)."""
+    adjust(Post, 'view_count', Counter(post_ids))
+
+
+def _count(queryset, group_by):
+    """A correlated `COUNT(*)` subquery over `queryset` grouped by `group_by`."""
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values(group_by).annotate(n=Count('pk')).values('n'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def recount_comments(post_ids=None):
+    posts = Post.objects.all() if post_ids is None else Post.objects.filter(pk__in=post_ids)
+    posts.update(comment_count=_count(
+        Comment.objects.filter(post=OuterRef('pk'), is_approved=True), 'post'
+    ))
+
+
+def recount_views(post_ids=None):
+    # PostView rows up to the rollup watermark may have been pruned; their
+    # views live on in the daily rollups (blog.rollups)
+    rolled_up_to = get_state().rolled_up_to
+    rolled_up = Coalesce(
+        Subquery(
+            PostViewRollup.objects.filter(post=OuterRef('pk'), period=PostViewRollup.DAY)
+            .order_by().values('post').annotate(n=Sum('views')).values('n'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+    pending = _count(PostView.objects.filter(post=OuterRef('pk'), pk__gt=rolled_up_to), 'post')
+    posts = Post.objects.all() if post_ids is None else Post.objects.filter(pk__in=post_ids)
+    posts.update(view_count=rolled_up + pending)
+
+
+def recount_published_posts(category_ids=None, tag_ids=None):
+    """Recount `category_ids`/`tag_ids` (all rows of both when both are None)."""
+    if category_ids is None and tag_ids is None:
+        categories, tags = Category.objects.all(), Tag.objects.all()
+    else:
+        categories = Category.objects.filter(pk__in=category_ids or [])
+        tags = Tag.objects.filter(pk__in=tag_ids or [])
+    categories.update(published_post_count=_count(
+        Post.objects.filter(category=OuterRef('pk'), status='published'), 'category'
+    ))
+    tags.update(published_post_count=_count(
+        Post.tags.through.objects.filter(tag=OuterRef('pk'), post__status='published'), 'tag'
+    ))
+
+
+def recount_all():
+    recount_comments()
+    recount_views()
+    recount_published_posts()
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.bulk import FORMATS, guess_format, open_stream, write_records
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Export posts (and, as NDJSON, categories and tags) in the import_posts format'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to write ('-' for stdout, '.gz' for gzipped)")
+        parser.add_argument('--format', choices=FORMATS,
+                            help='Default: csv for .csv(.gz) files, otherwise ndjson')
+        parser.add_argument('--status', choices=[value for value, _ in Post.STATUS_CHOICES])
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Posts fetched per query while streaming')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or guess_format(options['path'])
+        posts = Post.objects.all()
+        if options['status']:
+            posts = posts.filter(status=options['status'])
+        try:
+            with open_stream(options['path'], 'w') as stream:
+                written = write_records(stream, fmt, posts, chunk_size=options['chunk_size'])
+        except OSError as exc:
+            raise CommandError(exc)
+        if options['path'] != '-':
+            self.stdout.write(self.style.SUCCESS(f'Exported {written} posts.'))
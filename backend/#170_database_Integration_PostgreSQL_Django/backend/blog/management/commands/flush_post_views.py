@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from blog.view_tracking import ViewTracker, get_view_tracker
+
+
+class Command(BaseCommand):
+    help = 'Write spooled post views that were not flushed (e.g. after a crash or a DB outage)'
+
+    def handle(self, *args, **options):
+        config = get_view_tracker()
+        if config.spool_dir is None:
+            self.stdout.write('BLOG_VIEW_TRACKING has no SPOOL_DIR; nothing to replay.')
+            return
+        tracker = ViewTracker(batch_size=config.batch_size,
+                              spool_dir=config.spool_dir, background=False)
+        written = tracker.flush()
+        if tracker.failed_flushes:
+            self.stderr.write(self.style.ERROR(
+                f'{tracker.failed_flushes} spool file(s) could not be written; kept for retry.'
+            ))
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} post views.'))
@@ -0,0 +1,43 @@
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog.bulk import FORMATS, PostImporter, RecordError, guess_format, open_stream, read_records
+
+
+class Command(BaseCommand):
+    help = 'Import posts, categories and tags from NDJSON or CSV (see blog/bulk.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to read ('-' for stdin, '.gz' for gzipped)")
+        parser.add_argument('--format', choices=FORMATS,
+                            help='Default: csv for .csv(.gz) files, otherwise ndjson')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Posts written per bulk insert/upsert and transaction')
+        parser.add_argument('--author', help='Username for posts without an author')
+        parser.add_argument('--atomic', action='store_true',
+                            help='Import everything in one transaction (all or nothing)')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or guess_format(options['path'])
+        start = time.perf_counter()
+        importer = PostImporter(batch_size=options['batch_size'], default_author=options['author'])
+        try:
+            with open_stream(options['path'], 'r') as stream, \
+                    transaction.atomic() if options['atomic'] else nullcontext():
+                for line_no, record in read_records(stream, fmt):
+                    importer.add(line_no, record)
+                importer.finish()
+        except RecordError as exc:
+            if not options['atomic'] and importer.created + importer.updated:
+                exc = f'{exc} (earlier batches were kept: {importer.created} created, ' \
+                      f'{importer.updated} updated)'
+            raise CommandError(exc)
+        except OSError as exc:
+            raise CommandError(exc)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {importer.created + importer.updated} posts ({importer.created} created, '
+            f'{importer.updated} updated) in {time.perf_counter() - start:.1f}s.'
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.search import reindex, search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the post full-text search index (after bulk loads that skip signals)'
+
+    def handle(self, *args, **options):
+        backend = search_backend()
+        if backend == 'like':
+            self.stdout.write('BLOG_SEARCH uses LIKE; there is no index to rebuild.')
+            return
+        reindex()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the {backend} search index.'))
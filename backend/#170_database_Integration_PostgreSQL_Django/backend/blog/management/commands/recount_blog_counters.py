@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import recount_all
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized comment, view and published post counters'
+
+    def handle(self, *args, **options):
+        recount_all()
+        self.stdout.write(self.style.SUCCESS('Counters recomputed.'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from blog.rollups import compact, rollup_views
+
+
+class Command(BaseCommand):
+    help = 'Roll new post views up into hourly/daily counts; --compact also prunes old raw views'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-settle', action='store_false', dest='settle',
+                            help='Roll up to the newest view now instead of the one seen by the '
+                                 'previous run (only safe while nothing is writing views)')
+        parser.add_argument('--compact', action='store_true',
+                            help='Then delete rolled-up views and hourly rollups past retention')
+        parser.add_argument('--raw-retention-days', type=int)
+        parser.add_argument('--hourly-retention-days', type=int)
+        parser.add_argument('--archive-dir', help='Write pruned views here (gzipped NDJSON) first')
+
+    def handle(self, *args, **options):
+        rolled = rollup_views(settle=options['settle'])
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {rolled} post views.'))
+        if options['compact']:
+            views, hours = compact(
+                raw_retention_days=options['raw_retention_days'],
+                hourly_retention_days=options['hourly_retention_days'],
+                archive_dir=options['archive_dir'],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f'Pruned {views} post views and {hours} hourly rollups.'
+            ))
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:20
+
+import blog.models
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        config = getattr(settings, 'BLOG_SEARCH', {}).get('CONFIG', 'english')
+        schema_editor.execute(
+            'CREATE INDEX blog_post_search_vector_gin ON blog_post USING gin (search_vector)'
+        )
+        Post = apps.get_model('blog', 'Post')
+        Post.objects.update(search_vector=(
+            SearchVector('title', weight='A', config=config)
+            + SearchVector('excerpt', weight='B', config=config)
+            + SearchVector('content', weight='C', config=config)
+        ))
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE blog_post_fts USING fts5("
+            "title, excerpt, content, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            'INSERT INTO blog_post_fts (rowid, title, excerpt, content) '
+            'SELECT id, title, excerpt, content FROM blog_post'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS blog_post_search_vector_gin')
+    elif vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS blog_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='PostSearchDocument',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='blog.post')),
+                ('document', blog.models.FullTextField(db_column='blog_post_fts')),
+            ],
+            options={
+                'db_table': 'blog_post_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostViewRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rolled_up_to', models.BigIntegerField(default=0)),
+                ('horizon', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PostViewRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_rollups', to='blog.post')),
+            ],
+            options={
+                'verbose_name': 'Post View Rollup',
+                'verbose_name_plural': 'Post View Rollups',
+                'indexes': [models.Index(fields=['period', 'bucket'], name='blog_postvi_period_1d374a_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postviewrollup',
+            constraint=models.UniqueConstraint(fields=('post', 'period', 'bucket'), name='blog_postviewrollup_post_period_bucket'),
+        ),
+    ]
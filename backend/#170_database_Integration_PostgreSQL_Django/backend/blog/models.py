@@ -1,16 +1,42 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.urls import reverse
 
 
-class Category(models.Model):
+class MaintainedFieldsMixin:
+    """Keep `save()` from overwriting columns the database maintains.
+
+    Counters are adjusted in place with F() updates (blog.signals,
+    blog.counters) and the search vector is recomputed after each save
+    (blog.search), so the copy on an instance loaded earlier may be stale;
+    updates of an existing row write every loaded field except those in
+    `maintained_fields`.
+    """
+    maintained_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None \
+                and not kwargs.get('force_insert'):
+            skip = set(self.maintained_fields) | self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.attname not in skip and f.name not in skip
+            ]
+        super().save(*args, **kwargs)
+
+
+class Category(MaintainedFieldsMixin, models.Model):
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(max_length=100, unique=True)
     description = models.TextField(blank=True)
+    published_post_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    maintained_fields = ('published_post_count',)
+
     class Meta:
         verbose_name = 'Category'
         verbose_name_plural = 'Categories'
@@ -23,11 +49,14 @@ class Category(models.Model):
         return reverse('post-list') + f'?category={self.slug}'
 
 
-class Tag(models.Model):
+class Tag(MaintainedFieldsMixin, models.Model):
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(max_length=50, unique=True)
+    published_post_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    maintained_fields = ('published_post_count',)
+
     class Meta:
         ordering = ['name']
 
@@ -35,7 +64,7 @@ class Tag(models.Model):
         return self.name
 
 
-class Post(models.Model):
+class Post(MaintainedFieldsMixin, models.Model):
     STATUS_CHOICES = [
         ('draft', 'Draft'),
         ('published', 'Published'),
@@ -81,6 +110,15 @@ class Post(models.Model):
     meta_title = models.CharField(max_length=200, blank=True)
     meta_description = models.TextField(max_length=300, blank=True)
 
+    # Denormalized counters (approved comments, recorded views)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    view_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Full-text search document (PostgreSQL; see blog/search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    maintained_fields = ('comment_count', 'view_count', 'search_vector')
+
     class Meta:
         ordering = ['-publish_date']
         indexes = [
@@ -133,7 +171,8 @@ class PostView(models.Model):
     
     ip_address = models.GenericIPAddressField()
     user_agent = models.TextField(blank=True)
-    viewed_at = models.DateTimeField(auto_now_add=True)
+    # Set when the view happens, not when the buffered row is inserted
+    viewed_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         indexes = [
@@ -143,4 +182,84 @@ class PostView(models.Model):
         verbose_name_plural = 'Post Views'
 
     def __str__(self):
-        return f'View of {self.post.title} at {self.viewed_at}'
\ No newline at end of file
+        return f'View of {self.post.title} at {self.viewed_at}'
+
+
+class PostViewRollup(models.Model):
+    """Number of PostView rows of one post in one hour or day (blog/rollups.py)."""
+    HOUR = 'hour'
+    DAY = 'day'
+    PERIOD_CHOICES = [
+        (HOUR, 'Hour'),
+        (DAY, 'Day'),
+    ]
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='view_rollups'
+    )
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    # Start of the hour or (UTC) day
+    bucket = models.DateTimeField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'period', 'bucket'],
+                                    name='blog_postviewrollup_post_period_bucket'),
+        ]
+        indexes = [
+            models.Index(fields=['period', 'bucket']),
+        ]
+        verbose_name = 'Post View Rollup'
+        verbose_name_plural = 'Post View Rollups'
+
+    def __str__(self):
+        return f'{self.views} views of post {self.post_id} ({self.period} of {self.bucket})'
+
+
+class PostViewRollupState(models.Model):
+    """How far the PostView rows have been rolled up (a single row)."""
+    # Every PostView with id <= rolled_up_to is counted in the rollups
+    rolled_up_to = models.BigIntegerField(default=0)
+    # Highest PostView id seen by the previous rollup run
+    horizon = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'Post views rolled up to #{self.rolled_up_to}'
+
+
+class FullTextField(models.TextField):
+    """The hidden column of an SQLite FTS5 table; supports `__match`."""
+
+
+@FullTextField.register_lookup
+class FullTextMatch(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class PostSearchDocument(models.Model):
+    """A row of the SQLite FTS5 search table (blog/search.py).
+
+    Lets the ORM join posts to their full-text matches; the table is created
+    by migration 0004 on SQLite only and maintained by blog.search.
+    """
+    post = models.OneToOneField(
+        Post,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search_document'
+    )
+    document = FullTextField(db_column='blog_post_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'blog_post_fts'
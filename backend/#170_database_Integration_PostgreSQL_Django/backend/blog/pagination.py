@@ -0,0 +1,31 @@
+"""Cursor (keyset) pagination for the blog API.
+
+Each page is fetched with `WHERE <ordering field> < <cursor position>
+ORDER BY ... LIMIT page_size + 1` instead of an OFFSET, so page N costs the
+same as page 1 and no COUNT(*) runs. The orderings match the model indexes:
+posts `(-publish_date, status)`, comments `(post, is_approved, created_at)`
+and post views `(post, viewed_at)`. Responses carry `next`/`previous` links
+instead of `count`; `page_size` is capped so every response stays bounded.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class PostCursorPagination(CursorPagination):
+    ordering = '-publish_date'
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CommentCursorPagination(CursorPagination):
+    ordering = '-created_at'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class PostViewCursorPagination(CursorPagination):
+    ordering = '-viewed_at'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -0,0 +1,208 @@
+"""Response cache for anonymous reads of the blog API.
+
+Entries hold the serialized `response.data` (re-rendered per hit, so content
+negotiation keeps working) under a key built from the host, path and the
+full, order-normalized query string, so every combination of filters,
+search, ordering and page is its own entry.
+
+Invalidation is tag based. Each entry lists the tags it depends on (e.g.
+`post:12`, `category:3`, `posts`) together with the version each tag had
+when the entry was stored; tag versions live in the same cache. Evicting a
+tag writes a new version, which makes every entry that saw the old version
+a miss. blog.signals evicts the tags affected by each saved or deleted
+Post, Comment, Category or Tag once the transaction commits. View counts are
+not invalidated; they may lag by up to `TIMEOUT` seconds.
+
+The tags of an entry are only known once its data is rendered, so a miss
+reads the cache-wide eviction generation (replaced by every eviction, before
+the tag versions) before rendering, and the entry is stored only if the
+generation is unchanged after its tag versions were read. An eviction that
+lands while stale data is being rendered therefore either prevents the store
+or bumps a tag version the entry recorded, never leaves stale data cached
+under the new versions.
+
+Any Django cache backend works; the settings configure LocMemCache
+(per process) and show the FileBasedCache alternative (shared by all worker
+processes on a host).
+
+Hits carry a weak ETag and Last-Modified, and conditional requests
+(If-None-Match / If-Modified-Since) get a 304.
+"""
+import hashlib
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+DEFAULTS = {
+    'ENABLED': True,
+    'ALIAS': 'default',   # entry in settings.CACHES
+    'TIMEOUT': 60,        # seconds an entry may be served
+    'KEY_PREFIX': 'blog-api',
+}
+
+
+def _config():
+    # Read on every call so override_settings() in tests takes effect
+    return {**DEFAULTS, **getattr(settings, 'BLOG_API_CACHE', {})}
+
+
+@dataclass
+class CacheEntry:
+    data: object
+    etag: str
+    last_modified: int
+    versions: dict = field(default_factory=dict)
+    extra: dict = field(default_factory=dict)
+
+
+def post_tags(item):
+    """Tags for one serialized post: the post and the category/tags it embeds."""
+    tags = {f"post:{item['id']}"}
+    if item.get('category'):
+        tags.add(f"category:{item['category']['id']}")
+    tags.update(f"tag:{tag['id']}" for tag in item.get('tags', ()))
+    return tags
+
+
+class ResponseCache:
+    def __init__(self, alias='default', timeout=60, key_prefix='blog-api'):
+        self.cache = caches[alias]
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    @staticmethod
+    def cacheable(request):
+        return request.method in ('GET', 'HEAD') and not request.user.is_authenticated
+
+    def key(self, request):
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        raw = f'{request.get_host()}{request.path}?{query}'
+        return f'{self.key_prefix}:resp:{hashlib.sha256(raw.encode()).hexdigest()}'
+
+    def _tag_key(self, tag):
+        return f'{self.key_prefix}:tag:{tag}'
+
+    @property
+    def _generation_key(self):
+        return f'{self.key_prefix}:generation'
+
+    def generation(self):
+        """Read before rendering a miss and pass to `set()`."""
+        return self.cache.get(self._generation_key)
+
+    def get(self, request):
+        entry = self.cache.get(self.key(request))
+        if entry is None:
+            return None
+        current = self.cache.get_many(list(entry.versions))
+        if current != entry.versions:
+            return None  # one of its tags was evicted since it was stored
+        return entry
+
+    def set(self, request, data, tags, extra=None, generation=None):
+        """Build the entry for `data`; store it unless an eviction happened
+        since `generation()` returned `generation`."""
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        versions = self.cache.get_many(tag_keys)
+        missing = {key: uuid.uuid4().hex for key in tag_keys if key not in versions}
+        if missing:
+            self.cache.set_many(missing, timeout=None)
+            versions.update(missing)
+        body = json.dumps(data, sort_keys=True, default=str).encode()
+        entry = CacheEntry(
+            data=data,
+            etag=f'W/"{hashlib.sha1(body).hexdigest()}"',
+            last_modified=int(time.time()),
+            versions=versions,
+            extra=extra or {},
+        )
+        if self.generation() == generation:
+            self.cache.set(self.key(request), entry, self.timeout)
+        return entry
+
+    def invalidate(self, tags):
+        # The generation first: a render that read its tag versions before
+        # they change must still see a new generation
+        self.cache.set(self._generation_key, uuid.uuid4().hex, timeout=None)
+        self.cache.set_many({self._tag_key(tag): uuid.uuid4().hex for tag in tags},
+                            timeout=None)
+
+    @staticmethod
+    def respond(request, entry):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        if if_none_match is not None:
+            not_modified = entry.etag in [t.strip() for t in if_none_match.split(',')] \
+                or if_none_match.strip() == '*'
+        else:
+            not_modified = if_modified_since is not None \
+                and entry.last_modified <= if_modified_since
+        response = Response(None if not_modified else entry.data,
+                            status=status.HTTP_304_NOT_MODIFIED if not_modified else status.HTTP_200_OK)
+        response['ETag'] = entry.etag
+        response['Last-Modified'] = http_date(entry.last_modified)
+        return response
+
+
+def get_response_cache():
+    """The configured cache, or None when disabled."""
+    config = _config()
+    if not config['ENABLED']:
+        return None
+    return ResponseCache(config['ALIAS'], config['TIMEOUT'], config['KEY_PREFIX'])
+
+
+def evict(*tags):
+    """Evict `tags` once the current transaction (if any) commits."""
+    response_cache = get_response_cache()
+    if response_cache is not None and tags:
+        transaction.on_commit(lambda: response_cache.invalidate(tags))
+
+
+class CachedReadMixin:
+    """Serve `list`/`retrieve` to anonymous users from the response cache.
+
+    Entries depend on `cache_list_tag` (lists) or `<cache_object_tag>:<id>`
+    (details); override `list_cache_tags`/`detail_cache_tags` when the data
+    embeds other objects.
+    """
+    cache_list_tag = None
+    cache_object_tag = None
+
+    def list_cache_tags(self, data):
+        return {self.cache_list_tag}
+
+    def detail_cache_tags(self, data):
+        return {f'{self.cache_object_tag}:{data["id"]}'}
+
+    def cached_response(self, request, render, tags):
+        """Return (response, extra); `render()` returns (data, extra)."""
+        response_cache = get_response_cache()
+        if response_cache is None or not response_cache.cacheable(request):
+            data, extra = render()
+            return Response(data), extra
+        entry = response_cache.get(request)
+        if entry is None:
+            generation = response_cache.generation()
+            data, extra = render()
+            entry = response_cache.set(request, data, tags(data), extra, generation)
+        return response_cache.respond(request, entry), entry.extra
+
+    def list(self, request, *args, **kwargs):
+        def render():
+            return super(CachedReadMixin, self).list(request, *args, **kwargs).data, None
+        return self.cached_response(request, render, self.list_cache_tags)[0]
+
+    def retrieve(self, request, *args, **kwargs):
+        def render():
+            return super(CachedReadMixin, self).retrieve(request, *args, **kwargs).data, None
+        return self.cached_response(request, render, self.detail_cache_tags)[0]
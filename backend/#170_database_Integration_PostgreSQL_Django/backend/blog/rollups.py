@@ -0,0 +1,202 @@
+"""Hourly and daily PostView rollups.
+
+Raw `PostView` rows grow with every read, so time series are served from
+`PostViewRollup` instead: one row per post and hour, and per post and (UTC)
+day, holding the number of views in that bucket.
+
+`rollup_views()` folds new PostView rows into the rollups incrementally. It
+walks PostView ids above `PostViewRollupState.rolled_up_to` in id ranges of
+`BATCH_SIZE`, adding each range's per-bucket counts and advancing the
+watermark in the same transaction, so a run can stop at any point and the
+next one resumes where it left off. Views are bucketed by `viewed_at`, so
+rows that arrive late (spool replays) still land in the right hour.
+
+Ids are assigned when an insert starts but become visible when it commits,
+so a batch still in flight can hold ids below the newest visible one. A run
+therefore only goes up to the newest id seen by the *previous* run
+(`horizon`); pass `settle=False` when nothing else is writing (tests, one-off
+backfills).
+
+`compact()` deletes PostView rows older than `RAW_RETENTION_DAYS` that are
+already rolled up, optionally archiving them first as gzipped NDJSON under
+`ARCHIVE_DIR`, and hourly rollups older than `HOURLY_RETENTION_DAYS`; daily
+rollups are kept. `Post.view_count` is recounted from the daily rollups
+plus the PostView rows not rolled up yet (blog.counters.recount_views), so
+pruning raw rows does not lower it.
+
+Settings (`BLOG_VIEW_ROLLUPS` in settings.py), see `DEFAULTS`.
+"""
+import datetime
+import gzip
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max, Value
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .models import PostView, PostViewRollup, PostViewRollupState
+
+DEFAULTS = {
+    'BATCH_SIZE': 20000,            # PostView ids rolled up per transaction
+    'RAW_RETENTION_DAYS': 30,       # compact() prunes rolled-up PostView rows older than this
+    'HOURLY_RETENTION_DAYS': 90,    # ... and hourly rollups older than this
+    'ARCHIVE_DIR': None,            # pruned PostView rows are written here first; None = not archived
+}
+
+BUCKET_SIZES = {
+    PostViewRollup.HOUR: datetime.timedelta(hours=1),
+    PostViewRollup.DAY: datetime.timedelta(days=1),
+}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'BLOG_VIEW_ROLLUPS', {})}
+
+
+def bucket_start(moment, period):
+    """The start of the UTC hour or day containing `moment`."""
+    moment = moment.astimezone(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if period == PostViewRollup.DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def get_state(lock=False):
+    """The rollup watermark; `lock=True` (inside a transaction) serializes runs."""
+    if not lock:
+        # Readers never create the row
+        return PostViewRollupState.objects.filter(pk=1).first() or PostViewRollupState(pk=1)
+    state, _ = PostViewRollupState.objects.select_for_update().get_or_create(pk=1)
+    return state
+
+
+def _rollup_range(period, trunc, low, high):
+    """Add the views of PostView rows with low < id <= high to the `period` rollups."""
+    views = PostView.objects.filter(pk__gt=low, pk__lte=high) \
+        .annotate(period=Value(period), bucket=trunc('viewed_at', tzinfo=datetime.timezone.utc)) \
+        .order_by().values_list('post_id', 'period', 'bucket').annotate(views=Count('pk'))
+    select, params = views.query.sql_with_params()
+    table = connection.ops.quote_name(PostViewRollup._meta.db_table)
+    # One INSERT ... SELECT ... ON CONFLICT (PostgreSQL, SQLite >= 3.24):
+    # the counts never leave the database
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (post_id, period, bucket, views) {select} '
+            f'ON CONFLICT (post_id, period, bucket) '
+            f'DO UPDATE SET views = {table}.views + excluded.views',
+            params,
+        )
+
+
+def rollup_views(settle=True, batch_size=None):
+    """Fold new PostView rows into the rollups; returns the number of views added."""
+    batch_size = batch_size or _config()['BATCH_SIZE']
+    newest = PostView.objects.aggregate(newest=Max('pk'))['newest'] or 0
+    with transaction.atomic():
+        state = get_state(lock=True)
+        limit = state.horizon if settle else newest
+    rolled = 0
+    while True:
+        with transaction.atomic():
+            # Re-read under the lock: concurrent runs take turns per range
+            state = get_state(lock=True)
+            low = state.rolled_up_to
+            if low >= limit:
+                break
+            high = min(low + batch_size, limit)
+            _rollup_range(PostViewRollup.HOUR, TruncHour, low, high)
+            _rollup_range(PostViewRollup.DAY, TruncDay, low, high)
+            rolled += PostView.objects.filter(pk__gt=low, pk__lte=high).count()
+            state.rolled_up_to = high
+            state.updated_at = timezone.now()
+            state.save(update_fields=['rolled_up_to', 'updated_at'])
+    with transaction.atomic():
+        state = get_state(lock=True)
+        state.horizon = max(state.horizon, newest)
+        state.updated_at = timezone.now()
+        state.save(update_fields=['horizon', 'updated_at'])
+    return rolled
+
+
+def _archive(path, views):
+    with gzip.open(path, 'at', encoding='utf-8') as archive:
+        for view in views:
+            archive.write(json.dumps({
+                'id': view.pk,
+                'post_id': view.post_id,
+                'ip_address': view.ip_address,
+                'user_agent': view.user_agent,
+                'viewed_at': view.viewed_at.isoformat(),
+            }) + '\n')
+
+
+def compact(raw_retention_days=None, hourly_retention_days=None, archive_dir=None,
+            batch_size=None):
+    """Prune rolled-up PostView rows and old hourly rollups.
+
+    Returns (PostView rows deleted, hourly rollups deleted). Arguments left
+    as None come from `BLOG_VIEW_ROLLUPS`.
+    """
+    config = _config()
+    raw_days = config['RAW_RETENTION_DAYS'] if raw_retention_days is None else raw_retention_days
+    hourly_days = config['HOURLY_RETENTION_DAYS'] if hourly_retention_days is None \
+        else hourly_retention_days
+    archive_dir = archive_dir or config['ARCHIVE_DIR']
+    batch_size = batch_size or config['BATCH_SIZE']
+    now = timezone.now()
+
+    archive_path = None
+    if archive_dir:
+        Path(archive_dir).mkdir(parents=True, exist_ok=True)
+        archive_path = Path(archive_dir) / f'post_views-{now:%Y%m%dT%H%M%S}.ndjson.gz'
+
+    # Only rows already counted in the rollups may go
+    prunable = PostView.objects.filter(
+        pk__lte=get_state().rolled_up_to,
+        viewed_at__lt=now - datetime.timedelta(days=raw_days),
+    ).order_by('pk')
+    views_deleted = 0
+    last = 0
+    while True:
+        with transaction.atomic():
+            window = prunable.filter(pk__gt=last)
+            if archive_path is not None:
+                batch = list(window[:batch_size])
+                ids = [view.pk for view in batch]
+            else:
+                ids = list(window.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            if archive_path is not None:
+                _archive(archive_path, batch)
+            deleted, _ = window.filter(pk__lte=ids[-1]).delete()
+        views_deleted += deleted
+        last = ids[-1]
+
+    hourly_deleted, _ = PostViewRollup.objects.filter(
+        period=PostViewRollup.HOUR,
+        bucket__lt=bucket_start(now - datetime.timedelta(days=hourly_days), PostViewRollup.HOUR),
+    ).delete()
+    return views_deleted, hourly_deleted
+
+
+def view_series(post_id, period, start, end):
+    """Views of one post per bucket from `start` to `end`, zero-filled, from the rollups."""
+    step = BUCKET_SIZES[period]
+    start, last = bucket_start(start, period), bucket_start(end, period)
+    end = last if last == end else last + step  # include the bucket `end` falls in
+    stored = dict(
+        PostViewRollup.objects.filter(post_id=post_id, period=period,
+                                      bucket__gte=start, bucket__lt=end)
+        .values_list('bucket', 'views')
+    )
+    series = []
+    bucket = start
+    while bucket < end:
+        series.append({'bucket': bucket, 'views': stored.get(bucket, 0)})
+        bucket += step
+    return series
+
@@ -1,6 +1,10 @@
+from datetime import timedelta
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Category, Tag, Post, Comment, PostView
+from django.utils import timezone
+from .models import Category, Tag, Post, Comment, PostView, PostViewRollup
+from .rollups import BUCKET_SIZES
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -11,35 +15,29 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 class CategorySerializer(serializers.ModelSerializer):
-    post_count = serializers.SerializerMethodField()
+    post_count = serializers.IntegerField(source='published_post_count', read_only=True)
 
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug', 'description', 'post_count', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-    def get_post_count(self, obj):
-        return obj.posts.filter(status='published').count()
-
 
 class TagSerializer(serializers.ModelSerializer):
-    post_count = serializers.SerializerMethodField()
+    post_count = serializers.IntegerField(source='published_post_count', read_only=True)
 
     class Meta:
         model = Tag
         fields = ['id', 'name', 'slug', 'post_count', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-    def get_post_count(self, obj):
-        return obj.posts.filter(status='published').count()
-
 
 class PostListSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
-    comment_count = serializers.SerializerMethodField()
-    view_count = serializers.SerializerMethodField()
+    comment_count = serializers.IntegerField(read_only=True)
+    view_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Post
@@ -49,12 +47,6 @@ class PostListSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
 
-    def get_comment_count(self, obj):
-        return obj.comments.filter(is_approved=True).count()
-
-    def get_view_count(self, obj):
-        return obj.views.count()
-
 
 class PostDetailSerializer(PostListSerializer):
     class Meta(PostListSerializer.Meta):
@@ -86,6 +78,37 @@ class PostViewSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'viewed_at']
 
 
+class ViewAnalyticsQuerySerializer(serializers.Serializer):
+    """Query parameters of the post `analytics` action."""
+    MAX_BUCKETS = 1000
+    DEFAULT_SPANS = {
+        PostViewRollup.HOUR: timedelta(hours=48),
+        PostViewRollup.DAY: timedelta(days=30),
+    }
+
+    interval = serializers.ChoiceField(choices=PostViewRollup.PERIOD_CHOICES,
+                                       default=PostViewRollup.DAY)
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        interval = attrs['interval']
+        end = attrs.setdefault('end', timezone.now())
+        start = attrs.setdefault('start', end - self.DEFAULT_SPANS[interval])
+        if start >= end:
+            raise serializers.ValidationError('start must be before end.')
+        if (end - start) / BUCKET_SIZES[interval] > self.MAX_BUCKETS:
+            raise serializers.ValidationError(
+                f'At most {self.MAX_BUCKETS} {interval} buckets per request.'
+            )
+        return attrs
+
+
+class ViewSeriesPointSerializer(serializers.Serializer):
+    bucket = serializers.DateTimeField()
+    views = serializers.IntegerField()
+
+
 class PostCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
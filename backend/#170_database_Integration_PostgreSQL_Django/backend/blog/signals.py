@@ -0,0 +1,155 @@
+"""Keep the denormalized counters (blog.counters), the cached API responses
+(blog.response_cache) and the search index (blog.search) current.
+
+Each Post and Comment remembers the values that affect counters as they were
+loaded (`_counted`), so a save only adjusts counters when the approval,
+status, category or post actually changed. Every counter change also evicts
+the cached responses that embed that counter.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from .counters import adjust
+from .models import Category, Comment, Post, Tag
+from .response_cache import evict
+from .search import reindex, unindex
+
+
+def _published(state):
+    return state is not None and state[0] == 'published'
+
+
+def _adjust_categories(deltas):
+    adjust(Category, 'published_post_count', deltas)
+    changed = [pk for pk, delta in deltas.items() if pk is not None and delta]
+    if changed:
+        evict('categories', *(f'category:{pk}' for pk in changed))
+
+
+def _adjust_tags(deltas):
+    adjust(Tag, 'published_post_count', deltas)
+    changed = [pk for pk, delta in deltas.items() if pk is not None and delta]
+    if changed:
+        evict('tags', *(f'tag:{pk}' for pk in changed))
+
+
+def _adjust_comments(deltas):
+    adjust(Post, 'comment_count', deltas)
+    changed = [pk for pk, delta in deltas.items() if pk is not None and delta]
+    if changed:
+        evict(*(f'post:{pk}' for pk in changed))
+
+
+@receiver(post_init, sender=Post)
+def remember_post_state(sender, instance, **kwargs):
+    # Read from __dict__ so deferred fields are not fetched one by one
+    if instance.pk is not None:
+        instance._counted = (instance.__dict__.get('status'), instance.__dict__.get('category_id'))
+    else:
+        instance._counted = None
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, update_fields=None, **kwargs):
+    evict('posts', f'post:{instance.pk}')
+    if update_fields is None or {'title', 'excerpt', 'content'} & set(update_fields):
+        reindex([instance.pk])
+    old = None if created else instance._counted
+    new = (instance.status, instance.category_id)
+    instance._counted = new
+    if old == new:
+        return
+    categories = {}
+    if _published(old):
+        categories[old[1]] = categories.get(old[1], 0) - 1
+    if _published(new):
+        categories[new[1]] = categories.get(new[1], 0) + 1
+    _adjust_categories(categories)
+    if _published(old) != _published(new) and not created:
+        delta = 1 if _published(new) else -1
+        tag_ids = instance.tags.values_list('pk', flat=True)
+        _adjust_tags({pk: delta for pk in tag_ids})
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    # pre_delete: the tag links are removed before post_delete fires
+    evict('posts', f'post:{instance.pk}')
+    unindex(instance.pk)
+    if _published(instance._counted):
+        _adjust_categories({instance._counted[1]: -1})
+        tag_ids = instance.tags.values_list('pk', flat=True)
+        _adjust_tags({pk: -1 for pk in tag_ids})
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def post_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'pre_remove', 'pre_clear'):
+        return
+    delta = 1 if action == 'post_add' else -1
+    links = sender.objects.all()
+    if not reverse:
+        # post.tags.add/remove/clear(): pk_set holds tag ids
+        evict('posts', f'post:{instance.pk}')
+        if not _published(instance._counted):
+            return
+        if action == 'post_add':
+            tag_ids = pk_set  # only the tags that were actually added
+        else:
+            links = links.filter(post=instance)
+            if pk_set is not None:
+                links = links.filter(tag__in=pk_set)
+            tag_ids = links.values_list('tag_id', flat=True)
+        _adjust_tags({pk: delta for pk in tag_ids})
+    else:
+        # tag.posts.add/remove/clear(): pk_set holds post ids
+        if action == 'post_add':
+            posts = Post.objects.filter(pk__in=pk_set)
+        else:
+            links = links.filter(tag=instance)
+            if pk_set is not None:
+                links = links.filter(post__in=pk_set)
+            posts = Post.objects.filter(pk__in=links.values('post_id'))
+        post_ids = list(posts.values_list('pk', flat=True))
+        evict('posts', *(f'post:{pk}' for pk in post_ids))
+        published = posts.filter(status='published').count()
+        _adjust_tags({instance.pk: delta * published})
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_state(sender, instance, **kwargs):
+    if instance.pk is not None:
+        instance._counted = (instance.__dict__.get('post_id'), instance.__dict__.get('is_approved'))
+    else:
+        instance._counted = None
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    old = None if created else instance._counted
+    new = (instance.post_id, instance.is_approved)
+    instance._counted = new
+    if old == new:
+        return
+    posts = {}
+    if old is not None and old[1]:
+        posts[old[0]] = posts.get(old[0], 0) - 1
+    if new[1]:
+        posts[new[0]] = posts.get(new[0], 0) + 1
+    _adjust_comments(posts)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if instance._counted is not None and instance._counted[1]:
+        _adjust_comments({instance._counted[0]: -1})
+
+
+@receiver([post_save, post_delete], sender=Category)
+def category_changed(sender, instance, **kwargs):
+    evict('categories', f'category:{instance.pk}')
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def tag_changed(sender, instance, **kwargs):
+    evict('tags', f'tag:{instance.pk}')
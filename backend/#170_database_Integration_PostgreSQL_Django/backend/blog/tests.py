@@ -1,3 +1,633 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from .bulk import post_record
+from .counters import add_views, recount_all
+from .models import Category, Comment, Post, PostView, PostViewRollup, Tag
+from .response_cache import get_response_cache
+from .rollups import compact, rollup_views
+from .search import search_backend
+from .view_tracking import ViewTracker
+from .views import PostViewSet
+
+
+class ViewTrackingTests(APITestCase):
+    def setUp(self):
+        caches['blog_api'].clear()
+        self.author = User.objects.create_user('author', password='pw')
+        self.post = Post.objects.create(
+            title='Hello', slug='hello', content='Body', author=self.author,
+            status='published'
+        )
+        self.spool = tempfile.TemporaryDirectory()
+        self.addCleanup(self.spool.cleanup)
+
+    def tracker(self, **kwargs):
+        kwargs.setdefault('spool_dir', self.spool.name)
+        return ViewTracker(background=False, **kwargs)
+
+    def test_retrieve_buffers_view_instead_of_inserting(self):
+        tracker = self.tracker()
+        with mock.patch('blog.views.get_view_tracker', return_value=tracker):
+            response = self.client.get('/blog/api/posts/hello/', REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(PostView.objects.count(), 0)
+        self.assertEqual(tracker.pending, 1)
+
+        # existing-post check, bulk INSERT, view_count UPDATE (+ savepoint)
+        with self.assertNumQueries(5):
+            self.assertEqual(tracker.flush(), 1)
+        view = PostView.objects.get()
+        self.assertEqual(view.ip_address, '10.0.0.1')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+        self.assertEqual(list(Path(self.spool.name).iterdir()), [])
+
+    def test_failed_flush_is_replayed_from_spool(self):
+        tracker = self.tracker()
+        for i in range(3):
+            tracker.record(self.post.pk, f'10.0.0.{i}')
+        with mock.patch.object(ViewTracker, '_write', side_effect=DatabaseError), \
+                self.assertLogs('blog.view_tracking', 'ERROR'):
+            self.assertEqual(tracker.flush(), 0)
+        self.assertEqual([p.suffix for p in Path(self.spool.name).iterdir()], ['.ready'])
+
+        # A fresh process (e.g. after a restart) picks the sealed file up
+        self.assertEqual(self.tracker().flush(), 3)
+        self.assertEqual(PostView.objects.count(), 3)
+        self.assertEqual(list(Path(self.spool.name).iterdir()), [])
+
+    def test_failed_flush_without_spool_keeps_views_in_memory(self):
+        tracker = self.tracker(spool_dir=None)
+        tracker.record(self.post.pk, '10.0.0.1')
+        with mock.patch.object(ViewTracker, '_write', side_effect=DatabaseError), \
+                self.assertLogs('blog.view_tracking', 'ERROR'):
+            tracker.flush()
+        self.assertEqual(tracker.pending, 1)
+        self.assertEqual(tracker.flush(), 1)
+
+    def test_spool_write_error_falls_back_to_memory(self):
+        tracker = self.tracker()
+        tracker.record(self.post.pk, '10.0.0.1')
+        with mock.patch.object(ViewTracker, '_spool_file', side_effect=OSError('disk full')), \
+                self.assertLogs('blog.view_tracking', 'ERROR'):
+            self.assertTrue(tracker.record(self.post.pk, '10.0.0.2'))
+        self.assertEqual(tracker.pending, 2)
+
+        # The spooled view is left for replay, the other one stays in memory
+        with mock.patch.object(ViewTracker, '_write', side_effect=DatabaseError), \
+                self.assertLogs('blog.view_tracking', 'ERROR'):
+            self.assertEqual(tracker.flush(), 0)
+        self.assertEqual(tracker.pending, 1)
+        self.assertEqual(tracker.flush(), 2)
+        self.assertEqual(PostView.objects.count(), 2)
+
+    def test_unexpected_flush_error_releases_spool_file(self):
+        tracker = self.tracker()
+        tracker.record(self.post.pk, '10.0.0.1')
+        with mock.patch.object(ViewTracker, '_write', side_effect=TypeError), \
+                self.assertLogs('blog.view_tracking', 'ERROR'):
+            self.assertEqual(tracker.flush(), 0)
+        self.assertEqual([p.suffix for p in Path(self.spool.name).iterdir()], ['.ready'])
+        self.assertEqual(tracker.flush(), 1)
+
+    def test_sampling_and_deleted_posts(self):
+        self.assertFalse(self.tracker(sample_rate=0.0).record(self.post.pk, '10.0.0.1'))
+
+        tracker = self.tracker()
+        tracker.record(self.post.pk, '10.0.0.1')
+        tracker.record(self.post.pk + 1000, '10.0.0.2')  # no such post
+        self.assertEqual(tracker.flush(), 1)
+
+
+@override_settings(BLOG_API_CACHE={'ENABLED': False})
+class CounterTests(APITestCase):
+    def setUp(self):
+        self.author = User.objects.create_user('author', password='pw')
+        self.news = Category.objects.create(name='News', slug='news')
+        self.misc = Category.objects.create(name='Misc', slug='misc')
+        self.tag = Tag.objects.create(name='Django', slug='django')
+
+    def make_posts(self, n, status='published'):
+        posts = []
+        start = Post.objects.count()
+        for i in range(start, start + n):
+            post = Post.objects.create(
+                title=f'Post {i}', slug=f'post-{i}', content='Body',
+                author=self.author, category=self.news, status=status
+            )
+            post.tags.add(self.tag)
+            Comment.objects.create(post=post, name='a', email='a@example.com',
+                                   content='Hi', is_approved=True)
+            posts.append(post)
+        return posts
+
+    def assertCounters(self):
+        """Incremental counters must match a full recount."""
+        expected = [
+            list(Post.objects.values_list('pk', 'comment_count', 'view_count')),
+            list(Category.objects.values_list('pk', 'published_post_count')),
+            list(Tag.objects.values_list('pk', 'published_post_count')),
+        ]
+        recount_all()
+        self.assertEqual(expected, [
+            list(Post.objects.values_list('pk', 'comment_count', 'view_count')),
+            list(Category.objects.values_list('pk', 'published_post_count')),
+            list(Tag.objects.values_list('pk', 'published_post_count')),
+        ])
+
+    def test_counters_follow_changes(self):
+        post, other = self.make_posts(2)
+        self.make_posts(1, status='draft')
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.published_post_count, 2)
+        self.assertCounters()
+
+        post.status = 'draft'
+        post.save()
+        other.category = self.misc
+        other.save()
+        self.assertCounters()
+
+        comment = other.comments.get()
+        comment.is_approved = False
+        comment.save()
+        self.tag.posts.remove(other)
+        other.tags.add(self.tag)
+        post.tags.clear()
+        self.assertCounters()
+
+        other.delete()
+        self.assertCounters()
+        self.assertEqual(Tag.objects.get().published_post_count, 0)
+
+    def test_stale_instance_does_not_overwrite_counters(self):
+        post, = self.make_posts(1)
+        stale = Post.objects.get(pk=post.pk)
+        Comment.objects.create(post=post, name='b', email='b@example.com',
+                               content='Hi', is_approved=True)
+        stale.title = 'Renamed'
+        stale.save()
+        self.assertEqual(Post.objects.get(pk=post.pk).comment_count, 2)
+
+    def test_list_endpoints_use_a_fixed_number_of_queries(self):
+        for n in (1, 10):
+            self.make_posts(n - Post.objects.count())
+            # cursor page + tag prefetch
+            with self.assertNumQueries(2):
+                response = self.client.get('/blog/api/posts/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['results']), n)
+            self.assertEqual(response.data['results'][0]['comment_count'], 1)
+            self.assertEqual(response.data['results'][0]['tags'][0]['post_count'], n)
+            with self.assertNumQueries(2):
+                self.client.get('/blog/api/categories/')
+            with self.assertNumQueries(2):
+                self.client.get('/blog/api/tags/')
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        caches['blog_api'].clear()
+        self.author = User.objects.create_user('author', password='pw')
+        self.category = Category.objects.create(name='News', slug='news')
+        self.post = Post.objects.create(
+            title='Hello', slug='hello', content='Body', author=self.author,
+            category=self.category, status='published'
+        )
+        self.other = Post.objects.create(
+            title='Other', slug='other', content='Body', author=self.author,
+            status='published'
+        )
+
+    def get(self, path, queries, **extra):
+        with self.assertNumQueries(queries):
+            return self.client.get(path, **extra)
+
+    def test_anonymous_reads_are_cached_per_query_string(self):
+        # A search also checks whether there are too many matches to rank
+        self.assertEqual(len(self.get('/blog/api/posts/?search=Hello', 3).data['results']), 1)
+        self.assertEqual(len(self.get('/blog/api/posts/?search=Hello', 0).data['results']), 1)
+        self.assertEqual(len(self.get('/blog/api/posts/?search=Body', 3).data['results']), 2)
+        self.get('/blog/api/categories/', 2)
+        self.get('/blog/api/categories/', 0)
+
+        self.client.force_authenticate(self.author)
+        self.get('/blog/api/categories/', 2)
+
+    def test_saving_evicts_only_affected_entries(self):
+        with mock.patch('blog.views.get_view_tracker'):
+            self.get('/blog/api/posts/hello/', 2)
+            self.get('/blog/api/posts/other/', 2)
+            self.get('/blog/api/categories/', 2)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                Comment.objects.create(post=self.post, name='a', email='a@example.com',
+                                       content='Hi', is_approved=True)
+            self.assertEqual(self.get('/blog/api/posts/hello/', 2).data['comment_count'], 1)
+            self.get('/blog/api/posts/other/', 0)
+            self.get('/blog/api/categories/', 0)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.category.name = 'Updates'
+                self.category.save()
+            self.assertEqual(
+                self.get('/blog/api/posts/hello/', 2).data['category']['name'], 'Updates'
+            )
+            self.get('/blog/api/posts/other/', 0)
+            self.get('/blog/api/categories/', 2)
+
+    def test_eviction_during_render_is_not_cached_stale(self):
+        get_object = PostViewSet.get_object
+
+        def read_then_save(viewset):
+            post = get_object(viewset)
+            # a concurrent save commits and evicts after this read
+            Post.objects.filter(pk=post.pk).update(title='Edited')
+            get_response_cache().invalidate({f'post:{post.pk}'})
+            return post
+
+        with mock.patch('blog.views.get_view_tracker'):
+            with mock.patch.object(PostViewSet, 'get_object', read_then_save):
+                self.assertEqual(self.client.get('/blog/api/posts/hello/').data['title'], 'Hello')
+            self.assertEqual(self.get('/blog/api/posts/hello/', 2).data['title'], 'Edited')
+            self.get('/blog/api/posts/hello/', 0)
+
+    def test_cached_detail_still_records_views(self):
+        with mock.patch('blog.views.get_view_tracker') as tracker:
+            self.client.get('/blog/api/posts/hello/')
+            self.client.get('/blog/api/posts/hello/')
+        self.assertEqual(tracker.return_value.record.call_count, 2)
+
+    def test_revalidated_detail_records_views(self):
+        with mock.patch('blog.views.get_view_tracker') as tracker:
+            etag = self.client.get('/blog/api/posts/hello/')['ETag']
+            response = self.client.get('/blog/api/posts/hello/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(tracker.return_value.record.call_count, 2)
+
+    def test_conditional_requests(self):
+        response = self.client.get('/blog/api/tags/')
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assertEqual(
+            self.get('/blog/api/tags/', 0, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+        self.assertEqual(
+            self.get('/blog/api/tags/', 0, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name='New', slug='new')
+        response = self.client.get('/blog/api/tags/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+@override_settings(BLOG_API_CACHE={'ENABLED': False})
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.author = User.objects.create_user('author', password='pw')
+        now = timezone.now()
+        self.posts = [
+            Post.objects.create(
+                title=f'Post {i}', slug=f'post-{i}', content='Body', author=self.author,
+                status='published', publish_date=now - timedelta(hours=i % 7)
+            )
+            for i in range(25)
+        ]
+
+    def walk(self, url, page_queries):
+        seen = []
+        while url:
+            with self.assertNumQueries(page_queries):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        return seen
+
+    def test_posts_are_walked_without_offsets(self):
+        # ties on publish_date must neither repeat nor skip posts
+        seen = self.walk('/blog/api/posts/?page_size=4', 2)
+        self.assertCountEqual(seen, [post.pk for post in self.posts])
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_comments_and_views_actions_are_paginated(self):
+        post = self.posts[0]
+        for i in range(30):
+            Comment.objects.create(post=post, name='a', email='a@example.com',
+                                   content=str(i), is_approved=True)
+        PostView.objects.bulk_create(
+            PostView(post=post, ip_address='10.0.0.1') for _ in range(120)
+        )
+        response = self.client.get(f'/blog/api/posts/{post.slug}/comments/')
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(len(self.walk(f'/blog/api/posts/{post.slug}/comments/', 2)), 30)
+        response = self.client.get(f'/blog/api/posts/{post.slug}/views/')
+        self.assertEqual(len(response.data['results']), 50)
+        self.assertEqual(len(self.walk(f'/blog/api/posts/{post.slug}/views/', 2)), 120)
+
+
+class SearchTestMixin:
+    def setUp(self):
+        self.author = User.objects.create_user('author', password='pw')
+
+    def make(self, slug, title, content='', excerpt=''):
+        return Post.objects.create(title=title, slug=slug, content=content, excerpt=excerpt,
+                                   author=self.author, status='published')
+
+    def search(self, query, **params):
+        response = self.client.get('/blog/api/posts/', {'search': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item['slug'] for item in response.data['results']]
+
+
+@override_settings(BLOG_API_CACHE={'ENABLED': False})
+class SearchTests(SearchTestMixin, APITestCase):
+    def test_ranked_stemmed_search(self):
+        self.make('body', 'Weekly notes', content='We went running in the park.')
+        self.make('title', 'Running a marathon', content='Training plan.')
+        self.make('other', 'Cooking', content='Bread and butter.')
+        self.assertEqual(self.search('runs'), ['title', 'body'])
+        self.assertEqual(self.search('running park'), ['body'])
+        self.assertEqual(self.search('running', ordering='publish_date'), ['body', 'title'])
+
+    def test_index_follows_saves_and_deletes(self):
+        post = self.make('post', 'Draft title', content='nothing here')
+        self.assertEqual(self.search('kubernetes'), [])
+        post.content = 'Deploying to Kubernetes'
+        post.save()
+        self.assertEqual(self.search('kubernetes'), ['post'])
+        post.delete()
+        self.assertEqual(self.search('kubernetes'), [])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.make('post', 'C++ AND "quotes"', content='NEAR(a b) OR *')
+        for query in ['"quotes', 'AND', 'NEAR(a', '*', 'c++']:
+            self.search(query)  # must not raise an FTS5 syntax error
+
+    def test_ranked_results_page_with_cursor(self):
+        for i in range(12):
+            self.make(f'post-{i}', f'Python tips {i}', content='python ' * (i % 4))
+        seen, url = [], '/blog/api/posts/?search=python&page_size=5'
+        while url:
+            response = self.client.get(url)
+            seen.extend(item['slug'] for item in response.data['results'])
+            url = response.data['next']
+        self.assertCountEqual(seen, [f'post-{i}' for i in range(12)])
+
+    def test_common_terms_are_not_ranked(self):
+        self.make('old', 'Python', content='python python python')
+        self.make('new', 'Notes', content='python')
+        self.assertEqual(self.search('python'), ['old', 'new'])
+        with override_settings(BLOG_SEARCH={'RANK_LIMIT': 1}):
+            self.assertEqual(self.search('python'), ['new', 'old'])  # newest first
+            self.assertEqual(self.search('notes'), ['new'])
+
+    @override_settings(BLOG_SEARCH={'BACKEND': 'like'})
+    def test_like_backend(self):
+        self.make('post', 'Unrelated', content='substringmatch')
+        self.assertEqual(self.search('stringmat'), ['post'])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'tsvector search needs PostgreSQL')
+@override_settings(BLOG_API_CACHE={'ENABLED': False})
+class PostgresSearchTests(SearchTestMixin, APITestCase):
+    """The PostgreSQL backend; runs with the default (PostgreSQL) settings."""
+
+    def test_weighted_vector_is_maintained(self):
+        post = self.make('post', 'Kubernetes', excerpt='Docker', content='Helm charts')
+        vector = Post.objects.values_list('search_vector', flat=True).get(pk=post.pk)
+        self.assertEqual(vector, "'chart':4C 'docker':2B 'helm':3C 'kubernet':1A")
+
+        Post.objects.filter(pk=post.pk).update(title='Podman')  # skips the signals
+        self.assertEqual(self.search('podman'), [])
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        self.assertEqual(self.search('podman'), ['post'])
+
+    def test_search_uses_gin_index(self):
+        self.make('post', 'Kubernetes')
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(
+                "EXPLAIN SELECT id FROM blog_post "
+                "WHERE search_vector @@ plainto_tsquery('english', 'kubernetes')"
+            )
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn('blog_post_search_vector_gin', plan)
+
+
+@override_settings(BLOG_API_CACHE={'ENABLED': False})
+class RollupTests(APITestCase):
+    def setUp(self):
+        self.author = User.objects.create_user('author', password='pw')
+        self.post = Post.objects.create(title='Hello', slug='hello', content='Body',
+                                        author=self.author, status='published')
+        self.day = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0) \
+            - timedelta(days=40)
+
+    def view(self, at, n=1, post=None):
+        rows = PostView.objects.bulk_create([
+            PostView(post=post or self.post, ip_address='10.0.0.1', viewed_at=at)
+            for _ in range(n)
+        ])
+        add_views(row.post_id for row in rows)
+
+    def rollups(self, period):
+        return list(self.post.view_rollups.filter(period=period).order_by('bucket')
+                    .values_list('bucket', 'views'))
+
+    def test_incremental_hourly_and_daily_rollups(self):
+        self.view(self.day + timedelta(hours=1, minutes=5), n=2)
+        self.view(self.day + timedelta(hours=1, minutes=55))
+        self.view(self.day + timedelta(hours=3))
+        self.assertEqual(rollup_views(), 0)  # settles: only rows seen by a previous run
+        self.assertEqual(rollup_views(), 4)
+        self.view(self.day + timedelta(hours=1, minutes=30))  # late arrival, same hour
+        self.view(self.day + timedelta(days=1))
+        self.assertEqual(rollup_views(settle=False, batch_size=1), 2)
+        self.assertEqual(rollup_views(settle=False), 0)
+        self.assertEqual(self.rollups(PostViewRollup.HOUR), [
+            (self.day + timedelta(hours=1), 4),
+            (self.day + timedelta(hours=3), 1),
+            (self.day + timedelta(days=1), 1),
+        ])
+        self.assertEqual(self.rollups(PostViewRollup.DAY), [
+            (self.day, 5), (self.day + timedelta(days=1), 1),
+        ])
+
+    def test_compaction_keeps_view_count(self):
+        archive = tempfile.TemporaryDirectory()
+        self.addCleanup(archive.cleanup)
+        self.view(self.day + timedelta(hours=2), n=3)
+        rollup_views(settle=False)
+        self.view(self.day + timedelta(hours=5))  # not rolled up: must survive
+        self.view(timezone.now())
+        self.assertEqual(compact(hourly_retention_days=30, archive_dir=archive.name), (3, 1))
+        self.assertEqual(PostView.objects.count(), 2)
+        self.assertEqual(self.rollups(PostViewRollup.HOUR), [])
+        self.assertEqual(self.rollups(PostViewRollup.DAY), [(self.day, 3)])
+        archived = list(Path(archive.name).glob('*.ndjson.gz'))
+        with gzip.open(archived[0], 'rt') as lines:
+            self.assertEqual(len(lines.readlines()), 3)
+        recount_all()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 5)
+
+    def test_analytics_endpoint(self):
+        self.view(self.day + timedelta(hours=1), n=2)
+        self.view(self.day + timedelta(days=2))
+        self.view(self.day + timedelta(days=2))  # rolled up below, then one more that is not
+        rollup_views(settle=False)
+        self.view(self.day + timedelta(days=2))
+        url = '/blog/api/posts/hello/analytics/'
+        response = self.client.get(url, {'start': self.day.isoformat(),
+                                         'end': (self.day + timedelta(days=3)).isoformat()})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([point['views'] for point in response.data['series']], [2, 0, 2])
+        self.assertEqual(response.data['total'], 4)
+        response = self.client.get(url, {'interval': 'hour', 'start': self.day.isoformat(),
+                                         'end': (self.day + timedelta(hours=2)).isoformat()})
+        self.assertEqual([point['views'] for point in response.data['series']], [0, 2])
+        with self.assertNumQueries(3):  # post, rollups, watermark
+            self.client.get(url, {'interval': 'hour'})
+        for params in [{'interval': 'week'}, {'interval': 'hour', 'start': (self.day - timedelta(days=5)).isoformat()},
+                       {'start': '2026-01-02T00:00Z', 'end': '2026-01-01T00:00Z'}]:
+            self.assertEqual(self.client.get(url, params).status_code, 400)
+
+
+@override_settings(BLOG_API_CACHE={'ENABLED': False})
+class ImportExportTests(APITestCase):
+    def setUp(self):
+        self.author = User.objects.create_user('author', password='pw')
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def path(self, name, content=None):
+        path = str(Path(self.dir.name) / name)
+        if content is not None:
+            Path(path).write_text(content, encoding='utf-8')
+        return path
+
+    def test_csv_import_creates_and_updates_in_batches(self):
+        Tag.objects.create(name='Old', slug='old')
+        existing = Post.objects.create(title='Old title', slug='post-0', content='x',
+                                       author=self.author, status='published',
+                                       publish_date=timezone.make_aware(datetime(2026, 1, 1, 8)))
+        existing.tags.add(Tag.objects.get(slug='old'))
+        rows = ['slug,title,content,author,category,tags,status,publish_date']
+        rows += [f'post-{i},Post {i},"Body, with kubernetes",author,news,"django,python",published,'
+                 f'2026-01-0{i % 9 + 1}T10:00:00' for i in range(7)]
+        out = io.StringIO()
+        # 3 slug maps, 3 new slugs (4 each), 3 batches (8-9 each, counting
+        # 2 recounts) plus their reindex (2 FTS statements on SQLite)
+        reindex_queries = 2 if search_backend() == 'sqlite' else 1
+        with self.assertNumQueries(39 + 3 * reindex_queries):
+            call_command('import_posts', self.path('posts.csv', '\n'.join(rows)),
+                         batch_size=3, stdout=out)
+        self.assertIn('6 created, 1 updated', out.getvalue())
+        existing.refresh_from_db()
+        self.assertEqual(existing.title, 'Post 0')
+        self.assertEqual(sorted(existing.tags.values_list('slug', flat=True)), ['django', 'python'])
+        self.assertEqual(Category.objects.get(slug='news').published_post_count, 7)
+        self.assertEqual(Tag.objects.get(slug='python').published_post_count, 7)
+        self.assertEqual(Tag.objects.get(slug='old').published_post_count, 0)
+        response = self.client.get('/blog/api/posts/', {'search': 'kubernetes', 'page_size': 20})
+        self.assertEqual(len(response.data['results']), 7)
+
+    def test_failed_import_keeps_counters_of_committed_batches(self):
+        caches['blog_api'].clear()
+        old = Category.objects.create(name='Old', slug='old')
+        Post.objects.create(title='Moved', slug='post-0', content='x', author=self.author,
+                            category=old, status='published')
+        self.client.get('/blog/api/categories/')  # cached with the old counts
+        records = [{'slug': f'post-{i}', 'title': f'Post {i}', 'content': 'x',
+                    'author': 'author', 'category': 'news', 'tags': ['django'],
+                    'status': 'published'} for i in range(4)]
+        records.append({'slug': 'bad', 'content': 'x', 'author': 'nobody'})
+        path = self.path('posts.ndjson', '\n'.join(json.dumps(r) for r in records))
+        with self.assertRaisesMessage(CommandError, 'earlier batches were kept: 3 created, '
+                                                    '1 updated'):
+            call_command('import_posts', path, batch_size=2, stdout=io.StringIO())
+        self.assertEqual(Category.objects.get(slug='old').published_post_count, 0)
+        self.assertEqual(Category.objects.get(slug='news').published_post_count, 4)
+        self.assertEqual(Tag.objects.get(slug='django').published_post_count, 4)
+        counts = {c['slug']: c['post_count']
+                  for c in self.client.get('/blog/api/categories/').data['results']}
+        self.assertEqual(counts, {'news': 4, 'old': 0})
+
+    def test_ndjson_export_round_trip(self):
+        category = Category.objects.create(name='News', slug='news', description='Daily')
+        tag = Tag.objects.create(name='Django', slug='django')
+        for i in range(3):
+            post = Post.objects.create(title=f'Post {i}', slug=f'post-{i}', content='Body',
+                                       author=self.author, category=category, status='published')
+            post.tags.add(tag)
+        export = self.path('posts.ndjson.gz')
+        call_command('export_posts', export, stdout=io.StringIO())
+        before = [post_record(post) for post in Post.objects.order_by('slug')]
+        Post.objects.all().delete()
+        Category.objects.all().delete()
+        Tag.objects.all().delete()
+        call_command('import_posts', export, stdout=io.StringIO())
+        self.assertEqual([post_record(post) for post in Post.objects.order_by('slug')], before)
+        self.assertEqual(Category.objects.get().description, 'Daily')
+        csv_export = self.path('posts.csv')
+        call_command('export_posts', csv_export, stdout=io.StringIO())
+        call_command('import_posts', csv_export, stdout=io.StringIO())
+        self.assertEqual([post_record(post) for post in Post.objects.order_by('slug')], before)
+
+    def test_repeated_slug_round_trips(self):
+        # Post.slug is only unique for its publish date
+        for day in (1, 8):
+            Post.objects.create(title=f'Weekly {day}', slug='weekly', content='x',
+                                author=self.author, status='published',
+                                publish_date=timezone.make_aware(datetime(2026, 3, day, 9)))
+        export = self.path('posts.ndjson')
+        call_command('export_posts', export, stdout=io.StringIO())
+        before = [post_record(post) for post in Post.objects.order_by('publish_date')]
+        out = io.StringIO()
+        call_command('import_posts', export, stdout=out)
+        self.assertIn('0 created, 2 updated', out.getvalue())
+        Post.objects.all().delete()
+        call_command('import_posts', export, stdout=io.StringIO())
+        self.assertEqual([post_record(post) for post in Post.objects.order_by('publish_date')],
+                         before)
+
+    def test_update_without_publish_date_keeps_it(self):
+        published = timezone.make_aware(datetime(2026, 3, 1, 9))
+        Post.objects.create(title='Old', slug='weekly', content='x', author=self.author,
+                            publish_date=published - timedelta(days=7))
+        post = Post.objects.create(title='Old', slug='weekly', content='x', author=self.author,
+                                   publish_date=published)
+        record = {'slug': 'weekly', 'title': 'New', 'content': 'x', 'author': 'author'}
+        call_command('import_posts', self.path('posts.ndjson', json.dumps(record)),
+                     stdout=io.StringIO())
+        post.refresh_from_db()
+        self.assertEqual((post.title, post.publish_date), ('New', published))
+        self.assertEqual(Post.objects.filter(title='Old').count(), 1)
+
+    def test_invalid_records_report_their_line(self):
+        records = [{'slug': 'ok', 'title': 'Fine', 'content': 'x', 'author': 'author'},
+                   {'slug': 'bad', 'title': 'Bad', 'content': 'x', 'author': 'nobody'}]
+        path = self.path('posts.ndjson', '\n'.join(json.dumps(r) for r in records))
+        with self.assertRaisesMessage(CommandError, "line 2: unknown author 'nobody'"):
+            call_command('import_posts', path, atomic=True, stdout=io.StringIO())
+        self.assertFalse(Post.objects.exists())
+        path = self.path('more.ndjson', json.dumps({'slug': 'not a slug', 'content': 'x',
+                                                    'author': 'author'}))
+        with self.assertRaisesMessage(CommandError, 'line 1: '):
+            call_command('import_posts', path, stdout=io.StringIO())
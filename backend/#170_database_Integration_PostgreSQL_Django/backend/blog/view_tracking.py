@@ -0,0 +1,333 @@
+"""Buffered PostView ingestion.
+
+Reading a published post used to INSERT a PostView row inside the request.
+`ViewTracker.record()` instead appends the view to an in-process buffer, and
+a background thread writes buffered views with `bulk_create` once
+`BATCH_SIZE` views are waiting or every `FLUSH_INTERVAL` seconds.
+
+With `SPOOL_DIR` set, each accepted view is also appended as a JSON line to a
+per-process spool file before `record()` returns. A flush seals that file and
+deletes it only after its batch is committed, so buffered views survive a
+restart or a failed flush: sealed files, and files left behind by processes
+that are no longer running, are replayed on the next flush in any process
+and by `manage.py flush_post_views`. Delivery is at-least-once; a crash
+between the commit and the delete replays that batch. If a spool write fails
+(disk full, permissions) the view is still buffered in memory and spooling is
+suspended until the next flush, so a spool problem never fails the request.
+
+`SAMPLE_RATE` below 1.0 keeps only that fraction of views, so counts derived
+from PostView rows must be scaled by 1 / SAMPLE_RATE.
+
+Settings (`BLOG_VIEW_TRACKING` in settings.py), see `DEFAULTS`.
+"""
+import atexit
+import json
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .counters import add_views
+from .models import Post, PostView
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 500,          # flush as soon as this many views are buffered
+    'FLUSH_INTERVAL': 2.0,      # ... or after this many seconds
+    'MAX_PENDING': 50000,       # views kept in memory before new ones are dropped
+    'SAMPLE_RATE': 1.0,         # fraction of views recorded
+    'SPOOL_DIR': None,          # directory for spool files; None keeps views in memory only
+}
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _spool_owner(path):
+    """The pid in a spool file name ('views-<pid>-<ns>.<state>'), or None."""
+    try:
+        return int(path.name.split('-')[1])
+    except (IndexError, ValueError):
+        return None
+
+
+class ViewTracker:
+    def __init__(self, batch_size=500, flush_interval=2.0, max_pending=50000,
+                 sample_rate=1.0, spool_dir=None, background=True):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.sample_rate = sample_rate
+        self.spool_dir = Path(spool_dir) if spool_dir else None
+        self.background = background
+        if self.spool_dir is not None:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self._exit_hook = False
+        self._reset()
+
+    def _reset(self):
+        """(Re)initialise per-process state; also used after a fork."""
+        self._pid = os.getpid()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._spool = None
+        self._spool_path = None
+        self._spool_failed = False  # memory-only until the next flush
+        self.recorded = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed_flushes = 0
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def record(self, post_id, ip_address, user_agent='', viewed_at=None):
+        """Buffer one view; returns False if it was sampled out or dropped."""
+        if self._pid != os.getpid():
+            self._reset()  # inherited from a pre-fork parent: start clean
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return False
+        view = {
+            'post_id': post_id,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'viewed_at': viewed_at or timezone.now(),
+        }
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return False
+            if self.spool_dir is not None:
+                view['spooled'] = not self._spool_failed and self._append_to_spool(view)
+            self._pending.append(view)
+            self.recorded += 1
+            full = len(self._pending) >= self.batch_size
+        if self.background:
+            self._ensure_worker()
+            if full:
+                self._wakeup.set()
+        return True
+
+    def flush(self):
+        """Write buffered views and replay spool files; returns rows created."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._spool_failed = False
+                sealed = self._seal()
+            failures = self.failed_flushes
+            written = self._flush_batch(batch, sealed)
+            if self.spool_dir is not None and self.failed_flushes == failures:
+                written += self._replay()
+            self.written += written
+            return written
+
+    def stop(self, timeout=5.0):
+        """Stop the worker and flush what is left."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Final post view flush failed')
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+    # Spool files ---------------------------------------------------------
+
+    def _append_to_spool(self, view):
+        """Write `view` to the spool file; False (and memory-only) on OSError."""
+        line = json.dumps({**view, 'viewed_at': view['viewed_at'].isoformat()})
+        try:
+            self._spool_file().write(line + '\n')
+        except OSError:
+            self._spool_failed = True
+            logger.exception('Could not write to the post view spool; '
+                             'buffering in memory only until the next flush')
+            return False
+        return True
+
+    def _spool_file(self):
+        if self._spool is None:
+            name = f'views-{os.getpid()}-{time.time_ns()}.ndjson'
+            self._spool_path = self.spool_dir / name
+            self._spool = open(self._spool_path, 'a', encoding='utf-8', buffering=1)
+        return self._spool
+
+    def _seal(self):
+        """Close the active spool file and claim it for the current flush."""
+        if self._spool is None:
+            return None
+        spool, self._spool = self._spool, None
+        claimed = self._spool_path.with_suffix('.claimed')
+        try:
+            spool.close()
+            os.replace(self._spool_path, claimed)
+        except OSError:
+            logger.exception('Could not seal post view spool %s', self._spool_path)
+            return None
+        return claimed
+
+    def _replay_candidates(self):
+        for path in sorted(self.spool_dir.glob('views-*')):
+            if path.suffix == '.ready':
+                yield path
+            elif path.suffix in ('.ndjson', '.claimed'):
+                owner = _spool_owner(path)
+                if owner is not None and owner != os.getpid() and not _pid_alive(owner):
+                    yield path
+
+    def _claim(self, path):
+        """Atomically take over a spool file; None if another process won."""
+        ns = path.stem.split('-')[-1]
+        claimed = path.with_name(f'views-{os.getpid()}-{ns}.claimed')
+        try:
+            os.replace(path, claimed)
+        except FileNotFoundError:
+            return None
+        return claimed
+
+    def _replay(self):
+        written = 0
+        for path in self._replay_candidates():
+            claimed = self._claim(path)
+            if claimed is not None:
+                written += self._flush_batch(self._read_spool(claimed), claimed)
+        return written
+
+    @staticmethod
+    def _read_spool(path):
+        views = []
+        with open(path, encoding='utf-8') as fh:
+            for line in fh:
+                try:
+                    view = json.loads(line)
+                    view['viewed_at'] = parse_datetime(view['viewed_at'])
+                except (ValueError, KeyError, TypeError):
+                    continue  # torn last line from a crash mid-write
+                views.append(view)
+        return views
+
+    # Database writes -----------------------------------------------------
+
+    def _flush_batch(self, views, spool_path):
+        """Insert `views`; on success delete their spool file, else keep it.
+
+        On failure the spool file is released for replay and views that did
+        not make it into a spool file (`spooled` False) are put back in memory.
+        """
+        try:
+            written = self._write(views)
+        except Exception:
+            # Any failure, not only DatabaseError: a spool file left claimed
+            # by this (live) process would never be replayed
+            self.failed_flushes += 1
+            logger.exception('Could not write %d post views', len(views))
+            unspooled = views
+            if spool_path is not None:
+                os.replace(spool_path, spool_path.with_suffix('.ready'))
+                unspooled = [v for v in views if not v.get('spooled', True)]
+            with self._lock:  # keep them in memory for the next try
+                room = max(0, self.max_pending - len(self._pending))
+                self.dropped += max(0, len(unspooled) - room)
+                self._pending[:0] = unspooled[:room]
+            return 0
+        if spool_path is not None:
+            spool_path.unlink(missing_ok=True)
+        return written
+
+    def _write(self, views):
+        if not views:
+            return 0
+        # Views of posts deleted since they were recorded would violate the FK
+        existing = set(
+            Post.objects.filter(pk__in={v['post_id'] for v in views})
+            .values_list('pk', flat=True)
+        )
+        rows = [
+            PostView(
+                post_id=v['post_id'],
+                ip_address=v['ip_address'],
+                user_agent=v['user_agent'],
+                viewed_at=v['viewed_at'],
+            )
+            for v in views if v['post_id'] in existing
+        ]
+        with transaction.atomic():
+            PostView.objects.bulk_create(rows, batch_size=self.batch_size)
+            add_views(row.post_id for row in rows)
+        return len(rows)
+
+    # Background worker ---------------------------------------------------
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='post-view-flusher', daemon=True
+            )
+            self._thread.start()
+            if not self._exit_hook:
+                atexit.register(self.stop)
+                self._exit_hook = True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Post view flush failed')
+        close_old_connections()
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_view_tracker():
+    """The process-wide tracker configured by `settings.BLOG_VIEW_TRACKING`."""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                config = {**DEFAULTS, **getattr(settings, 'BLOG_VIEW_TRACKING', {})}
+                _tracker = ViewTracker(
+                    batch_size=config['BATCH_SIZE'],
+                    flush_interval=config['FLUSH_INTERVAL'],
+                    max_pending=config['MAX_PENDING'],
+                    sample_rate=config['SAMPLE_RATE'],
+                    spool_dir=config['SPOOL_DIR'],
+                )
+    return _tracker
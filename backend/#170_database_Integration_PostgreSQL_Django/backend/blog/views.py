@@ -1,56 +1,68 @@
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
-from django.db.models import Count, Q
 
 from .models import Category, Tag, Post, Comment, PostView
+from .pagination import CommentCursorPagination, PostCursorPagination, PostViewCursorPagination
 from .serializers import (
     CategorySerializer, TagSerializer, PostListSerializer,
     PostDetailSerializer, CommentSerializer, PostViewSerializer,
-    PostCreateUpdateSerializer
+    PostCreateUpdateSerializer, ViewAnalyticsQuerySerializer, ViewSeriesPointSerializer
 )
+from .response_cache import CachedReadMixin, post_tags
+from .rollups import get_state, view_series
+from .search import PostOrderingFilter, PostSearchFilter
+from .view_tracking import get_view_tracker
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(CachedReadMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = 'slug'
+    cache_list_tag = 'categories'
+    cache_object_tag = 'category'
 
     def get_queryset(self):
-        return Category.objects.annotate(
-            post_count=Count('posts', filter=Q(posts__status='published'))
-        ).order_by('name')
+        # post_count is the denormalized published_post_count column
+        return Category.objects.order_by('name')
 
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(CachedReadMixin, viewsets.ModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = 'slug'
+    cache_list_tag = 'tags'
+    cache_object_tag = 'tag'
 
     def get_queryset(self):
-        return Tag.objects.annotate(
-            post_count=Count('posts', filter=Q(posts__status='published'))
-        ).order_by('name')
+        return Tag.objects.order_by('name')
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(CachedReadMixin, viewsets.ModelViewSet):
     # Add queryset at class level to fix the basename issue
     queryset = Post.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, PostSearchFilter, PostOrderingFilter]
     filterset_fields = ['category', 'tags', 'author', 'status']
     search_fields = ['title', 'content', 'excerpt']
     ordering_fields = ['publish_date', 'created_at', 'updated_at']
     ordering = ['-publish_date']
+    pagination_class = PostCursorPagination
     lookup_field = 'slug'
+    cache_list_tag = 'posts'
 
     def get_queryset(self):
-        queryset = Post.objects.select_related('author', 'category').prefetch_related('tags')
+        if self.action in ('comments', 'views', 'analytics'):
+            # Only the post's id is needed to page through its rows
+            queryset = Post.objects.only('id', 'status', 'publish_date')
+        else:
+            queryset = Post.objects.select_related('author', 'category') \
+                .prefetch_related('tags').defer('search_vector')
         
         if self.action == 'list':
             # For list view, only show published posts to non-authenticated users
@@ -77,19 +89,36 @@ class PostViewSet(viewsets.ModelViewSet):
             return PostCreateUpdateSerializer
         return PostDetailSerializer
 
+    def list_cache_tags(self, data):
+        # Any post change can move posts between pages; each post on this
+        # page (and its category and tags) is also a dependency
+        tags = {'posts'}
+        for item in data['results'] if isinstance(data, dict) else data:
+            tags |= post_tags(item)
+        return tags
+
+    def detail_cache_tags(self, data):
+        return post_tags(data)
+
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        
-        # Track post view
-        if instance.is_published:
-            PostView.objects.create(
-                post=instance,
+        def render():
+            instance = self.get_object()
+            serializer = self.get_serializer(instance)
+            return serializer.data, {'post_id': instance.pk, 'published': instance.is_published}
+
+        response, post = self.cached_response(request, render, self.detail_cache_tags)
+
+        # Track post view (buffered, written in batches by the view tracker);
+        # a 304 to a revalidating client is a read too
+        if post['published'] and response.status_code in (status.HTTP_200_OK,
+                                                          status.HTTP_304_NOT_MODIFIED):
+            get_view_tracker().record(
+                post_id=post['post_id'],
                 ip_address=self.get_client_ip(request),
                 user_agent=request.META.get('HTTP_USER_AGENT', '')
             )
         
-        return Response(serializer.data)
+        return response
 
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -99,19 +128,44 @@ class PostViewSet(viewsets.ModelViewSet):
             ip = request.META.get('REMOTE_ADDR')
         return ip
 
+    def paginated(self, request, queryset, paginator, serializer_class):
+        # view=None: the post ordering filter does not apply to these rows
+        page = paginator.paginate_queryset(queryset, request, view=None)
+        serializer = serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=True, methods=['get'])
     def comments(self, request, slug=None):
         post = self.get_object()
         comments = post.comments.filter(is_approved=True)
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        return self.paginated(request, comments, CommentCursorPagination(), CommentSerializer)
 
     @action(detail=True, methods=['get'])
     def views(self, request, slug=None):
         post = self.get_object()
         views = post.views.all()
-        serializer = PostViewSerializer(views, many=True)
-        return Response(serializer.data)
+        return self.paginated(request, views, PostViewCursorPagination(), PostViewSerializer)
+
+    @action(detail=True, methods=['get'])
+    def analytics(self, request, slug=None):
+        """Views per hour or day, from the rollups (blog/rollups.py).
+
+        `?interval=hour|day` (default day), `?start=`/`?end=` ISO datetimes
+        (default the last 30 days, or 48 hours). Views not rolled up yet are
+        not included; `rolled_up_at` says when the rollups last ran.
+        """
+        post = self.get_object()
+        params = ViewAnalyticsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        interval, start, end = (params.validated_data[key] for key in ('interval', 'start', 'end'))
+        series = view_series(post.pk, interval, start, end)
+        return Response({
+            'post': post.pk,
+            'interval': interval,
+            'rolled_up_at': get_state().updated_at,
+            'total': sum(point['views'] for point in series),
+            'series': ViewSeriesPointSerializer(series, many=True).data,
+        })
 
 
 class CommentViewSet(viewsets.ModelViewSet):
@@ -120,6 +174,7 @@ class CommentViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['post', 'is_approved']
+    pagination_class = CommentCursorPagination
 
     def get_queryset(self):
         if self.request.user.is_authenticated:
@@ -132,4 +187,5 @@ class PostViewViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = PostViewSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['post']
\ No newline at end of file
+    filterset_fields = ['post']
+    pagination_class = PostViewCursorPagination
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""
+Micro-benchmark: CSRFMiddleware overhead per request
+
+Wraps a no-op WSGI app and times the middleware alone for a few request
+shapes, with hundreds of exempt route patterns, against a copy of the
+previous implementation (one re.match per pattern, SimpleCookie per
+request).
+
+    python bench_middleware.py --routes 500
+"""
+import argparse
+import random
+import re
+import string
+import timeit
+from http import cookies
+
+from csrf_middleware import CSRFMiddleware
+
+
+class LegacyCSRFMiddleware(CSRFMiddleware):
+    """The exempt-route and cookie handling CSRFMiddleware used to have"""
+
+    def _is_exempt_route(self, path):
+        for route in self.exempt_routes:
+            if re.match(route, path):
+                return True
+        return False
+
+    def _get_session_id(self, environ):
+        cookie_header = environ.get('HTTP_COOKIE', '')
+        if not cookie_header:
+            return None
+        simple_cookie = cookies.SimpleCookie()
+        try:
+            simple_cookie.load(cookie_header)
+            session_cookie = simple_cookie.get('sessionid')
+            if session_cookie:
+                return session_cookie.value
+        except (KeyError, AttributeError):
+            pass
+        return None
+
+
+def make_routes(count, rng):
+    """Mostly literal prefixes, some exact paths and some real regexes"""
+    def segment():
+        return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+    routes = []
+    for i in range(count):
+        path = '/' + '/'.join(segment() for _ in range(rng.randint(1, 3)))
+        kind = i % 10
+        if kind < 7:
+            routes.append(f'^{path}/')
+        elif kind < 9:
+            routes.append(f'^{path}$')
+        else:
+            routes.append(rf'^{path}/\d+/(?:edit|delete)$')
+    return routes
+
+
+def app(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'ok']
+
+
+def start_response(status, headers):
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CSRFMiddleware overhead per request')
+    parser.add_argument('--routes', type=int, default=500, help='Number of exempt route patterns')
+    parser.add_argument('--number', type=int, default=20000, help='Requests per measurement')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    routes = make_routes(args.routes, rng)
+    current = CSRFMiddleware(app, 'bench-secret', routes)
+    legacy = LegacyCSRFMiddleware(app, 'bench-secret', routes)
+    token = current.generate_csrf_token('session-123')
+    cookie = 'theme=dark; _ga=GA1.2.3456789.1234567890; sessionid=session-123; lang=en-US'
+
+    # A prefix route from the middle of the list
+    exempt_path = routes[len(routes) // 20 * 10].lstrip('^') + 'webhook'
+    requests = {
+        'GET (safe method)': {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/accounts/profile'},
+        'POST exempt route': {'REQUEST_METHOD': 'POST', 'PATH_INFO': exempt_path},
+        'POST header token': {'REQUEST_METHOD': 'POST', 'PATH_INFO': '/accounts/profile',
+                              'HTTP_COOKIE': cookie, 'HTTP_X_CSRF_TOKEN': token},
+        'POST no session': {'REQUEST_METHOD': 'POST', 'PATH_INFO': '/accounts/profile',
+                            'HTTP_COOKIE': 'theme=dark; lang=en-US'},
+    }
+
+    print(f'{len(routes)} exempt routes, microseconds per request')
+    print(f"{'request':<22}{'legacy':>10}{'current':>10}{'speedup':>10}")
+    for label, environ in requests.items():
+        timings = []
+        for middleware in (legacy, current):
+            call = lambda: middleware(dict(environ), start_response)  # noqa: E731
+            timings.append(min(timeit.repeat(call, number=args.number, repeat=3))
+                           / args.number * 1e6)
+        print(f'{label:<22}{timings[0]:>10.2f}{timings[1]:>10.2f}{timings[0] / timings[1]:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+import json
+from email.message import Message
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+# Bytes read from wsgi.input per step while looking for a multipart field
+CHUNK_SIZE = 8192
+
+# _scan_multipart() results
+_FOUND, _ABSENT, _MORE = 'found', 'absent', 'more'
+
+
+class ReplayInput:
+    def __init__(self, consumed: bytes, stream, remaining: int):
+        """
+        wsgi.input replacement that replays bytes already read from the body
+
+        Serves ``consumed`` first and then continues with ``stream``, never
+        reading more than ``remaining`` bytes from it (the rest of
+        CONTENT_LENGTH), so the application sees the complete body and can
+        still stream it in pieces.
+
+        Args:
+            consumed: Bytes read from the start of the body
+            stream: The original wsgi.input
+            remaining: Bytes of the body still unread in ``stream``
+        """
+        self._buffer = consumed
+        self._pos = 0
+        self._stream = stream
+        self._remaining = max(0, remaining)
+
+    def _take(self, size: int) -> bytes:
+        chunk = self._buffer[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        if self._pos >= len(self._buffer):
+            self._buffer, self._pos = b'', 0  # replayed: release it
+        return chunk
+
+    def _read_stream(self, size: int) -> bytes:
+        size = min(size, self._remaining)
+        if size <= 0:
+            return b''
+        data = self._stream.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        buffered = len(self._buffer) - self._pos
+        if size is None or size < 0:
+            return self._take(buffered) + self._read_stream(self._remaining)
+        chunk = self._take(size) if buffered else b''
+        if len(chunk) < size:
+            chunk += self._read_stream(size - len(chunk))
+        return chunk
+
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        limit = self._remaining + len(self._buffer) - self._pos
+        if size is not None and size >= 0:
+            limit = min(limit, size)
+        end = self._buffer.find(b'\n', self._pos, self._pos + limit)
+        if end >= 0:
+            return self._take(end + 1 - self._pos)
+        line = self._take(limit)
+        limit -= len(line)
+        if limit > 0:
+            rest = self._stream.readline(min(limit, self._remaining))
+            self._remaining -= len(rest)
+            line += rest
+        return line
+
+    def readlines(self, hint: int = -1) -> list:
+        lines, total = [], 0
+        for line in self:
+            lines.append(line)
+            total += len(line)
+            if 0 < hint <= total:
+                break
+        return lines
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+
+def _content_length(environ: Dict) -> int:
+    try:
+        return max(0, int(environ.get('CONTENT_LENGTH') or 0))
+    except ValueError:
+        return 0
+
+
+def _header_params(header: str, value: str) -> Message:
+    message = Message()
+    message[header] = value
+    return message
+
+
+def _scan_multipart(data: bytes, boundary: bytes, field: str) -> Tuple[str, Optional[bytes]]:
+    """Look for a non-file field in the start of a multipart body"""
+    delimiter = b'--' + boundary
+    pos = data.find(delimiter)
+    if pos < 0:
+        return _MORE, None
+    while True:
+        pos += len(delimiter)
+        if len(data) < pos + 2:
+            return _MORE, None
+        if data[pos:pos + 2] == b'--':
+            return _ABSENT, None  # closing delimiter
+        headers_end = data.find(b'\r\n\r\n', pos)
+        if headers_end < 0:
+            return _MORE, None
+        disposition = ''
+        for line in data[pos:headers_end].decode('latin-1').split('\r\n'):
+            name, _, value = line.partition(':')
+            if name.strip().lower() == 'content-disposition':
+                disposition = value.strip()
+        params = _header_params('Content-Disposition', disposition)
+        if params.get_param('filename', header='content-disposition') is not None:
+            return _ABSENT, None  # never buffer file parts: stop at the first one
+        body_start = headers_end + 4
+        body_end = data.find(b'\r\n' + delimiter, body_start)
+        if body_end < 0:
+            return _MORE, None
+        if params.get_param('name', header='content-disposition') == field:
+            return _FOUND, data[body_start:body_end]
+        pos = body_end + 2
+
+
+def _read_multipart_field(environ: Dict, stream, field: str,
+                          limit: int) -> Tuple[bytes, Optional[str]]:
+    """Read chunks until ``field`` is found, a file part starts or ``limit`` is hit"""
+    content_type = _header_params('Content-Type', environ.get('CONTENT_TYPE', ''))
+    boundary = content_type.get_param('boundary')
+    if not boundary:
+        return b'', None
+    to_read = min(_content_length(environ), limit)
+    consumed = b''
+    while True:
+        state, value = _scan_multipart(consumed, boundary.encode('latin-1'), field)
+        if state == _FOUND:
+            return consumed, value.decode('utf-8', 'replace')
+        if state == _ABSENT or len(consumed) >= to_read:
+            return consumed, None
+        chunk = stream.read(min(CHUNK_SIZE, to_read - len(consumed)))
+        if not chunk:
+            return consumed, None
+        consumed += chunk
+
+
+def read_body_token(environ: Dict, field: str, limit: int) -> Optional[str]:
+    """
+    Find a CSRF token in the request body without holding the whole body
+
+    Reads at most ``limit`` bytes of a urlencoded form, JSON or multipart
+    body, then replaces wsgi.input with a ReplayInput so the application
+    still receives every byte.
+
+    - Forms: only pairs complete within the first ``limit`` bytes count.
+    - JSON: bodies larger than ``limit`` are not read (use a header).
+    - Multipart: parts are scanned until the field is found; reading stops
+      at the first file part, so the token field must come before files.
+
+    Args:
+        environ: WSGI environment
+        field: Form field / JSON key holding the token
+        limit: Maximum number of body bytes to read
+
+    Returns:
+        The token, or None if it was not found
+    """
+    content_type = environ.get('CONTENT_TYPE', '')
+    content_length = _content_length(environ)
+    if content_length <= 0 or limit <= 0:
+        return None
+    stream = environ['wsgi.input']
+    token = None
+
+    if content_type.startswith('application/x-www-form-urlencoded'):
+        consumed = stream.read(min(content_length, limit))
+        form_data = consumed
+        if len(consumed) < content_length:
+            form_data = consumed[:consumed.rfind(b'&') + 1]  # drop the cut-off pair
+        values = parse_qs(form_data.decode('utf-8', 'replace')).get(field)
+        token = values[0] if values else None
+    elif content_type.startswith('application/json'):
+        if content_length > limit:
+            return None
+        consumed = stream.read(content_length)
+        try:
+            json_data = json.loads(consumed.decode('utf-8'))
+        except ValueError:
+            json_data = None
+        if isinstance(json_data, dict) and isinstance(json_data.get(field), str):
+            token = json_data[field]
+    elif content_type.startswith('multipart/form-data'):
+        consumed, token = _read_multipart_field(environ, stream, field, limit)
+    else:
+        return None
+
+    environ['wsgi.input'] = ReplayInput(consumed, stream, content_length - len(consumed))
+    return token
@@ -23,4 +23,8 @@ class CSRFConfig:
     # Token names in requests
     TOKEN_HEADER_NAMES = ['X-CSRF-Token', 'X-XSRF-Token']
     TOKEN_PARAM_NAME = 'csrf_token'
-    TOKEN_COOKIE_NAME = 'csrftoken'
\ No newline at end of file
+    TOKEN_COOKIE_NAME = 'csrftoken'
+    
+    # Most request body bytes read when looking for the token in a form,
+    # JSON or multipart body (the application still gets the whole body)
+    BODY_INSPECTION_LIMIT = 64 * 1024
\ No newline at end of file
@@ -1,10 +1,16 @@
 import secrets
 from typing import Callable, Dict, Any, Optional
 from http import cookies
-import re
+from csrf_body import read_body_token
+from csrf_routes import ExemptRouteMatcher
 from csrf_token import CSRFTokenGenerator
+
+SAFE_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+
 class CSRFMiddleware:
-    def __init__(self, app, secret_key: str, exempt_routes: list = None):
+    def __init__(self, app, secret_key: str, exempt_routes: list = None,
+                 inspect_body: bool = True, body_inspection_limit: int = 64 * 1024):
         """
         CSRF Protection Middleware
         
@@ -12,15 +18,26 @@ class CSRFMiddleware:
             app: WSGI application
             secret_key: Secret key for token generation
             exempt_routes: List of routes to exempt from CSRF protection
+            inspect_body: Look for the token in form, JSON and multipart bodies
+                when no token header is sent
+            body_inspection_limit: Maximum number of body bytes read for that;
+                the application still receives the whole body
         """
         self.app = app
         self.csrf_generator = CSRFTokenGenerator(secret_key)
         self.exempt_routes = exempt_routes or []
+        # Compiled once; reassign exempt_routes through set_exempt_routes()
+        self._exempt_matcher = ExemptRouteMatcher(self.exempt_routes)
         
         # Headers that can contain CSRF token
         self.token_headers = ['X-CSRF-Token', 'X-XSRF-Token']
+        self._token_environ_keys = [
+            f'HTTP_{header_name.upper().replace("-", "_")}' for header_name in self.token_headers
+        ]
         self.token_param = 'csrf_token'
         self.token_cookie = 'csrftoken'
+        self.inspect_body = inspect_body
+        self.body_inspection_limit = body_inspection_limit
     
     def __call__(self, environ: Dict, start_response: Callable) -> Any:
         """
@@ -31,7 +48,7 @@ class CSRFMiddleware:
         path = environ.get('PATH_INFO', '')
         
         # Skip CSRF check for safe methods and exempt routes
-        if method in ['GET', 'HEAD', 'OPTIONS'] or self._is_exempt_route(path):
+        if method in SAFE_METHODS or self._is_exempt_route(path):
             return self.app(environ, start_response)
         
         # Get session ID from cookies
@@ -46,19 +63,34 @@ class CSRFMiddleware:
         # Process the request
         return self.app(environ, start_response)
     
+    def set_exempt_routes(self, exempt_routes: list):
+        """Replace the exempt routes and recompile the matcher"""
+        self.exempt_routes = list(exempt_routes)
+        self._exempt_matcher = ExemptRouteMatcher(self.exempt_routes)
+    
     def _is_exempt_route(self, path: str) -> bool:
         """Check if route is exempt from CSRF protection"""
-        for route in self.exempt_routes:
-            if re.match(route, path):
-                return True
-        return False
+        return self._exempt_matcher.match(path)
     
     def _get_session_id(self, environ: Dict) -> Optional[str]:
         """Extract session ID from cookies"""
         cookie_header = environ.get('HTTP_COOKIE', '')
-        if not cookie_header:
+        if not cookie_header or 'sessionid' not in cookie_header:
             return None
         
+        # Scan for the one cookie we need instead of parsing them all; the
+        # last 'sessionid' wins, as with SimpleCookie
+        session_id = None
+        for pair in cookie_header.split(';'):
+            name, sep, value = pair.partition('=')
+            if sep and name.strip() == 'sessionid':
+                session_id = value.strip()
+        if session_id is None or not session_id.startswith('"'):
+            return session_id
+        if '\\' not in session_id and len(session_id) >= 2 and session_id.endswith('"'):
+            return session_id[1:-1]
+        
+        # Quoted value with escapes: let SimpleCookie decode it
         simple_cookie = cookies.SimpleCookie()
         try:
             simple_cookie.load(cookie_header)
@@ -73,46 +105,16 @@ class CSRFMiddleware:
     def _validate_csrf_token(self, environ: Dict, session_id: str) -> bool:
         """Validate CSRF token from request"""
         # Get token from headers
-        for header_name in self.token_headers:
-            token = environ.get(f'HTTP_{header_name.upper().replace("-", "_")}')
+        for environ_key in self._token_environ_keys:
+            token = environ.get(environ_key)
             if token:
                 return self.csrf_generator.validate_token(token, session_id)
         
-        # Get token from form data for POST requests
-        if environ.get('CONTENT_TYPE', '').startswith('application/x-www-form-urlencoded'):
-            try:
-                # Read POST data
-                content_length = int(environ.get('CONTENT_LENGTH', 0))
-                if content_length > 0:
-                    post_data = environ['wsgi.input'].read(content_length)
-                    environ['wsgi.input'] = type('', (), {'read': lambda x: post_data})()
-                    
-                    # Parse form data
-                    from urllib.parse import parse_qs
-                    form_data = parse_qs(post_data.decode('utf-8'))
-                    
-                    token = form_data.get(self.token_param, [None])[0]
-                    if token and self.csrf_generator.validate_token(token, session_id):
-                        return True
-            except (ValueError, KeyError, IndexError):
-                pass
-        
-        # Get token from JSON body for API requests
-        if environ.get('CONTENT_TYPE', '').startswith('application/json'):
-            try:
-                content_length = int(environ.get('CONTENT_LENGTH', 0))
-                if content_length > 0:
-                    import json
-                    post_data = environ['wsgi.input'].read(content_length)
-                    environ['wsgi.input'] = type('', (), {'read': lambda x: post_data})()
-                    
-                    json_data = json.loads(post_data.decode('utf-8'))
-                    token = json_data.get(self.token_param)
-                    
-                    if token and self.csrf_generator.validate_token(token, session_id):
-                        return True
-            except (json.JSONDecodeError, ValueError, KeyError):
-                pass
+        # Get token from form, JSON or multipart body
+        if self.inspect_body:
+            token = read_body_token(environ, self.token_param, self.body_inspection_limit)
+            if token and self.csrf_generator.validate_token(token, session_id):
+                return True
         
         return False
     
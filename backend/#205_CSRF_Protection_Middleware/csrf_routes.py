@@ -0,0 +1,78 @@
+import re
+from typing import Iterable, Optional
+
+# A route that is a plain literal: optional '^', no regex syntax, optional '$'
+_LITERAL_ROUTE = re.compile(r'\^?([^.^$*+?{}\[\]\\|()]*)(\$?)\Z')
+
+# Trie node markers (never equal to a one-character key)
+_PREFIX = 0
+_EXACT = 1
+
+
+class ExemptRouteMatcher:
+    def __init__(self, routes: Iterable[str]):
+        """
+        Precompiled matcher for CSRF-exempt routes
+
+        Matches a path exactly when ``any(re.match(route, path) for route in
+        routes)`` would, without running one regex per route:
+
+        - literal routes (``^/api/public/``, ``^/healthcheck$``) go into a
+          character trie, walked once per path;
+        - the other patterns are joined into one alternation regex;
+        - patterns that cannot be joined (capture groups, which may be
+          referenced by number, or inline global flags) are kept apart.
+
+        Args:
+            routes: Regular expressions matched at the start of the path
+        """
+        self.routes = list(routes)
+        self._trie: dict = {}
+        combined = []
+        self._separate = []
+        for route in self.routes:
+            literal = _LITERAL_ROUTE.match(route)
+            if literal:
+                self._add_literal(*literal.groups())
+                continue
+            pattern = re.compile(route)
+            if pattern.groups or pattern.flags != re.UNICODE:
+                self._separate.append(pattern)
+            else:
+                combined.append(f'(?:{route})')
+        self._combined: Optional[re.Pattern] = re.compile('|'.join(combined)) if combined else None
+
+    def _add_literal(self, text: str, anchored: str):
+        node = self._trie
+        for char in text:
+            node = node.setdefault(char, {})
+        node[_EXACT if anchored else _PREFIX] = True
+
+    def _match_literal(self, path: str) -> bool:
+        node = self._trie
+        for char in path:
+            if _PREFIX in node:
+                return True
+            node = node.get(char)
+            if node is None:
+                return False
+        return _PREFIX in node or _EXACT in node
+
+    def match(self, path: str) -> bool:
+        """Check if path matches any of the routes"""
+        if self._trie and self._match_literal(path):
+            return True
+        # '$' also matches before a trailing newline
+        if self._trie and path.endswith('\n') and _EXACT in self._find(path[:-1]):
+            return True
+        if self._combined is not None and self._combined.match(path):
+            return True
+        return any(pattern.match(path) for pattern in self._separate)
+
+    def _find(self, text: str) -> dict:
+        node = self._trie
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return {}
+        return node
@@ -1,4 +1,10 @@
+import io
+import json
+import re
 import unittest
+from csrf_body import ReplayInput
+from csrf_middleware import CSRFMiddleware
+from csrf_routes import ExemptRouteMatcher
 from csrf_token import CSRFTokenGenerator
 
 class TestCSRFToken(unittest.TestCase):
@@ -25,5 +31,148 @@ class TestCSRFToken(unittest.TestCase):
         tampered_token = token[:-5] + "abcde"
         self.assertFalse(self.generator.validate_token(tampered_token, self.session_id))
 
+class TestExemptRouteMatcher(unittest.TestCase):
+    routes = [
+        r'^/api/public/',
+        r'^/healthcheck$',
+        r'/docs',
+        r'^/hooks/\d+/(?:ping|push)$',
+        r'^/(a)\1/',
+        r'(?i)^/ADMIN/export',
+        r'^/static/.*\.css$',
+    ]
+    paths = [
+        '/api/public/', '/api/public/items/1', '/api/publi', '/healthcheck', '/healthcheck\n',
+        '/healthcheck/', '/docs', '/docsearch', '/x/docs', '/hooks/12/ping', '/hooks/x/ping',
+        '/aa/', '/ab/', '/admin/export.csv', '/static/site.css', '/static/site.js', '', '/',
+    ]
+
+    def test_matches_like_re_match(self):
+        matcher = ExemptRouteMatcher(self.routes)
+        for path in self.paths:
+            expected = any(re.match(route, path) for route in self.routes)
+            self.assertEqual(matcher.match(path), expected, path)
+
+    def test_empty_and_catch_all(self):
+        self.assertFalse(ExemptRouteMatcher([]).match('/anything'))
+        self.assertTrue(ExemptRouteMatcher(['^']).match('/anything'))
+
+
+class TestCSRFMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.middleware = CSRFMiddleware(self.app, "test-secret-key", [r'^/api/public/'])
+        self.token = self.middleware.generate_csrf_token("test-session-123")
+
+    @staticmethod
+    def app(environ, start_response):
+        start_response('200 OK', [])
+        return [b'ok']
+
+    def call(self, **environ):
+        statuses = []
+        body = self.middleware({'REQUEST_METHOD': 'POST', 'PATH_INFO': '/submit', **environ},
+                               lambda status, headers: statuses.append(status))
+        return statuses[0], b''.join(body)
+
+    def test_session_cookie_scan(self):
+        cases = {
+            'sessionid=abc': 'abc',
+            'theme=dark; sessionid=abc; lang=en': 'abc',
+            'sessionid="quoted"': 'quoted',
+            r'sessionid="a\"b"': 'a"b',
+            'sessionid=first; sessionid=last': 'last',
+            'xsessionid=abc': None,
+            'theme=dark': None,
+            '': None,
+        }
+        for header, expected in cases.items():
+            self.assertEqual(self.middleware._get_session_id({'HTTP_COOKIE': header}), expected, header)
+
+    def test_request_flow(self):
+        self.assertEqual(self.call(PATH_INFO='/api/public/x')[0], '200 OK')
+        self.assertEqual(self.call(REQUEST_METHOD='GET')[0], '200 OK')
+        self.assertEqual(self.call()[0], '403 Forbidden')
+        cookie = 'sessionid=test-session-123'
+        self.assertEqual(self.call(HTTP_COOKIE=cookie, HTTP_X_CSRF_TOKEN=self.token)[0], '200 OK')
+        self.assertEqual(self.call(HTTP_COOKIE=cookie, HTTP_X_CSRF_TOKEN='bad')[0], '403 Forbidden')
+        self.middleware.set_exempt_routes([r'^/submit$'])
+        self.assertEqual(self.call()[0], '200 OK')
+
+
+class TestBodyInspection(unittest.TestCase):
+    session = "test-session-123"
+
+    def setUp(self):
+        self.received = None
+        self.middleware = CSRFMiddleware(self.app, "test-secret-key", body_inspection_limit=1024)
+        self.token = self.middleware.generate_csrf_token(self.session)
+
+    def app(self, environ, start_response):
+        # Read the way streaming consumers do: fixed-size chunks
+        stream, chunks = environ['wsgi.input'], []
+        while True:
+            chunk = stream.read(100)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        self.received = b''.join(chunks)
+        start_response('200 OK', [])
+        return [b'ok']
+
+    def post(self, body, content_type):
+        source = io.BytesIO(body + b'TRAILING GARBAGE')  # must never be read
+        statuses = []
+        self.middleware({
+            'REQUEST_METHOD': 'POST', 'PATH_INFO': '/submit', 'CONTENT_TYPE': content_type,
+            'CONTENT_LENGTH': str(len(body)), 'HTTP_COOKIE': f'sessionid={self.session}',
+            'wsgi.input': source,
+        }, lambda status, headers: statuses.append(status))
+        return statuses[0], source.tell()
+
+    def multipart(self, *parts):
+        body = b''
+        for headers, content in parts:
+            body += b'--XyZ\r\n' + headers + b'\r\n\r\n' + content + b'\r\n'
+        return body + b'--XyZ--\r\n'
+
+    def test_replay_input(self):
+        stream = ReplayInput(b'line one\nline', io.BytesIO(b' two\nthree\nextra'), 11)
+        self.assertEqual(stream.read(5), b'line ')
+        self.assertEqual(stream.readline(), b'one\n')
+        self.assertEqual(stream.readline(), b'line two\n')
+        self.assertEqual(list(stream), [b'three\n'])
+        self.assertEqual(stream.read(), b'')
+
+    def test_form_token(self):
+        body = f'csrf_token={self.token}&data='.encode() + b'x' * 5000
+        self.assertEqual(self.post(body, 'application/x-www-form-urlencoded')[0], '200 OK')
+        self.assertEqual(self.received, body)
+        late = b'data=' + b'x' * 5000 + f'&csrf_token={self.token}'.encode()
+        self.assertEqual(self.post(late, 'application/x-www-form-urlencoded'),
+                         ('403 Forbidden', 1024))
+
+    def test_json_token(self):
+        body = json.dumps({'csrf_token': self.token, 'data': 'x'}).encode()
+        self.assertEqual(self.post(body, 'application/json')[0], '200 OK')
+        self.assertEqual(self.received, body)
+        for body in [json.dumps([self.token]).encode(), json.dumps({'csrf_token': 1}).encode(),
+                     json.dumps({'csrf_token': self.token, 'pad': 'x' * 2000}).encode()]:
+            self.assertEqual(self.post(body, 'application/json')[0], '403 Forbidden')
+
+    def test_multipart_stops_at_file_parts(self):
+        upload = b'\x00' * 50000
+        token_part = (b'Content-Disposition: form-data; name="csrf_token"', self.token.encode())
+        file_part = (b'Content-Disposition: form-data; name="file"; filename="a.bin"\r\n'
+                     b'Content-Type: application/octet-stream', upload)
+        content_type = 'multipart/form-data; boundary=XyZ'
+        body = self.multipart((b'Content-Disposition: form-data; name="title"', b'Hi'),
+                              token_part, file_part)
+        self.assertEqual(self.post(body, content_type)[0], '200 OK')
+        self.assertEqual(self.received, body)
+        status, read = self.post(self.multipart(file_part, token_part), content_type)
+        self.assertEqual(status, '403 Forbidden')
+        self.assertLessEqual(read, 1024)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
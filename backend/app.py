@@ -1,9 +1,14 @@
 from flask import Flask, request, jsonify
 from flask_jwt_extended import JWTManager, create_access_token, create_refresh_token, jwt_required, get_jwt_identity, verify_jwt_in_request
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import timedelta
+import math
 import os
 
+from auth_cache import ProfileCache, VerifiedTokenCache, jwt_required_cached
+from password_hashing import HashingBusy, PasswordHasher
+from rate_limit import RateLimiter
+from user_store import UserExists, create_user_repository
+
 app = Flask(__name__)
 
 # JWT Configuration
@@ -11,10 +16,59 @@ app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-super-secret-ke
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
 app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=7)
 
+# Password hashing: KDF cost and the bounded worker pool that runs it.
+# Existing hashes stay valid when the cost changes (the method is stored in the hash).
+app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+app.config['PASSWORD_SALT_LENGTH'] = int(os.getenv('PASSWORD_SALT_LENGTH', '16'))
+app.config['HASH_WORKERS'] = int(os.getenv('HASH_WORKERS', '2'))
+app.config['HASH_QUEUE_LIMIT'] = int(os.getenv('HASH_QUEUE_LIMIT', '16'))
+app.config['HASH_TIMEOUT_SECONDS'] = float(os.getenv('HASH_TIMEOUT_SECONDS', '5'))
+
+# Throttling ("<requests>/<second|minute|hour|day>") per client IP and per account
+app.config['LOGIN_RATE_PER_IP'] = os.getenv('LOGIN_RATE_PER_IP', '20/minute')
+app.config['LOGIN_RATE_PER_ACCOUNT'] = os.getenv('LOGIN_RATE_PER_ACCOUNT', '5/minute')
+app.config['REGISTER_RATE_PER_IP'] = os.getenv('REGISTER_RATE_PER_IP', '10/minute')
+
+# Caches for authenticated requests (0 disables). Verified tokens are opt-in:
+# a cached token skips signature checks until its own expiry.
+app.config['JWT_VERIFY_CACHE_SIZE'] = int(os.getenv('JWT_VERIFY_CACHE_SIZE', '0'))
+app.config['PROFILE_CACHE_SIZE'] = int(os.getenv('PROFILE_CACHE_SIZE', '10000'))
+
 jwt = JWTManager(app)
 
-# Mock user database (replace with real database)
-users = {}
+hasher = PasswordHasher(
+    method=app.config['PASSWORD_HASH_METHOD'],
+    salt_length=app.config['PASSWORD_SALT_LENGTH'],
+    workers=app.config['HASH_WORKERS'],
+    max_queue=app.config['HASH_QUEUE_LIMIT'],
+    timeout=app.config['HASH_TIMEOUT_SECONDS'],
+)
+login_ip_limiter = RateLimiter(app.config['LOGIN_RATE_PER_IP'])
+login_account_limiter = RateLimiter(app.config['LOGIN_RATE_PER_ACCOUNT'])
+register_ip_limiter = RateLimiter(app.config['REGISTER_RATE_PER_IP'])
+token_cache = VerifiedTokenCache(app.config['JWT_VERIFY_CACHE_SIZE'])
+profile_cache = ProfileCache(app.config['PROFILE_CACHE_SIZE'])
+
+# User store: 'memory' (default) or 'sqlite:///path/to/users.db'
+users = create_user_repository(os.getenv('USER_STORE', 'memory'))
+
+
+def too_many_requests(retry_after, message):
+    response = jsonify({
+        "success": False,
+        "message": message
+    })
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response, 429
+
+
+def hashing_busy():
+    response = jsonify({
+        "success": False,
+        "message": "Server busy, please retry shortly"
+    })
+    response.headers['Retry-After'] = '1'
+    return response, 503
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -40,23 +94,27 @@ def register():
         password = data['password']
         name = data.get('name', email)
         
-        # Check if user already exists
-        if email in users:
+        wait = register_ip_limiter.hit(request.remote_addr)
+        if wait:
+            return too_many_requests(wait, "Too many registrations, slow down")
+        
+        # Check if user already exists (cheap early exit before hashing)
+        if users.get_by_email(email):
             return jsonify({
                 "success": False,
                 "message": "User already exists"
             }), 400
         
-        # Create new user
-        user_id = f"user_{len(users) + 1}"
-        hashed_password = generate_password_hash(password)
-        
-        users[email] = {
-            'id': user_id,
-            'email': email,
-            'name': name,
-            'password': hashed_password
-        }
+        # Create new user; the store allocates the id and enforces unique emails
+        hashed_password = hasher.hash(password)
+        try:
+            user = users.create(email, name, hashed_password)
+        except UserExists:
+            return jsonify({
+                "success": False,
+                "message": "User already exists"
+            }), 400
+        user_id = user['id']
         
         return jsonify({
             "success": True,
@@ -68,6 +126,8 @@ def register():
             }
         }), 201
         
+    except HashingBusy:
+        return hashing_busy()
     except Exception as e:
         return jsonify({
             "success": False,
@@ -88,9 +148,19 @@ def login():
         email = data['email']
         password = data['password']
         
+        # Throttle before any KDF work so floods are cheap to turn away
+        wait = max(login_ip_limiter.hit(request.remote_addr),
+                   login_account_limiter.hit(str(email).lower()))
+        if wait:
+            return too_many_requests(wait, "Too many login attempts, try again later")
+        
         # Check if user exists and password is correct
-        user = users.get(email)
-        if not user or not check_password_hash(user['password'], password):
+        user = users.get_by_email(email)
+        if user:
+            valid = hasher.verify(user['password'], password)
+        else:
+            valid = hasher.verify_unknown(password)
+        if not valid:
             return jsonify({
                 "success": False,
                 "message": "Invalid credentials"
@@ -112,6 +182,8 @@ def login():
             }
         })
         
+    except HashingBusy:
+        return hashing_busy()
     except Exception as e:
         return jsonify({
             "success": False,
@@ -137,17 +209,58 @@ def refresh():
         }), 500
 
 @app.route('/api/auth/profile', methods=['GET'])
-@jwt_required()
+@jwt_required_cached(token_cache)
 def profile():
     try:
         current_user_id = get_jwt_identity()
         
-        # Find user by ID
-        user = None
-        for email, user_data in users.items():
-            if user_data['id'] == current_user_id:
-                user = user_data
-                break
+        public_user = profile_cache.get(current_user_id)
+        if public_user is None:
+            generation = profile_cache.generation()
+            # Indexed lookup by ID
+            user = users.get_by_id(current_user_id)
+            
+            if not user:
+                return jsonify({
+                    "success": False,
+                    "message": "User not found"
+                }), 404
+            
+            public_user = {
+                "id": user['id'],
+                "email": user['email'],
+                "name": user['name']
+            }
+            # Skipped if an update invalidated profiles during the read
+            profile_cache.set_if_unchanged(current_user_id, public_user, generation)
+        
+        return jsonify({
+            "success": True,
+            "message": "Profile accessed successfully",
+            "user": public_user
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": "Profile access failed"
+        }), 500
+
+@app.route('/api/auth/profile', methods=['PUT'])
+@jwt_required_cached(token_cache)
+def update_profile():
+    try:
+        current_user_id = get_jwt_identity()
+        data = request.get_json(silent=True) or {}
+        
+        if not isinstance(data.get('name'), str) or not data['name'].strip():
+            return jsonify({
+                "success": False,
+                "message": "A non-empty name is required"
+            }), 400
+        
+        user = users.update(current_user_id, name=data['name'].strip())
+        profile_cache.invalidate(current_user_id)
         
         if not user:
             return jsonify({
@@ -157,7 +270,7 @@ def profile():
         
         return jsonify({
             "success": True,
-            "message": "Profile accessed successfully",
+            "message": "Profile updated successfully",
             "user": {
                 "id": user['id'],
                 "email": user['email'],
@@ -168,7 +281,7 @@ def profile():
     except Exception as e:
         return jsonify({
             "success": False,
-            "message": "Profile access failed"
+            "message": "Profile update failed"
         }), 500
 
 @app.route('/api/auth', methods=['GET'])
@@ -179,7 +292,8 @@ def auth_info():
             "POST /register": "Register a new user",
             "POST /login": "Login user and get tokens",
             "POST /refresh": "Refresh access token",
-            "GET /profile": "Get user profile (protected)"
+            "GET /profile": "Get user profile (protected)",
+            "PUT /profile": "Update user name (protected)"
         },
         "status": "active"
     })
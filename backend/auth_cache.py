@@ -0,0 +1,184 @@
+"""Caches for authenticated requests in the Flask auth API.
+
+`VerifiedTokenCache` remembers access tokens whose signature and claims
+`flask_jwt_extended` has already verified, keyed by the SHA-256 digest of the
+raw token. An entry never outlives the token's own `exp`, so a cached token
+expires exactly when it would have failed verification. Revocation
+(blocklist), claims verification and user-lookup callbacks still run on every
+request. Setting up the request context for a cached token relies on
+flask_jwt_extended 4.x internals (pinned in requirements.txt); with any other
+major version every request goes through `verify_jwt_in_request`.
+
+`ProfileCache` keeps the JSON-ready profile of each user id; the API
+invalidates an entry after that user is updated. A lookup that missed takes a
+`generation()` before reading the user and stores the result with
+`set_if_unchanged()`, which drops it if any profile was invalidated in the
+meantime, so a read that raced an update cannot write the old profile back.
+
+Both are bounded LRUs; a size of 0 disables the cache.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import flask_jwt_extended
+from flask import current_app, g, request
+from flask_jwt_extended import verify_jwt_in_request
+from flask_jwt_extended.config import config as jwt_config
+from flask_jwt_extended.exceptions import UserLookupError
+
+try:
+    from flask_jwt_extended.internal_utils import (
+        custom_verification_for_token,
+        has_user_lookup,
+        user_lookup,
+        verify_token_not_blocklisted,
+    )
+    FAST_PATH_SUPPORTED = flask_jwt_extended.__version__.startswith('4.')
+except ImportError:
+    FAST_PATH_SUPPORTED = False
+
+
+class LRUCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class VerifiedTokenCache(LRUCache):
+    @staticmethod
+    def digest(token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def lookup(self, token):
+        """Return (jwt_header, jwt_data) for a still-valid verified token."""
+        key = self.digest(token)
+        entry = self.get(key)
+        if entry is None:
+            return None
+        expires_at, jwt_header, jwt_data = entry
+        if expires_at <= time.time():
+            self.pop(key)
+            return None
+        return jwt_header, jwt_data
+
+    def remember(self, token, jwt_header, jwt_data):
+        expires_at = jwt_data.get('exp')
+        if expires_at is None:
+            return  # never cache tokens without an expiry
+        self.set(self.digest(token), (expires_at, jwt_header, jwt_data))
+
+
+class ProfileCache(LRUCache):
+    def __init__(self, max_entries):
+        super().__init__(max_entries)
+        self._generation = 0
+
+    def generation(self):
+        """Take before reading a user that missed the cache."""
+        return self._generation
+
+    def set_if_unchanged(self, user_id, profile, generation):
+        """Cache `profile` unless an invalidation happened since `generation`."""
+        if self.max_entries <= 0:
+            return False
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._store(user_id, profile)
+            return True
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+
+def _bearer_token():
+    """The raw access token from the Authorization header, if present."""
+    if 'headers' not in jwt_config.token_location:
+        return None
+    value = request.headers.get(jwt_config.header_name, '')
+    prefix = f"{jwt_config.header_type} " if jwt_config.header_type else ''
+    if not value.startswith(prefix):
+        return None
+    token = value[len(prefix):].strip()
+    return token or None
+
+
+def _use_cached(jwt_header, jwt_data):
+    """Set up the request context like `verify_jwt_in_request` does."""
+    verify_token_not_blocklisted(jwt_header, jwt_data)
+    custom_verification_for_token(jwt_header, jwt_data)
+    loaded_user = None
+    if has_user_lookup():
+        user = user_lookup(jwt_header, jwt_data)
+        if user is None:
+            identity = jwt_data[jwt_config.identity_claim_key]
+            raise UserLookupError(f"user_lookup returned None for {identity}",
+                                  jwt_header, jwt_data)
+        loaded_user = {"loaded_user": user}
+    # flask_jwt_extended 4.x keeps the verified token in these g attributes
+    g._jwt_extended_jwt_user = loaded_user
+    g._jwt_extended_jwt_header = jwt_header
+    g._jwt_extended_jwt = jwt_data
+    g._jwt_extended_jwt_location = 'headers'
+
+
+def jwt_required_cached(cache):
+    """Like `@jwt_required()` for access tokens, skipping re-verification of
+    tokens found in `cache` (a `VerifiedTokenCache`)."""
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            enabled = FAST_PATH_SUPPORTED and cache.max_entries > 0
+            token = _bearer_token() if enabled else None
+            cached = cache.lookup(token) if token else None
+            if cached is not None:
+                _use_cached(*cached)
+            else:
+                verified = verify_jwt_in_request()
+                if token and verified is not None:
+                    jwt_header, jwt_data = verified
+                    cache.remember(token, jwt_header, jwt_data)
+            return current_app.ensure_sync(fn)(*args, **kwargs)
+        return decorator
+    return wrapper
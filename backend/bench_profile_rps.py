@@ -0,0 +1,167 @@
+"""Requests/second on GET /api/auth/profile with and without the auth caches.
+
+For each configuration a threaded Werkzeug server is started in a subprocess
+with the matching environment, one user is registered and logged in, and
+`--concurrency` keep-alive client threads hit `/api/auth/profile` for
+`--duration` seconds. With `--in-process` the requests go through the Flask
+test client instead, which leaves out the HTTP server and client overhead
+and isolates the cost of the view and its decorators.
+
+    python bench_profile_rps.py --duration 10 --concurrency 8
+    python bench_profile_rps.py --in-process
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+CONFIGS = {
+    'no-cache': {'JWT_VERIFY_CACHE_SIZE': '0', 'PROFILE_CACHE_SIZE': '0'},
+    'profile-cache': {'JWT_VERIFY_CACHE_SIZE': '0', 'PROFILE_CACHE_SIZE': '10000'},
+    'token-cache': {'JWT_VERIFY_CACHE_SIZE': '10000', 'PROFILE_CACHE_SIZE': '0'},
+    'both': {'JWT_VERIFY_CACHE_SIZE': '10000', 'PROFILE_CACHE_SIZE': '10000'},
+}
+
+
+def serve(port):
+    import logging
+
+    from werkzeug.serving import make_server
+
+    from app import app
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # no per-request log lines
+    make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+
+
+def loop(requests):
+    """Time `requests` profile calls through the test client (child process)."""
+    from app import app
+
+    client = app.test_client()
+    credentials = {'email': 'bench@example.com', 'password': 'bench-password'}
+    client.post('/api/auth/register', json=credentials)
+    token = client.post('/api/auth/login', json=credentials).get_json()['access_token']
+    headers = {'Authorization': f"Bearer {token}"}
+    for _ in range(200):
+        client.get('/api/auth/profile', headers=headers)
+    start = time.perf_counter()
+    for _ in range(requests):
+        assert client.get('/api/auth/profile', headers=headers).status_code == 200
+    print(requests / (time.perf_counter() - start))
+
+
+def bench_env(env_overrides):
+    return dict(os.environ, **env_overrides,
+                PASSWORD_HASH_METHOD='pbkdf2:sha256:1000',
+                LOGIN_RATE_PER_IP='1000/second', REGISTER_RATE_PER_IP='1000/second')
+
+
+def measure_in_process(name, env_overrides, args):
+    out = subprocess.run([sys.executable, __file__, '--loop', str(args.requests)],
+                         env=bench_env(env_overrides), check=True, capture_output=True,
+                         text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    rps = float(out.stdout.strip().splitlines()[-1])
+    print(f"{name:<15}{rps:>10.0f} req/s  (in-process, {args.requests} requests)")
+    return rps
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def request(conn, method, path, body=None, token=None):
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['Authorization'] = f"Bearer {token}"
+    conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                 headers=headers)
+    resp = conn.getresponse()
+    return resp.status, resp.read()
+
+
+def wait_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            if request(conn, 'GET', '/health')[0] == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError('server did not start')
+
+
+def measure(name, env_overrides, args):
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, __file__, '--serve', str(port)],
+                            env=bench_env(env_overrides),
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    try:
+        wait_ready(port)
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        credentials = {'email': 'bench@example.com', 'password': 'bench-password'}
+        request(conn, 'POST', '/api/auth/register', credentials)
+        status, body = request(conn, 'POST', '/api/auth/login', credentials)
+        token = json.loads(body)['access_token']
+
+        counts = [0] * args.concurrency
+        errors = [0] * args.concurrency
+        stop = time.monotonic() + args.duration
+
+        def worker(i):
+            c = http.client.HTTPConnection('127.0.0.1', port)
+            while time.monotonic() < stop:
+                if request(c, 'GET', '/api/auth/profile', token=token)[0] == 200:
+                    counts[i] += 1
+                else:
+                    errors[i] += 1
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.concurrency)]
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - start
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    rps = sum(counts) / elapsed
+    print(f"{name:<15}{rps:>10.0f} req/s  ({sum(counts)} ok, {sum(errors)} errors)")
+    return rps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--serve', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--loop', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--in-process', action='store_true')
+    parser.add_argument('--requests', type=int, default=5000, help='Requests per in-process run')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--configs', nargs='+', choices=list(CONFIGS), default=list(CONFIGS))
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return
+    if args.loop:
+        loop(args.loop)
+        return
+    for name in args.configs:
+        if args.in_process:
+            measure_in_process(name, CONFIGS[name], args)
+        else:
+            measure(name, CONFIGS[name], args)
+
+
+if __name__ == '__main__':
+    main()
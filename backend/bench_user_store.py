@@ -0,0 +1,96 @@
+"""Profile lookup latency versus number of registered users.
+
+Fills each user store with N users, then times `GET /api/auth/profile` through
+the Flask test client for random users, next to the old approach (a linear
+scan over the users dict) for comparison. Latency should stay flat for the
+indexed stores while the scan grows with N.
+
+    python bench_user_store.py --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import app as auth_app
+from flask_jwt_extended import create_access_token
+from user_store import SQLiteUserRepository, InMemoryUserRepository, format_user_id
+
+FAKE_HASH = 'pbkdf2:sha256:600000$benchmark$' + '0' * 64
+
+
+def rows(n):
+    return ((f"user{i}@example.com", f"User {i}", FAKE_HASH) for i in range(n))
+
+
+def linear_lookup(users_by_email, user_id):
+    """The previous profile lookup: scan every user for a matching id."""
+    for email, user_data in users_by_email.items():
+        if user_data['id'] == user_id:
+            return user_data
+    return None
+
+
+def time_calls(fn, ids, repeat):
+    samples = []
+    for user_id in ids[:repeat]:
+        start = time.perf_counter()
+        fn(user_id)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples), max(samples)
+
+
+def bench_store(name, repo, n, args):
+    repo.create_many(rows(n))
+    ids = [format_user_id(random.randint(1, n)) for _ in range(args.requests)]
+    client = auth_app.app.test_client()
+    auth_app.users = repo
+    # Same ids in every store: profiles cached by the previous run would
+    # otherwise answer this one
+    auth_app.profile_cache.clear()
+    auth_app.token_cache.clear()
+    with auth_app.app.app_context():
+        tokens = {i: create_access_token(identity=i) for i in set(ids)}
+
+    def call(user_id):
+        resp = client.get('/api/auth/profile',
+                          headers={'Authorization': f"Bearer {tokens[user_id]}"})
+        assert resp.status_code == 200, resp.status_code
+
+    lookup_p50, _ = time_calls(repo.get_by_id, ids, args.requests)
+    http_p50, http_max = time_calls(call, ids, args.requests)
+    print(f"{name:<8}{n:>10}{lookup_p50:>14.1f}{http_p50:>14.1f}{http_max:>14.1f}")
+
+
+def bench_linear(n, args):
+    users = {f"user{i}@example.com": {'id': format_user_id(i + 1), 'email': '', 'name': ''}
+             for i in range(n)}
+    ids = [format_user_id(random.randint(1, n)) for _ in range(args.requests)]
+    scans = min(args.requests, 20)
+    lookup_p50, _ = time_calls(lambda i: linear_lookup(users, i), ids, scans)
+    print(f"{'scan':<8}{n:>10}{lookup_p50:>14.1f}{'-':>14}{'-':>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--stores', nargs='+', default=['memory', 'sqlite', 'scan'],
+                        choices=['memory', 'sqlite', 'scan'])
+    args = parser.parse_args()
+
+    print(f"{'store':<8}{'users':>10}{'lookup p50 us':>14}{'http p50 us':>14}{'http max us':>14}")
+    for n in args.sizes:
+        if 'scan' in args.stores:
+            bench_linear(n, args)
+        if 'memory' in args.stores:
+            bench_store('memory', InMemoryUserRepository(), n, args)
+        if 'sqlite' in args.stores:
+            with tempfile.TemporaryDirectory() as tmp:
+                bench_store('sqlite', SQLiteUserRepository(os.path.join(tmp, 'users.db')), n, args)
+
+
+if __name__ == '__main__':
+    main()
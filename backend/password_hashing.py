@@ -0,0 +1,80 @@
+"""Password hashing on a bounded worker pool.
+
+Key derivation (PBKDF2/scrypt) is deliberately slow. Running it on the request
+thread lets a burst of logins occupy every server thread, so even `/health`
+stalls. `PasswordHasher` runs the KDF on a small fixed pool instead and caps
+how many jobs may wait for it: once the pool and its queue are full, new
+requests are rejected immediately with `HashingBusy` (turned into a 503 by the
+API) rather than piling up behind each other.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool is saturated or a job took too long."""
+
+
+class PasswordHasher:
+    def __init__(self, method='pbkdf2:sha256:600000', salt_length=16,
+                 workers=2, max_queue=16, timeout=5.0):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix='password-hash')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._dummy_hash = None
+        self._dummy_lock = threading.Lock()
+
+    @property
+    def pending(self):
+        """Jobs running or waiting for a worker."""
+        return self._pending
+
+    def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                raise HashingBusy('hashing queue is full')
+            self._pending += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HashingBusy('hashing timed out')
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def verify_unknown(self, password):
+        """Spend the same KDF work as `verify` for an account that does not exist.
+
+        Keeps login latency (and pool pressure) independent of whether the
+        email is registered, so response times do not reveal accounts.
+        """
+        if self._dummy_hash is None:
+            with self._dummy_lock:
+                if self._dummy_hash is None:
+                    self._dummy_hash = self.hash('dummy-password')
+        self.verify(self._dummy_hash, password)
+        return False
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
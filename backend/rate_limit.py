@@ -0,0 +1,73 @@
+"""In-memory token-bucket rate limiting.
+
+Each key (a client IP, an account email, ...) gets a bucket holding up to
+`capacity` tokens that refills continuously at `capacity / period` tokens per
+second. A request spends one token; when the bucket is empty it is refused
+along with the number of seconds until a token is available again.
+
+Buckets live in a bounded LRU so a flood of distinct keys cannot grow memory
+without limit. State is per process; run behind a shared store (e.g. Redis)
+when the API is scaled out to several processes.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_rate(rate):
+    """Parse '5/minute' (or '5/60') into (capacity, tokens per second)."""
+    count, _, period = rate.partition('/')
+    capacity = float(count)
+    seconds = PERIODS.get(period.strip().lower())
+    if seconds is None:
+        seconds = float(period)
+    return capacity, capacity / seconds
+
+
+class TokenBucket:
+    __slots__ = ('capacity', 'rate', 'tokens', 'updated')
+
+    def __init__(self, capacity, rate, now):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def consume(self, now, amount=1.0):
+        """Spend `amount` tokens; return seconds to wait (0 when allowed)."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        if self.rate <= 0:
+            return float('inf')
+        return (amount - self.tokens) / self.rate
+
+
+class RateLimiter:
+    def __init__(self, rate, max_keys=100000, clock=time.monotonic):
+        self.capacity, self.rate = parse_rate(rate)
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key):
+        """Spend one token for `key`; return seconds to wait (0 when allowed)."""
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.capacity, self.rate, now)
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.consume(now)
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
@@ -0,0 +1,358 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+# Cheap KDF so the API tests do not spend seconds hashing
+os.environ.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1')
+
+import app as api
+import auth_cache
+from flask_jwt_extended import decode_token
+from password_hashing import HashingBusy, PasswordHasher
+from rate_limit import RateLimiter, parse_rate
+from user_store import SQLiteUserRepository, UserExists, create_user_repository
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPasswordHasher(unittest.TestCase):
+    def setUp(self):
+        self.hasher = PasswordHasher(method='pbkdf2:sha256:1', workers=1, max_queue=0,
+                                     timeout=5)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.hasher.shutdown()
+
+    def occupy_worker(self):
+        """Block the only worker until `release` is set."""
+        started = threading.Event()
+
+        def job():
+            started.set()
+            self.release.wait(5)
+
+        thread = threading.Thread(target=self.hasher._run, args=(job,))
+        thread.start()
+        started.wait(5)
+        return thread
+
+    def test_hash_and_verify(self):
+        pwhash = self.hasher.hash('secret')
+        self.assertTrue(self.hasher.verify(pwhash, 'secret'))
+        self.assertFalse(self.hasher.verify(pwhash, 'wrong'))
+        self.assertEqual(self.hasher.pending, 0)
+
+    def test_saturated_pool_is_busy(self):
+        thread = self.occupy_worker()
+        with self.assertRaises(HashingBusy):
+            self.hasher.hash('secret')
+        self.release.set()
+        thread.join()
+        self.assertEqual(self.hasher.pending, 0)
+        self.assertTrue(self.hasher.hash('secret'))
+
+    def test_timeout_is_busy(self):
+        self.hasher.timeout = 0.05
+        with self.assertRaises(HashingBusy):
+            self.hasher._run(self.release.wait, 5)
+        # the slot is held until the job really finishes
+        self.assertEqual(self.hasher.pending, 1)
+        self.release.set()
+        self.hasher._executor.shutdown(wait=True)
+        self.assertEqual(self.hasher.pending, 0)
+
+    def test_dummy_hash_is_computed_once(self):
+        calls = []
+        original = self.hasher.hash
+
+        def counting_hash(password):
+            calls.append(password)
+            return original(password)
+
+        self.hasher.hash = counting_hash
+        self.hasher.max_queue = 8
+        threads = [threading.Thread(target=self.hasher.verify_unknown, args=('x',))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, ['dummy-password'])
+        self.assertFalse(self.hasher.verify_unknown('x'))
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('5/minute'), (5.0, 5 / 60))
+        self.assertEqual(parse_rate('3/10'), (3.0, 0.3))
+
+    def test_bucket_refills(self):
+        clock = FakeClock()
+        limiter = RateLimiter('2/second', clock=clock)
+        self.assertEqual(limiter.hit('ip'), 0)
+        self.assertEqual(limiter.hit('ip'), 0)
+        self.assertAlmostEqual(limiter.hit('ip'), 0.5)
+        clock.now += 0.5
+        self.assertEqual(limiter.hit('ip'), 0)
+        self.assertGreater(limiter.hit('ip'), 0)
+
+    def test_keys_are_independent(self):
+        limiter = RateLimiter('1/minute', clock=FakeClock())
+        self.assertEqual(limiter.hit('1.2.3.4'), 0)
+        self.assertGreater(limiter.hit('1.2.3.4'), 0)
+        self.assertEqual(limiter.hit('alice@example.com'), 0)
+        limiter.reset('1.2.3.4')
+        self.assertEqual(limiter.hit('1.2.3.4'), 0)
+
+    def test_key_table_is_bounded(self):
+        limiter = RateLimiter('1/minute', max_keys=2, clock=FakeClock())
+        for key in ('a', 'b', 'c'):
+            limiter.hit(key)
+        self.assertEqual(len(limiter._buckets), 2)
+        # 'a' was evicted, so it starts with a full bucket again
+        self.assertEqual(limiter.hit('a'), 0)
+
+
+class TestSQLiteUserRepository(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.repo = SQLiteUserRepository(os.path.join(self.dir.name, 'users.db'))
+
+    def test_ids_are_allocated_in_order(self):
+        alice = self.repo.create('alice@example.com', 'Alice', 'h1')
+        bob = self.repo.create('bob@example.com', 'Bob', 'h2')
+        self.assertEqual((alice['id'], bob['id']), ('user_1', 'user_2'))
+        self.assertEqual(self.repo.get_by_id('user_2')['email'], 'bob@example.com')
+        self.assertEqual(self.repo.get_by_email('alice@example.com'), alice)
+        self.assertEqual(self.repo.count(), 2)
+
+    def test_duplicate_email(self):
+        self.repo.create('alice@example.com', 'Alice', 'h1')
+        with self.assertRaises(UserExists):
+            self.repo.create('alice@example.com', 'Other', 'h2')
+        self.assertEqual(self.repo.count(), 1)
+        self.assertEqual(self.repo.create('bob@example.com', 'Bob', 'h')['id'], 'user_2')
+
+    def test_concurrent_registration(self):
+        barrier = threading.Barrier(8)
+        results = []
+
+        def register(i):
+            barrier.wait()
+            for email in ('same@example.com', f'user{i}@example.com'):
+                try:
+                    results.append(self.repo.create(email, f'User {i}', 'h')['id'])
+                except UserExists:
+                    results.append(None)
+
+        threads = [threading.Thread(target=register, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        created = [user_id for user_id in results if user_id]
+        self.assertEqual(len(created), 9)  # one 'same@', eight distinct emails
+        self.assertEqual(len(set(created)), 9)
+        self.assertEqual(self.repo.count(), 9)
+
+    def test_update(self):
+        user = self.repo.create('alice@example.com', 'Alice', 'h1')
+        updated = self.repo.update(user['id'], name='Alicia', email='ignored@example.com')
+        self.assertEqual(updated, {**user, 'name': 'Alicia'})
+        self.assertEqual(self.repo.update(user['id'], password='h2')['password'], 'h2')
+        self.assertIsNone(self.repo.update('user_99', name='Nobody'))
+
+    def test_malformed_ids(self):
+        self.repo.create('alice@example.com', 'Alice', 'h1')
+        for user_id in ('1', 'user_', 'user_x', 'user_-1', 'user_1.0', 'admin_1', 'user_\u00b2',
+                        'user_' + '9' * 30, None, 1):
+            self.assertIsNone(self.repo.get_by_id(user_id), user_id)
+            self.assertIsNone(self.repo.update(user_id, name='x'), user_id)
+
+
+class TestAuthAPI(unittest.TestCase):
+    def setUp(self):
+        self.saved = {name: getattr(api, name) for name in (
+            'users', 'login_ip_limiter', 'login_account_limiter', 'register_ip_limiter')}
+        api.users = create_user_repository('memory')
+        api.login_ip_limiter = RateLimiter('100/minute')
+        api.login_account_limiter = RateLimiter('3/minute')
+        api.register_ip_limiter = RateLimiter('100/minute')
+        api.profile_cache.clear()
+        api.token_cache.clear()
+        self.client = api.app.test_client()
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(api, name, value)
+
+    def register(self, email='alice@example.com', password='secret', name='Alice'):
+        return self.client.post('/api/auth/register',
+                                json={'email': email, 'password': password, 'name': name})
+
+    def login(self, email='alice@example.com', password='secret'):
+        return self.client.post('/api/auth/login', json={'email': email, 'password': password})
+
+    def test_register_login_profile_flow(self):
+        response = self.register()
+        self.assertEqual(response.status_code, 201)
+        user_id = response.get_json()['user']['id']
+        self.assertEqual(self.register().status_code, 400)
+
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        headers = {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+        response = self.client.get('/api/auth/profile', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['user'],
+                         {'id': user_id, 'email': 'alice@example.com', 'name': 'Alice'})
+
+        response = self.client.put('/api/auth/profile', json={'name': 'Alicia'}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/api/auth/profile', headers=headers)
+        self.assertEqual(response.get_json()['user']['name'], 'Alicia')
+
+        self.assertEqual(self.client.get('/api/auth/profile').status_code, 401)
+
+    def test_profile_read_racing_an_update_is_not_cached(self):
+        self.register()
+        token = self.login().get_json()['access_token']
+        headers = {'Authorization': f"Bearer {token}"}
+        read_user = api.users.get_by_id
+
+        def read_then_update(user_id):
+            user = read_user(user_id)
+            # a PUT lands after this GET read the old row
+            api.users.update(user_id, name='Alicia')
+            api.profile_cache.invalidate(user_id)
+            return user
+
+        api.users.get_by_id = read_then_update
+        response = self.client.get('/api/auth/profile', headers=headers)
+        self.assertEqual(response.get_json()['user']['name'], 'Alice')
+        api.users.get_by_id = read_user
+        response = self.client.get('/api/auth/profile', headers=headers)
+        self.assertEqual(response.get_json()['user']['name'], 'Alicia')
+
+    def test_bad_credentials(self):
+        self.register()
+        self.assertEqual(self.login(password='wrong').status_code, 401)
+        self.assertEqual(self.login(email='nobody@example.com').status_code, 401)
+
+    def test_login_is_throttled_per_account(self):
+        self.register()
+        for _ in range(3):
+            self.assertEqual(self.login(password='wrong').status_code, 401)
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response.headers)
+
+    def test_saturated_hashing_returns_503(self):
+        saved_hasher = api.hasher
+        api.hasher = PasswordHasher(method='pbkdf2:sha256:1', workers=1, max_queue=0)
+        release = threading.Event()
+        started = threading.Event()
+
+        def job():
+            started.set()
+            release.wait(5)
+
+        thread = threading.Thread(target=api.hasher._run, args=(job,))
+        thread.start()
+        started.wait(5)
+        try:
+            response = self.register()
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.headers['Retry-After'], '1')
+        finally:
+            release.set()
+            thread.join()
+            api.hasher.shutdown()
+            api.hasher = saved_hasher
+
+
+class TestVerifiedTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.saved_users = api.users
+        self.saved_callbacks = (api.jwt._token_in_blocklist_callback,
+                                api.jwt._token_verification_callback)
+        api.users = create_user_repository('memory')
+        api.users.create('alice@example.com', 'Alice', 'unused-hash')
+        api.token_cache.clear()
+        api.token_cache.hits = api.token_cache.misses = 0
+        api.token_cache.max_entries = 16
+        api.profile_cache.clear()
+        self.client = api.app.test_client()
+
+    def tearDown(self):
+        api.token_cache.max_entries = 0
+        api.token_cache.clear()
+        api.users = self.saved_users
+        (api.jwt._token_in_blocklist_callback,
+         api.jwt._token_verification_callback) = self.saved_callbacks
+
+    def token(self, **kwargs):
+        with api.app.app_context():
+            return api.create_access_token(identity=api.users.get_by_email(
+                'alice@example.com')['id'], **kwargs)
+
+    def profile(self, token):
+        return self.client.get('/api/auth/profile',
+                               headers={'Authorization': f'Bearer {token}'})
+
+    def test_verified_token_is_cached(self):
+        self.assertTrue(auth_cache.FAST_PATH_SUPPORTED)
+        token = self.token()
+        self.assertEqual(self.profile(token).status_code, 200)
+        self.assertEqual(len(api.token_cache), 1)
+        with mock.patch.object(auth_cache, 'verify_jwt_in_request') as verify:
+            response = self.profile(token)
+        verify.assert_not_called()
+        self.assertEqual(response.get_json()['user']['email'], 'alice@example.com')
+        self.assertEqual(api.token_cache.hits, 1)
+
+    def test_expired_token_is_rejected(self):
+        token = self.token(expires_delta=timedelta(seconds=2))
+        self.assertEqual(self.profile(token).status_code, 200)
+        with api.app.app_context():
+            expires_at = decode_token(token)['exp']
+        while time.time() < expires_at:
+            time.sleep(0.05)
+        self.assertEqual(self.profile(token).status_code, 401)
+        self.assertEqual(len(api.token_cache), 0)
+
+    def test_revocation_and_claims_checks_run_on_hits(self):
+        token = self.token()
+        self.assertEqual(self.profile(token).status_code, 200)
+        api.jwt.token_in_blocklist_loader(lambda header, data: True)
+        self.assertEqual(self.profile(token).status_code, 401)
+        api.jwt.token_in_blocklist_loader(lambda header, data: False)
+        api.jwt.token_verification_loader(lambda header, data: False)
+        self.assertEqual(self.profile(token).status_code, 400)
+        self.assertEqual(api.token_cache.hits, 2)
+
+    def test_tampered_token_is_not_a_hit(self):
+        token = self.token()
+        self.assertEqual(self.profile(token).status_code, 200)
+        header, payload, signature = token.split('.')
+        forged = '.'.join([header, payload, signature[::-1]])
+        self.assertEqual(self.profile(forged).status_code, 422)
+        self.assertEqual(api.token_cache.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
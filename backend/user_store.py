@@ -0,0 +1,228 @@
+"""User repositories for the Flask auth API.
+
+Both implementations look users up by id and by email in O(1)/O(log n) and
+allocate ids atomically, so concurrent registrations under a threaded server
+can neither collide on an id nor register the same email twice.
+
+- `InMemoryUserRepository`: two dict indexes guarded by a lock (the default;
+  data is lost on restart).
+- `SQLiteUserRepository`: a `users` table whose integer primary key and unique
+  email index serve both lookups; one connection per thread.
+
+Pick one with `USER_STORE=memory` or `USER_STORE=sqlite:///path/to/users.db`.
+Public ids keep the `user_<n>` format.
+"""
+import itertools
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class UserExists(Exception):
+    """Raised when registering an email that is already taken."""
+
+
+# Largest SQLite INTEGER; bigger ids cannot exist and would overflow the driver
+MAX_USER_NUMBER = 2 ** 63 - 1
+
+
+def format_user_id(number):
+    return f"user_{number}"
+
+
+def parse_user_id(user_id):
+    """Return the numeric part of 'user_<n>', or None if malformed."""
+    prefix, _, number = str(user_id).partition('_')
+    # isascii(): isdigit() also accepts digits like '²' that int() rejects
+    if prefix != 'user' or not (number.isascii() and number.isdigit()):
+        return None
+    number = int(number)
+    return number if number <= MAX_USER_NUMBER else None
+
+
+class InMemoryUserRepository:
+    def __init__(self):
+        self._by_id = {}
+        self._by_email = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create(self, email, name, password_hash):
+        with self._lock:
+            if email in self._by_email:
+                raise UserExists(email)
+            user = {
+                'id': format_user_id(next(self._ids)),
+                'email': email,
+                'name': name,
+                'password': password_hash
+            }
+            self._by_id[user['id']] = user
+            self._by_email[email] = user
+        return dict(user)
+
+    def create_many(self, rows):
+        """Bulk insert (email, name, password_hash) rows, skipping taken emails."""
+        with self._lock:
+            for email, name, password_hash in rows:
+                if email in self._by_email:
+                    continue
+                user = {
+                    'id': format_user_id(next(self._ids)),
+                    'email': email,
+                    'name': name,
+                    'password': password_hash
+                }
+                self._by_id[user['id']] = user
+                self._by_email[email] = user
+
+    def get_by_id(self, user_id):
+        user = self._by_id.get(user_id)
+        return dict(user) if user else None
+
+    def get_by_email(self, email):
+        user = self._by_email.get(email)
+        return dict(user) if user else None
+
+    def update(self, user_id, **fields):
+        """Update name and/or password; returns the updated user or None."""
+        with self._lock:
+            user = self._by_id.get(user_id)
+            if user is None:
+                return None
+            for key in ('name', 'password'):
+                if key in fields:
+                    user[key] = fields[key]
+            return dict(user)
+
+    def count(self):
+        return len(self._by_id)
+
+
+class SQLiteUserRepository:
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS users ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " email TEXT NOT NULL UNIQUE,"
+        " name TEXT NOT NULL,"
+        " password TEXT NOT NULL)"
+    )
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._shared = None
+        if path == ':memory:':
+            # Every connection to ':memory:' is a separate database; share one
+            self._shared = sqlite3.connect(path, check_same_thread=False)
+            self._shared_lock = threading.Lock()
+        with self._cursor() as conn:
+            conn.execute(self.SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _cursor(self):
+        """Yield this thread's connection and commit (or roll back) afterwards."""
+        if self._shared is not None:
+            self._shared_lock.acquire()
+            conn = self._shared
+        else:
+            conn = self._connect()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            if self._shared is not None:
+                self._shared_lock.release()
+
+    @staticmethod
+    def _row(row):
+        if row is None:
+            return None
+        return {
+            'id': format_user_id(row[0]),
+            'email': row[1],
+            'name': row[2],
+            'password': row[3]
+        }
+
+    def create(self, email, name, password_hash):
+        try:
+            with self._cursor() as conn:
+                cur = conn.execute(
+                    "INSERT INTO users (email, name, password) VALUES (?, ?, ?)",
+                    (email, name, password_hash),
+                )
+                number = cur.lastrowid
+        except sqlite3.IntegrityError:
+            raise UserExists(email)
+        return {
+            'id': format_user_id(number),
+            'email': email,
+            'name': name,
+            'password': password_hash
+        }
+
+    def create_many(self, rows):
+        """Bulk insert (email, name, password_hash) rows, skipping taken emails."""
+        with self._cursor() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO users (email, name, password) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def get_by_id(self, user_id):
+        number = parse_user_id(user_id)
+        if number is None:
+            return None
+        with self._cursor() as conn:
+            row = conn.execute(
+                "SELECT id, email, name, password FROM users WHERE id = ?", (number,)
+            ).fetchone()
+        return self._row(row)
+
+    def get_by_email(self, email):
+        with self._cursor() as conn:
+            row = conn.execute(
+                "SELECT id, email, name, password FROM users WHERE email = ?", (email,)
+            ).fetchone()
+        return self._row(row)
+
+    def update(self, user_id, **fields):
+        """Update name and/or password; returns the updated user or None."""
+        number = parse_user_id(user_id)
+        changes = {k: fields[k] for k in ('name', 'password') if k in fields}
+        if number is None:
+            return None
+        if changes:
+            assignments = ", ".join(f"{key} = ?" for key in changes)
+            with self._cursor() as conn:
+                conn.execute(
+                    f"UPDATE users SET {assignments} WHERE id = ?",
+                    (*changes.values(), number),
+                )
+        return self.get_by_id(user_id)
+
+    def count(self):
+        with self._cursor() as conn:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+
+def create_user_repository(url='memory'):
+    """Build a repository from 'memory' or 'sqlite:///path/to/users.db'."""
+    if url in ('', 'memory'):
+        return InMemoryUserRepository()
+    if url.startswith('sqlite:///'):
+        return SQLiteUserRepository(url[len('sqlite:///'):] or ':memory:')
+    raise ValueError(f"Unsupported USER_STORE: {url}")
@@ -0,0 +1,29 @@
+"""Controllers for result cache introspection."""
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from ..services.cache_service import ResultCache, get_result_cache
+
+
+class CacheStatsResponse(BaseModel):
+    hits: int
+    disk_hits: int
+    misses: int
+    hit_ratio: float
+    memory_entries: int
+    max_entries: int
+    disk_enabled: bool
+    ttl_seconds: float
+
+
+class CacheController:
+    def __init__(self, cache: ResultCache | None = None) -> None:
+        self.cache = cache or get_result_cache()
+
+    def stats(self) -> CacheStatsResponse:
+        return CacheStatsResponse(**self.cache.stats())
+
+    def clear(self) -> CacheStatsResponse:
+        self.cache.clear()
+        return self.stats()
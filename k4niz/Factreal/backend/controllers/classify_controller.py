@@ -4,9 +4,12 @@ Defines request/response schemas close to HTTP layer and calls services.
 """
 from __future__ import annotations
 
+from typing import AsyncIterable, AsyncIterator
+
 from pydantic import BaseModel, Field
 
-from ..services.api_service import ApiService
+from ..services.api_service import ApiService, FullAnalysis
+from ..services.bulk_service import classify_stream
 
 
 class ClassifyRequest(BaseModel):
@@ -20,6 +23,7 @@ class ClassifyResponse(BaseModel):
     flagged: bool
     explanation: str
     fact_check: dict | None = None
+    explanation_ticket: str | None = None
 
 
 class ClassifyController:
@@ -27,7 +31,17 @@ class ClassifyController:
         self.api = api or ApiService()
 
     def classify(self, req: ClassifyRequest) -> ClassifyResponse:
-        analysis = self.api.analyze(req.text)
+        return self._respond(self.api.analyze(req.text))
+
+    async def aclassify(self, req: ClassifyRequest) -> ClassifyResponse:
+        return self._respond(await self.api.aanalyze(req.text))
+
+    def classify_bulk(self, body: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """Stream NDJSON classification results for a JSON array/NDJSON body."""
+        return classify_stream(self.api.classifier, body)
+
+    @staticmethod
+    def _respond(analysis: FullAnalysis) -> ClassifyResponse:
         payload = analysis.to_json()
         return ClassifyResponse(
             label=payload["classification"]["label"],
@@ -36,4 +50,5 @@ class ClassifyController:
             flagged=payload["classification"]["flagged"],
             explanation=payload["explanation"],
             fact_check=payload.get("fact_check"),
+            explanation_ticket=payload.get("explanation_ticket"),
         )
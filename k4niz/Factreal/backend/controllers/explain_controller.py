@@ -4,6 +4,8 @@ from __future__ import annotations
 from pydantic import BaseModel, Field
 
 from ..services.explainability_service import ExplainabilityService
+from ..services.explanation_queue import ExplanationQueue, get_explanation_queue
+from ..utils.executor import run_inference
 
 
 class ExplainRequest(BaseModel):
@@ -15,10 +17,35 @@ class ExplainResponse(BaseModel):
     explanation: str
 
 
+class ExplanationTicketResponse(BaseModel):
+    ticket: str
+    status: str
+    explanation: str | None = None
+
+
 class ExplainController:
-    def __init__(self, service: ExplainabilityService | None = None) -> None:
+    def __init__(
+        self,
+        service: ExplainabilityService | None = None,
+        tickets: ExplanationQueue | None = None,
+    ) -> None:
         self.service = service or ExplainabilityService()
+        self._tickets = tickets
 
     def explain(self, req: ExplainRequest) -> ExplainResponse:
         res = self.service.explain(req.text, req.label)
         return ExplainResponse(explanation=res.text)
+
+    async def aexplain(self, req: ExplainRequest) -> ExplainResponse:
+        res = await run_inference(self.service.explain, req.text, req.label)
+        return ExplainResponse(explanation=res.text)
+
+    def ticket(self, ticket: str) -> ExplanationTicketResponse | None:
+        """Look up a deferred explanation; None if unknown or expired."""
+        tickets = self._tickets or get_explanation_queue()
+        entry = tickets.get(ticket)
+        if entry is None:
+            return None
+        return ExplanationTicketResponse(
+            ticket=entry.ticket, status=entry.status, explanation=entry.explanation
+        )
@@ -0,0 +1,34 @@
+"""Controllers for model registry introspection and warm-up."""
+from __future__ import annotations
+
+from typing import List
+
+from pydantic import BaseModel
+
+from ..models.registry import ModelRegistry, registry
+
+
+class ModelStats(BaseModel):
+    key: str
+    model_name: str
+    load_seconds: float
+    rss_before_bytes: int
+    rss_after_bytes: int
+    rss_delta_bytes: int
+    backend: str = ""
+
+
+class ModelsResponse(BaseModel):
+    models: List[ModelStats]
+
+
+class ModelsController:
+    def __init__(self, models: ModelRegistry | None = None) -> None:
+        self.models = models or registry
+
+    def stats(self) -> ModelsResponse:
+        return ModelsResponse(models=[ModelStats(**s) for s in self.models.stats()])
+
+    def warm_up(self) -> ModelsResponse:
+        self.models.warm_up()
+        return self.stats()
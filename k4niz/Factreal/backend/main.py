@@ -1,7 +1,10 @@
 """FastAPI application entry point for FactReal."""
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from .controllers.classify_controller import (
     ClassifyController,
     ClassifyRequest,
@@ -10,8 +13,29 @@ from .controllers.classify_controller import (
 
 from .routes.classify_router import router as classify_router
 from .routes.explain_router import router as explain_router
+from .routes.cache_router import router as cache_router
+from .routes.models_router import router as models_router
+from .routes.metrics_router import router as metrics_router
+from .models.registry import registry
+from .models.fact_checker import aclose_async_client, close_session
+from .utils.config import settings
+from .utils.executor import shutdown_inference_executor
+from .utils.timing import ServerTimingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Optionally preload models; release pooled resources on shutdown."""
+    if settings.PRELOAD_MODELS:
+        await run_in_threadpool(registry.warm_up)
+    yield
+    await aclose_async_client()
+    close_session()
+    shutdown_inference_executor()
+
 
-app = FastAPI(title="FactReal", version="0.1.0")
+app = FastAPI(title="FactReal", version="0.1.0", lifespan=lifespan)
+app.add_middleware(ServerTimingMiddleware)
 
 
 @app.get("/")
@@ -21,6 +45,9 @@ def health() -> dict:
 
 app.include_router(classify_router)
 app.include_router(explain_router)
+app.include_router(cache_router)
+app.include_router(models_router)
+app.include_router(metrics_router)
 
 
 # Convenience: allow POST / to behave like /classify for ease of testing
@@ -28,5 +55,7 @@ _root_classify_controller = ClassifyController()
 
 
 @app.post("/", response_model=ClassifyResponse)
-def classify_root(req: ClassifyRequest) -> ClassifyResponse:
-    return _root_classify_controller.classify(req)
+async def classify_root(req: ClassifyRequest) -> ClassifyResponse:
+    if settings.ASYNC_MODE:
+        return await _root_classify_controller.aclassify(req)
+    return await run_in_threadpool(_root_classify_controller.classify, req)
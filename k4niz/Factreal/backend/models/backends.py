@@ -0,0 +1,160 @@
+"""Pluggable inference backends for the transformer pipelines.
+
+``INFERENCE_BACKEND`` selects how ``BiasModel`` and ``ReasoningModel`` run:
+
+- ``pytorch``: the default fp32 transformers pipeline.
+- ``pytorch-int8``: the same model with ``torch.nn.Linear`` layers dynamically
+  quantized to int8 (no extra dependencies; CPU only).
+- ``onnx``: the model exported to ONNX and run with ONNX Runtime through
+  ``optimum.onnxruntime``.
+- ``onnx-int8``: the ONNX export with int8 dynamic quantization applied.
+
+ONNX exports are written once to ``ONNX_CACHE_DIR`` and reloaded from there on
+later starts. Each export is built in a temporary sibling directory and renamed
+into place when complete, so a crashed or concurrent export never leaves a
+partial directory that would be loaded on every later start. If the requested backend cannot be built (e.g. ``optimum`` is not
+installed) the PyTorch pipeline is used instead, and callers keep their own
+heuristic fallback for when transformers itself is unavailable.
+"""
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import tempfile
+from typing import Any, Callable, Optional, Tuple
+
+from ..utils.config import settings
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BACKENDS = ("pytorch", "pytorch-int8", "onnx", "onnx-int8")
+
+# Pipeline task -> optimum ORTModel class name
+_ORT_CLASSES = {
+    "zero-shot-classification": "ORTModelForSequenceClassification",
+    "text2text-generation": "ORTModelForSeq2SeqLM",
+    "feature-extraction": "ORTModelForFeatureExtraction",
+}
+
+
+def build_pipeline(
+    task: str, model_name: str, backend: Optional[str] = None
+) -> Tuple[Any, str]:
+    """Return ``(pipeline, backend_used)`` for ``task`` and ``model_name``.
+
+    Raises whatever transformers raises when even the PyTorch pipeline cannot
+    be created, so callers can fall back to their heuristics.
+    """
+    if settings.FORCE_HEURISTIC:
+        raise RuntimeError("FORCE_HEURISTIC is set")
+    backend = backend or settings.INFERENCE_BACKEND
+    if backend not in BACKENDS:
+        logger.warning("Unknown INFERENCE_BACKEND %r; using pytorch", backend)
+        backend = "pytorch"
+
+    if backend != "pytorch":
+        try:
+            builder = _onnx_pipeline if backend.startswith("onnx") else _torch_int8_pipeline
+            return builder(task, model_name, backend), backend
+        except Exception as e:  # noqa: BLE001 optional deps: degrade to pytorch
+            logger.warning(
+                "Backend %s unavailable for %s, using pytorch (reason: %s)",
+                backend,
+                model_name,
+                str(e),
+            )
+
+    from transformers import pipeline
+
+    return pipeline(task, model=model_name, device_map="auto"), "pytorch"
+
+
+def _torch_int8_pipeline(task: str, model_name: str, backend: str) -> Any:
+    """PyTorch pipeline with dynamically quantized Linear layers."""
+    import torch
+    from transformers import pipeline
+
+    pipe = pipeline(task, model=model_name, device="cpu")
+    pipe.model = torch.quantization.quantize_dynamic(
+        pipe.model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    return pipe
+
+
+def export_dir(model_name: str, backend: str) -> str:
+    """Directory holding the ONNX export of ``model_name`` for ``backend``."""
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+    return os.path.join(settings.ONNX_CACHE_DIR, f"{safe}-{backend}")
+
+
+def _onnx_pipeline(task: str, model_name: str, backend: str) -> Any:
+    """ONNX Runtime pipeline, exporting (and quantizing) on first use."""
+    import optimum.onnxruntime as ort
+    from transformers import AutoTokenizer, pipeline
+
+    model_cls = getattr(ort, _ORT_CLASSES[task])
+    target = export_dir(model_name, backend)
+
+    if not os.path.isdir(target):
+        logger.info("Exporting %s to ONNX at %s", model_name, target)
+
+        def export(out_dir: str) -> None:
+            model = model_cls.from_pretrained(model_name, export=True)
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            if backend == "onnx-int8":
+                _quantize(model, out_dir)
+            else:
+                model.save_pretrained(out_dir)
+            tokenizer.save_pretrained(out_dir)
+
+        _export_atomically(target, export)
+
+    model = model_cls.from_pretrained(target)
+    tokenizer = AutoTokenizer.from_pretrained(target)
+    return pipeline(task, model=model, tokenizer=tokenizer)
+
+
+def _export_atomically(target: str, export: Callable[[str], None]) -> None:
+    """Run ``export`` into a temporary sibling of ``target`` and rename it into place.
+
+    If another process finished the same export first, its copy is kept.
+    """
+    parent = os.path.dirname(target) or "."
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=f".{os.path.basename(target)}.", dir=parent)
+    try:
+        export(tmp)
+        try:
+            os.replace(tmp, target)
+        except OSError:
+            if not os.path.isdir(target):
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _quantize(model: Any, target: str) -> None:
+    """Write int8 dynamically quantized copies of every ONNX file of ``model``."""
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        model.save_pretrained(tmp)
+        onnx_files = [f for f in os.listdir(tmp) if f.endswith(".onnx")]
+        for name in onnx_files:
+            quantizer = ORTQuantizer.from_pretrained(tmp, file_name=name)
+            quantizer.quantize(save_dir=target, quantization_config=qconfig)
+        # Quantized files get a "_quantized" suffix; keep the original names
+        for name in onnx_files:
+            quantized = name.replace(".onnx", "_quantized.onnx")
+            src = os.path.join(target, quantized)
+            if os.path.exists(src):
+                os.replace(src, os.path.join(target, name))
+        for extra in os.listdir(tmp):
+            if not extra.endswith(".onnx") and not os.path.exists(
+                os.path.join(target, extra)
+            ):
+                os.replace(os.path.join(tmp, extra), os.path.join(target, extra))
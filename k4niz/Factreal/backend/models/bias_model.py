@@ -2,15 +2,25 @@
 
 Uses a Hugging Face zero-shot classification pipeline with a model like
 "facebook/bart-large-mnli". If transformers or model weights are not available,
-falls back to a simple keyword heuristic so the API remains usable.
+falls back to a simple keyword heuristic so the API remains usable. The runtime
+(PyTorch, int8, ONNX) is chosen by ``INFERENCE_BACKEND``; see ``backends.py``.
+
+``BIAS_MODE=embedding`` switches to a faster path: a sentence encoder
+(``MODEL_EMBEDDING``) embeds each text once, and the label hypotheses
+("This example is {label}.") are embedded a single time and cached. Scores are
+a softmax over cosine similarities, so each text costs one forward pass instead
+of one NLI pass per candidate label.
 """
 from __future__ import annotations
 
+import math
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence
 
 from ..utils.config import settings
 from ..utils.logger import get_logger
+from ..utils.metrics import INFERENCE_BATCH_SIZE
 
 logger = get_logger(__name__)
 
@@ -30,45 +40,165 @@ class BiasModel:
     """
 
     CANDIDATE_LABELS = ["neutral", "biased", "misleading", "propaganda"]
-
-    def __init__(self, model_name: str | None = None) -> None:
-        self.model_name = model_name or settings.MODEL_BIAS
+    HYPOTHESIS_TEMPLATE = "This example is {}."
+    # Cosine similarities live in [-1, 1]; scale them before the softmax so the
+    # embedding scores are comparable to NLI probabilities and THRESHOLD_BIAS.
+    SIMILARITY_SCALE = 20.0
+
+    def __init__(
+        self,
+        model_name: str | None = None,
+        backend: str | None = None,
+        mode: str | None = None,
+    ) -> None:
+        self.mode = mode or settings.BIAS_MODE
+        embedding = self.mode == "embedding"
+        self.model_name = model_name or (
+            settings.MODEL_EMBEDDING if embedding else settings.MODEL_BIAS
+        )
         self.pipeline = None
+        self.backend = "heuristic"
+        self._label_vectors: List[List[float]] | None = None
+        self._label_lock = threading.Lock()
 
         try:
-            from transformers import pipeline  # defer import for faster startup
+            # defer import for faster startup
+            from .backends import build_pipeline
 
-            logger.info("Loading zero-shot classification model: %s", self.model_name)
-            self.pipeline = pipeline(
-                "zero-shot-classification", model=self.model_name, device_map="auto"
-            )
+            task = "feature-extraction" if embedding else "zero-shot-classification"
+            logger.info("Loading %s model: %s", task, self.model_name)
+            self.pipeline, self.backend = build_pipeline(task, self.model_name, backend)
         except Exception as e:  # noqa: BLE001 broad but safe for offline demo
             logger.warning(
                 "Falling back to heuristic bias detection (reason: %s)", str(e)
             )
             self.pipeline = None
 
+    @property
+    def tokenizer(self) -> Any:
+        """Tokenizer of the loaded pipeline (None for the heuristic)."""
+        return getattr(self.pipeline, "tokenizer", None)
+
     def predict(self, text: str) -> BiasPrediction:
         """Return the most likely label with confidence and per-label scores.
 
         If the transformer pipeline is unavailable, a keyword-based heuristic is used.
         """
-        if not text.strip():
-            return BiasPrediction(label="neutral", score=1.0, details={"neutral": 1.0})
-
-        if self.pipeline is None:
-            # Simple heuristic: look for charged words to flag as biased/propaganda
-            charged = ["fake", "hoax", "never", "always", "disaster", "enemy", "traitor"]
-            score = 0.7 if any(w in text.lower() for w in charged) else 0.2
-            label = "propaganda" if score >= 0.65 else "neutral"
-            return BiasPrediction(label=label, score=score, details={label: score})
-
-        res: Dict[str, Any] = self.pipeline(
-            sequences=[text], candidate_labels=self.CANDIDATE_LABELS
-        )
-        # transformers returns a dict when single input but we passed list; unwrap
-        if isinstance(res, list):
-            res = res[0]
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts: List[str]) -> List[BiasPrediction]:
+        """Classify several texts with a single pipeline call.
+
+        Results are returned in input order. Empty texts short-circuit to
+        neutral and are not sent to the model.
+        """
+        results: List[BiasPrediction | None] = [None] * len(texts)
+        pending: List[int] = []
+        for i, text in enumerate(texts):
+            if not text.strip():
+                results[i] = BiasPrediction(
+                    label="neutral", score=1.0, details={"neutral": 1.0}
+                )
+            elif self.pipeline is None:
+                results[i] = self._heuristic(text)
+            else:
+                pending.append(i)
+
+        if pending:
+            INFERENCE_BATCH_SIZE.observe(len(pending), model="bias")
+        if pending and self.mode == "embedding":
+            preds = self._embedding_predict([texts[i] for i in pending])
+            for i, pred in zip(pending, preds):
+                results[i] = pred
+        elif pending:
+            outs: Any = self.pipeline(
+                sequences=[texts[i] for i in pending],
+                candidate_labels=self.CANDIDATE_LABELS,
+                batch_size=len(pending),
+            )
+            # transformers returns a dict for a single input, a list otherwise
+            if isinstance(outs, dict):
+                outs = [outs]
+            for i, res in zip(pending, outs):
+                results[i] = self._from_pipeline(res)
+
+        return [r for r in results if r is not None]
+
+    def _embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Mean-pooled, L2-normalised sentence embeddings for ``texts``.
+
+        Batched feature extraction pads every text to the longest one in the
+        batch, so only each text's own (truncated) tokens are pooled; the
+        embedding therefore does not depend on the rest of the batch.
+        """
+        texts = list(texts)
+        outs: Any = self.pipeline(texts, batch_size=len(texts), truncation=True)
+        lengths = self._token_counts(texts)
+        left_padded = getattr(self.tokenizer, "padding_side", "right") == "left"
+        vectors = []
+        for i, out in enumerate(outs):
+            # feature-extraction returns [1][tokens][dim] (or [tokens][dim])
+            tokens = out[0] if out and isinstance(out[0][0], list) else out
+            if lengths is not None:
+                n = lengths[i]
+                tokens = tokens[len(tokens) - n :] if left_padded else tokens[:n]
+            dim = len(tokens[0])
+            mean = [sum(tok[d] for tok in tokens) / len(tokens) for d in range(dim)]
+            norm = math.sqrt(sum(v * v for v in mean)) or 1.0
+            vectors.append([v / norm for v in mean])
+        return vectors
+
+    def _token_counts(self, texts: List[str]) -> List[int] | None:
+        """Unpadded, truncated token count of each text (the attention mask sum)."""
+        tokenizer = self.tokenizer
+        if tokenizer is None:
+            return None
+        encoded = tokenizer(texts, truncation=True)
+        return [max(1, sum(mask)) for mask in encoded["attention_mask"]]
+
+    def label_vectors(self) -> List[List[float]]:
+        """Hypothesis embeddings for CANDIDATE_LABELS, computed once and cached."""
+        if self._label_vectors is None:
+            with self._label_lock:
+                if self._label_vectors is None:
+                    hypotheses = [
+                        self.HYPOTHESIS_TEMPLATE.format(lbl) for lbl in self.CANDIDATE_LABELS
+                    ]
+                    self._label_vectors = self._embed(hypotheses)
+        return self._label_vectors
+
+    def _embedding_predict(self, texts: List[str]) -> List[BiasPrediction]:
+        """Score texts against the cached hypothesis embeddings in one pass."""
+        labels = self.label_vectors()
+        preds = []
+        for vec in self._embed(texts):
+            sims = [sum(a * b for a, b in zip(vec, lv)) for lv in labels]
+            top = max(sims)
+            exps = [math.exp((s - top) * self.SIMILARITY_SCALE) for s in sims]
+            total = sum(exps)
+            ranked = sorted(
+                zip(self.CANDIDATE_LABELS, (e / total for e in exps)),
+                key=lambda kv: kv[1],
+                reverse=True,
+            )
+            preds.append(
+                BiasPrediction(
+                    label=ranked[0][0], score=ranked[0][1], details=dict(ranked)
+                )
+            )
+        return preds
+
+    @staticmethod
+    def _heuristic(text: str) -> BiasPrediction:
+        """Simple heuristic: look for charged words to flag as biased/propaganda."""
+        charged = ["fake", "hoax", "never", "always", "disaster", "enemy", "traitor"]
+        score = 0.7 if any(w in text.lower() for w in charged) else 0.2
+        label = "propaganda" if score >= 0.65 else "neutral"
+        return BiasPrediction(label=label, score=score, details={label: score})
+
+    @staticmethod
+    def _from_pipeline(res: Dict[str, Any]) -> BiasPrediction:
+        """Convert one zero-shot pipeline output into a BiasPrediction."""
         labels: List[str] = list(res.get("labels", []))
         scores: List[float] = list(res.get("scores", []))
         best_label = labels[0] if labels else "neutral"
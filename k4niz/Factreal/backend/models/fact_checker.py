@@ -1,19 +1,46 @@
 """Optional fact checker using Wikipedia and/or NewsAPI.
 
-This module contains lightweight stubs that contributors can extend. By default,
-it attempts a simple Wikipedia summary presence check and returns references.
+This module contains lightweight stubs that contributors can extend. The
+configured sources (``FACT_CHECK_SOURCES``) are queried concurrently and their
+references merged; a text counts as "supported" when any source finds one.
 If disabled or offline, it safely returns a neutral response.
+
+Each check runs under one overall deadline (``FACT_CHECK_TIMEOUT_SECONDS``):
+sources that have not answered by then are reported in ``notes`` and skipped.
+Per-query results are cached with a TTL, and a circuit breaker per source stops
+calling it after ``FACT_CHECK_BREAKER_THRESHOLD`` consecutive failures until a
+cooldown has passed.
+
+Two entry points are provided: ``check`` (blocking, pooled ``requests.Session``
+plus a small thread pool for the fan-out) and ``acheck`` (non-blocking, pooled
+``httpx.AsyncClient``). Both share the source definitions, cache and breakers.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote
 
 from ..utils.config import settings
 from ..utils.logger import get_logger
+from ..utils.metrics import FACT_CHECK_DURATION
 
 logger = get_logger(__name__)
 
+WIKIPEDIA_PAGE_URL = "https://en.wikipedia.org/wiki/"
+POOL_SIZE = 20
+
+_async_client: Any = None
+_session: Any = None
+_fanout: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
 
 @dataclass
 class FactCheckResult:
@@ -22,69 +49,448 @@ class FactCheckResult:
     notes: Optional[str] = None
 
 
+@dataclass
+class SourceRequest:
+    """One outbound GET: where to send it and how to read the JSON reply."""
+
+    url: str
+    params: Dict[str, Any]
+    parse: Callable[[dict], List[str]]
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def cache_key(self, source: str) -> Tuple[Any, ...]:
+        return (source, self.url, tuple(sorted(self.params.items())))
+
+
+def _news_query(text: str) -> str:
+    """Very naive query: take first 5 tokens; contributors can improve NLP later."""
+    terms = [t for t in text.split() if t.isalpha()][:5]
+    return " ".join(terms) or text[:64]
+
+
+def _news_sources(data: dict) -> List[str]:
+    """Extract up to three article URLs from a NewsAPI response body."""
+    return [a["url"] for a in data.get("articles", [])[:3] if a.get("url")]
+
+
+def _wikipedia_sources(data: dict) -> List[str]:
+    """Page URL of the best MediaWiki search hit, if any."""
+    hits = data.get("query", {}).get("search", [])
+    if not hits:
+        return []
+    return [WIKIPEDIA_PAGE_URL + quote(hits[0]["title"].replace(" ", "_"))]
+
+
+def _newsapi_request(checker: "FactChecker", text: str) -> Optional[SourceRequest]:
+    if not checker.news_api_key:
+        return None
+    return SourceRequest(
+        url=settings.NEWS_API_URL,
+        params={"q": _news_query(text), "pageSize": 3, "sortBy": "relevancy"},
+        headers={"X-Api-Key": checker.news_api_key},
+        parse=_news_sources,
+    )
+
+
+def _wikipedia_request(checker: "FactChecker", text: str) -> Optional[SourceRequest]:
+    # Very naive: search for the first word of the text
+    return SourceRequest(
+        url=settings.WIKIPEDIA_API_URL,
+        params={
+            "action": "query",
+            "list": "search",
+            "srsearch": text.split()[0],
+            "srlimit": 1,
+            "format": "json",
+        },
+        parse=_wikipedia_sources,
+    )
+
+
+# Source name -> request builder (returns None when the source is not usable)
+SOURCES: Dict[str, Callable[["FactChecker", str], Optional[SourceRequest]]] = {
+    "newsapi": _newsapi_request,
+    "wikipedia": _wikipedia_request,
+}
+
+
+class QueryCache:
+    """Thread-safe LRU of per-source query results with a TTL."""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = (
+            settings.FACT_CHECK_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        self.ttl_seconds = (
+            settings.FACT_CHECK_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[List[str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, urls = entry
+            if expires and expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return list(urls)
+
+    def set(self, key: Tuple[Any, ...], urls: List[str]) -> None:
+        if self.max_entries <= 0:
+            return
+        expires = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        with self._lock:
+            self._entries[key] = (expires, list(urls))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open -> closed.
+
+    After ``threshold`` failures in a row the breaker opens and ``allow()``
+    refuses calls for ``cooldown_seconds``. Then a single trial call is let
+    through; its success closes the breaker, its failure re-opens it. A caller
+    granted a call it then never makes must ``release()`` it.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[int] = None,
+        cooldown_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = (
+            settings.FACT_CHECK_BREAKER_THRESHOLD if threshold is None else threshold
+        )
+        self.cooldown_seconds = (
+            settings.FACT_CHECK_BREAKER_COOLDOWN_SECONDS
+            if cooldown_seconds is None
+            else cooldown_seconds
+        )
+        self.clock = clock
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._trial or self.clock() - self._opened_at >= self.cooldown_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        if self.threshold <= 0:
+            return True
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or self.clock() - self._opened_at < self.cooldown_seconds:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or (self.threshold > 0 and self.failures >= self.threshold):
+                self._opened_at = self.clock()
+            self._trial = False
+
+    def release(self) -> None:
+        """Give back a granted call that was never made (no success or failure)."""
+        with self._lock:
+            self._trial = False
+
+
+_query_cache: QueryCache | None = None
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_query_cache() -> QueryCache:
+    """Return the process-wide fact-check query cache."""
+    global _query_cache
+    with _lock:
+        if _query_cache is None:
+            _query_cache = QueryCache()
+        return _query_cache
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for ``source``."""
+    with _lock:
+        if source not in _breakers:
+            _breakers[source] = CircuitBreaker()
+        return _breakers[source]
+
+
+@contextmanager
+def _outbound(source: str) -> Iterator[None]:
+    """Record the latency and outcome of one outbound fact-check call."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        FACT_CHECK_DURATION.observe(
+            time.perf_counter() - start, source=source, outcome=outcome
+        )
+
+
+def get_session() -> Any:
+    """Return the shared pooled ``requests.Session``, creating it on first use."""
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(SOURCES), pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _get_fanout_executor() -> ThreadPoolExecutor:
+    global _fanout
+    with _lock:
+        if _fanout is None:
+            _fanout = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="fact-check")
+        return _fanout
+
+
+def close_session() -> None:
+    """Close the shared session and fan-out pool (called on application shutdown)."""
+    global _session, _fanout
+    with _lock:
+        session, _session = _session, None
+        pool, _fanout = _fanout, None
+    if session is not None:
+        session.close()
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_async_client() -> Any:
+    """Return the shared pooled async HTTP client, creating it on first use.
+
+    Only called from the event loop thread, so no locking is needed.
+    """
+    global _async_client
+    if _async_client is None:
+        import httpx
+
+        _async_client = httpx.AsyncClient(
+            timeout=settings.FACT_CHECK_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=10),
+        )
+    return _async_client
+
+
+async def aclose_async_client() -> None:
+    """Close the shared async HTTP client (called on application shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        client, _async_client = _async_client, None
+        await client.aclose()
+
+
 class FactChecker:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        sources: Optional[Sequence[str]] = None,
+        cache: Optional[QueryCache] = None,
+        breakers: Optional[Dict[str, CircuitBreaker]] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
         self.enabled = settings.ENABLE_FACT_CHECK
         self.news_api_key = settings.NEWS_API_KEY
+        if sources is None:
+            sources = [s.strip() for s in settings.FACT_CHECK_SOURCES.split(",") if s.strip()]
+        unknown = [s for s in sources if s not in SOURCES]
+        if unknown:
+            logger.warning("Ignoring unknown fact-check sources: %s", ", ".join(unknown))
+        self.sources = [s for s in sources if s in SOURCES]
+        self.cache = cache if cache is not None else get_query_cache()
+        self._breakers = breakers
+        self.timeout = settings.FACT_CHECK_TIMEOUT_SECONDS if timeout is None else timeout
 
-    def check(self, text: str) -> FactCheckResult:
-        """Perform a minimal fact check of the input text.
+    def breaker(self, source: str) -> CircuitBreaker:
+        if self._breakers is None:
+            return get_breaker(source)
+        return self._breakers.setdefault(source, CircuitBreaker())
+
+    def _plan(
+        self, text: str
+    ) -> Tuple[Dict[str, SourceRequest], Dict[str, Tuple[str, List[str]]]]:
+        """Split sources into requests to send and outcomes already known.
 
-        - If disabled, returns unknown.
-        - Try Wikipedia search/summary presence as a naive signal.
-        - NewsAPI can be wired later using self.news_api_key.
+        Outcomes are ``(status, urls)`` with status ``ok``, ``cached``,
+        ``open`` (breaker refused), ``error`` or ``timeout``.
         """
-        if not self.enabled:
-            return FactCheckResult(veracity="unknown", sources=[], notes="disabled")
+        pending: Dict[str, SourceRequest] = {}
+        outcomes: Dict[str, Tuple[str, List[str]]] = {}
+        for source in self.sources:
+            req = SOURCES[source](self, text)
+            if req is None:
+                continue
+            cached = self.cache.get(req.cache_key(source))
+            if cached is not None:
+                outcomes[source] = ("cached", cached)
+            elif not self.breaker(source).allow():
+                outcomes[source] = ("open", [])
+            else:
+                pending[source] = req
+        return pending, outcomes
 
+    def _finish(self, source: str, req: SourceRequest, status: int, data: Any) -> List[str]:
+        """Turn a response into URLs, updating the breaker and cache."""
+        if status != 200:
+            self.breaker(source).record_failure()
+            raise RuntimeError(f"{source} returned HTTP {status}")
+        try:
+            urls = req.parse(data)
+        except Exception:
+            # A malformed body is a failure too; otherwise a half-open trial
+            # would never be resolved and the source would stay disabled
+            self.breaker(source).record_failure()
+            raise
+        self.breaker(source).record_success()
+        self.cache.set(req.cache_key(source), urls)
+        return urls
+
+    def _fetch(self, source: str, req: SourceRequest, deadline: float) -> List[str]:
+        try:
+            with _outbound(source):
+                resp = get_session().get(
+                    req.url,
+                    params=req.params,
+                    headers=req.headers,
+                    timeout=max(0.001, deadline - time.monotonic()),
+                )
+                data = resp.json() if resp.status_code == 200 else None
+        except Exception:
+            self.breaker(source).record_failure()
+            raise
+        return self._finish(source, req, resp.status_code, data)
+
+    async def _afetch(self, source: str, req: SourceRequest) -> List[str]:
+        client = get_async_client()
+        try:
+            with _outbound(source):
+                resp = await client.get(req.url, params=req.params, headers=req.headers)
+                data = resp.json() if resp.status_code == 200 else None
+        except BaseException:  # includes cancellation at the deadline
+            self.breaker(source).record_failure()
+            raise
+        return self._finish(source, req, resp.status_code, data)
+
+    def _merge(self, outcomes: Dict[str, Tuple[str, List[str]]]) -> FactCheckResult:
         sources: List[str] = []
+        problems: List[str] = []
+        for name in self.sources:
+            if name not in outcomes:
+                continue
+            status, urls = outcomes[name]
+            sources.extend(u for u in urls if u not in sources)
+            if status not in ("ok", "cached"):
+                problems.append(f"{name}: {status}")
+        notes = "; ".join(problems) or None
+        return FactCheckResult(
+            veracity="supported" if sources else "unknown", sources=sources, notes=notes
+        )
+
+    def check(self, text: str) -> FactCheckResult:
+        """Query all configured sources concurrently within the deadline."""
+        if not self.enabled:
+            return FactCheckResult(veracity="unknown", sources=[], notes="disabled")
+        if not text.split():
+            return FactCheckResult(veracity="unknown", sources=[], notes="empty")
 
-        # 1) Try NewsAPI if configured
-        if self.news_api_key:
+        pending, outcomes = self._plan(text)
+        if pending:
+            deadline = time.monotonic() + self.timeout
+            futures = {}
             try:
-                import requests
-
-                # Very naive query: take first 5 tokens; contributors can improve NLP later
-                terms = [t for t in text.split() if t.isalpha()][:5]
-                query = " ".join(terms) or text[:64]
-                resp = requests.get(
-                    "https://newsapi.org/v2/everything",
-                    params={"q": query, "pageSize": 3, "sortBy": "relevancy"},
-                    headers={"X-Api-Key": self.news_api_key},
-                    timeout=6,
-                )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    for art in data.get("articles", [])[:3]:
-                        url = art.get("url")
-                        if url:
-                            sources.append(url)
-                    if sources:
-                        return FactCheckResult(veracity="supported", sources=sources)
-                else:
-                    logger.info("NewsAPI non-200: %s", resp.status_code)
-            except Exception as e:  # noqa: BLE001
-                logger.info("NewsAPI unavailable: %s", str(e))
-
-        # 2) Fallback to Wikipedia signal
+                pool = _get_fanout_executor()
+                for name, req in pending.items():
+                    futures[pool.submit(self._fetch, name, req, deadline)] = name
+            except Exception as e:  # noqa: BLE001 requests missing: keep API usable
+                logger.info("Fact-check HTTP session unavailable: %s", str(e))
+                submitted = set(futures.values())
+                for name in pending:
+                    if name not in submitted:
+                        self.breaker(name).release()
+                return FactCheckResult(veracity="unknown", sources=[], notes="offline")
+            done, late = wait(futures, timeout=self.timeout)
+            for fut in done:
+                name = futures[fut]
+                try:
+                    outcomes[name] = ("ok", fut.result())
+                except Exception as e:  # noqa: BLE001
+                    logger.info("Fact-check source %s unavailable: %s", name, str(e))
+                    outcomes[name] = ("error", [])
+            for fut in late:
+                # A running request times out at the deadline and trips the
+                # breaker; one that never started gives its call back
+                if fut.cancel():
+                    self.breaker(futures[fut]).release()
+                outcomes[futures[fut]] = ("timeout", [])
+
+        return self._merge(outcomes)
+
+    async def acheck(self, text: str) -> FactCheckResult:
+        """Non-blocking variant of ``check`` using the shared async client."""
+        if not self.enabled:
+            return FactCheckResult(veracity="unknown", sources=[], notes="disabled")
+        if not text.split():
+            return FactCheckResult(veracity="unknown", sources=[], notes="empty")
+
         try:
-            import wikipedia
-
-            # Very naive: search for a keyword from text and fetch a summary
-            terms = text.split()
-            if not terms:
-                return FactCheckResult(veracity="unknown", sources=[], notes="empty")
-            query = terms[0]
-            results = wikipedia.search(query)
-            if results:
-                title = results[0]
+            get_async_client()
+        except Exception as e:  # noqa: BLE001 httpx missing: keep API usable
+            logger.info("Async HTTP client unavailable: %s", str(e))
+            return FactCheckResult(veracity="unknown", sources=[], notes="offline")
+
+        pending, outcomes = self._plan(text)
+        if pending:
+            tasks = {
+                asyncio.ensure_future(self._afetch(name, req)): name
+                for name, req in pending.items()
+            }
+            done, late = await asyncio.wait(tasks, timeout=self.timeout)
+            for task in late:
+                task.cancel()
+                outcomes[tasks[task]] = ("timeout", [])
+            if late:
+                await asyncio.gather(*late, return_exceptions=True)
+            for task in done:
+                name = tasks[task]
                 try:
-                    page = wikipedia.page(title, auto_suggest=False)
-                    sources.append(page.url)
-                    return FactCheckResult(veracity="supported", sources=sources)
-                except Exception:  # noqa: BLE001 for robustness
-                    pass
-        except Exception as e:  # noqa: BLE001
-            logger.info("Wikipedia check unavailable: %s", str(e))
-
-        return FactCheckResult(veracity="unknown", sources=sources)
+                    outcomes[name] = ("ok", task.result())
+                except Exception as e:  # noqa: BLE001
+                    logger.info("Fact-check source %s unavailable: %s", name, str(e))
+                    outcomes[name] = ("error", [])
+
+        return self._merge(outcomes)
@@ -0,0 +1,310 @@
+"""Shared model server for multi-process serving.
+
+Running several uvicorn workers normally loads a full copy of every transformer
+in each process. In model-server mode one process holds the weights and thin API
+workers reach it over a local socket (``multiprocessing.connection``, a UNIX
+socket path or ``host:port``), sending batches of texts and receiving
+``BiasPrediction``/``ReasoningResult`` objects back.
+
+Requests are pickled, so anyone who can connect and authenticate can run code
+in the server: ``MODEL_SERVER_AUTHKEY`` has no default and both sides refuse to
+start without it, and UNIX sockets (the default) are created with mode 0600.
+Run a server with::
+
+    MODEL_SERVER_AUTHKEY=$(openssl rand -hex 32) \
+        python -m backend.models.model_server --address /tmp/factreal-models.sock
+
+and start API workers with ``MODEL_SERVER_ADDRESS`` and the same
+``MODEL_SERVER_AUTHKEY``; the registry then hands out
+``RemoteBiasModel``/``RemoteReasoningModel`` proxies instead of loading models.
+``backend/scripts/serve.py`` wires both together with a random per-launch key.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import queue
+import tempfile
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import (
+    Client,
+    Connection,
+    Listener,
+    answer_challenge,
+    deliver_challenge,
+)
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..utils.config import settings
+from ..utils.logger import get_logger
+from .bias_model import BiasPrediction
+from .reasoning_model import ReasoningResult
+
+logger = get_logger(__name__)
+
+Address = Union[str, Tuple[str, int]]
+
+DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(), "factreal-models.sock")
+
+
+class ModelServerError(RuntimeError):
+    """Raised on the client when the server reports a failure."""
+
+
+def parse_address(value: str) -> Address:
+    """``host:port`` becomes a TCP address, anything else a UNIX socket path."""
+    host, sep, port = value.rpartition(":")
+    if sep and port.isdigit() and "/" not in value:
+        return (host or "127.0.0.1", int(port))
+    return value
+
+
+def resolve_authkey(authkey: Optional[bytes] = None) -> bytes:
+    """``authkey`` or ``MODEL_SERVER_AUTHKEY``; refuses to run without one."""
+    if authkey:
+        return authkey
+    if not settings.MODEL_SERVER_AUTHKEY:
+        raise RuntimeError("MODEL_SERVER_AUTHKEY is not set")
+    return settings.MODEL_SERVER_AUTHKEY.encode()
+
+
+class ModelServer:
+    """Serves the registry's models to API workers over local connections.
+
+    Each client connection is handled by its own thread, which also runs the
+    authkey handshake, so a client that stalls mid-handshake cannot hold up
+    other connections. With
+    ``ENABLE_BATCHING`` the texts of concurrent clients are merged by the
+    shared ``BatchScheduler`` before reaching the model.
+    """
+
+    def __init__(
+        self, address: str, authkey: Optional[bytes] = None, registry: Any = None
+    ) -> None:
+        from .registry import ModelRegistry
+
+        # A private registry that always loads models locally, even if this
+        # process inherited MODEL_SERVER_ADDRESS from its parent.
+        self.registry = registry or ModelRegistry(use_model_server=False)
+        self.address = parse_address(address)
+        self.authkey = resolve_authkey(authkey)
+        self._listener: Listener | None = None
+        self._closed = threading.Event()
+
+    def start(self) -> None:
+        """Load the models and open the listening socket."""
+        self.registry.warm_up()
+        # No authkey on the Listener: accept() would run the handshake on
+        # the accepting thread; _handle runs it instead
+        if not isinstance(self.address, str):
+            self._listener = Listener(self.address)
+        else:
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            # Owner-only from the moment the socket file exists
+            umask = os.umask(0o177)
+            try:
+                self._listener = Listener(self.address)
+            finally:
+                os.umask(umask)
+            os.chmod(self.address, 0o600)
+        logger.info("Model server pid %s listening on %s", os.getpid(), self.address)
+
+    def serve_forever(self) -> None:
+        if self._listener is None:
+            self.start()
+        assert self._listener is not None
+        while not self._closed.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError as e:
+                if self._closed.is_set():
+                    break
+                logger.info("Failed to accept model server connection: %s", str(e))
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+    def _handle(self, conn: Connection) -> None:
+        with conn:
+            try:
+                # The same handshake as Listener(authkey=...).accept()
+                deliver_challenge(conn, self.authkey)
+                answer_challenge(conn, self.authkey)
+            except (AuthenticationError, EOFError, OSError) as e:
+                logger.info("Rejected model server connection: %s", str(e))
+                return
+            while True:
+                try:
+                    method, payload = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply: Tuple[bool, Any] = (True, self._dispatch(method, payload))
+                except Exception as e:  # noqa: BLE001 report to the caller
+                    reply = (False, f"{type(e).__name__}: {e}")
+                conn.send(reply)
+
+    def _dispatch(self, method: str, payload: Any) -> Any:
+        if method == "bias":
+            if settings.ENABLE_BATCHING:
+                scheduler = self.registry.bias_scheduler()
+                futures = [scheduler.submit(t) for t in payload]
+                return [f.result() for f in futures]
+            return self.registry.bias_model().predict_batch(payload)
+        if method == "explain":
+            text, label = payload
+            return self.registry.reasoning_model().explain(text, label)
+        if method == "info":
+            bias = self.registry.bias_model()
+            reasoning = self.registry.reasoning_model()
+            return {
+                "pid": os.getpid(),
+                "bias": {
+                    "model_name": bias.model_name,
+                    "backend": bias.backend,
+                    "mode": bias.mode,
+                },
+                "reasoning": {
+                    "model_name": reasoning.model_name,
+                    "backend": reasoning.backend,
+                },
+                "stats": self.registry.stats(),
+            }
+        raise ValueError(f"unknown method {method!r}")
+
+
+class ModelServerClient:
+    """Thread-safe client keeping a small pool of connections to one server."""
+
+    def __init__(self, address: str, authkey: Optional[bytes] = None) -> None:
+        self.address = parse_address(address)
+        self.authkey = resolve_authkey(authkey)
+        self._idle: "queue.LifoQueue[Connection]" = queue.LifoQueue()
+
+    def call(self, method: str, payload: Any = None) -> Any:
+        """Send one request; reconnects once if a pooled connection went stale."""
+        for attempt in (1, 2):
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = Client(self.address, authkey=self.authkey)
+            try:
+                conn.send((method, payload))
+                ok, result = conn.recv()
+            except (EOFError, OSError):
+                conn.close()
+                if attempt == 2:
+                    raise
+                continue
+            self._idle.put(conn)
+            if not ok:
+                raise ModelServerError(result)
+            return result
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_client: ModelServerClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_model_server_client() -> ModelServerClient:
+    """Client for ``MODEL_SERVER_ADDRESS``, shared by the remote proxies."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if not settings.MODEL_SERVER_ADDRESS:
+                raise RuntimeError("MODEL_SERVER_ADDRESS is not set")
+            _client = ModelServerClient(settings.MODEL_SERVER_ADDRESS)
+        return _client
+
+
+class RemoteBiasModel:
+    """Drop-in for ``BiasModel`` that runs inference on the model server.
+
+    Only the tokenizer is loaded locally (for chunking long texts).
+    """
+
+    def __init__(self, client: Optional[ModelServerClient] = None) -> None:
+        self.client = client or get_model_server_client()
+        info = self.client.call("info")["bias"]
+        self.model_name = info["model_name"]
+        self.mode = info["mode"]
+        self.backend = f"remote:{info['backend']}"
+        self._tokenizer: Any = None
+        self._tokenizer_loaded = False
+
+    @property
+    def tokenizer(self) -> Any:
+        if not self._tokenizer_loaded:
+            self._tokenizer_loaded = True
+            if self.backend != "remote:heuristic":
+                try:
+                    from transformers import AutoTokenizer
+
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                except Exception as e:  # noqa: BLE001 chunk on words instead
+                    logger.info("Tokenizer unavailable, chunking on words: %s", str(e))
+        return self._tokenizer
+
+    def predict(self, text: str) -> BiasPrediction:
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts: List[str]) -> List[BiasPrediction]:
+        return self.client.call("bias", list(texts))
+
+
+class RemoteReasoningModel:
+    """Drop-in for ``ReasoningModel`` backed by the model server."""
+
+    def __init__(self, client: Optional[ModelServerClient] = None) -> None:
+        self.client = client or get_model_server_client()
+        info = self.client.call("info")["reasoning"]
+        self.model_name = info["model_name"]
+        self.backend = f"remote:{info['backend']}"
+
+    def explain(self, text: str, label: str) -> ReasoningResult:
+        return self.client.call("explain", (text, label))
+
+
+def server_info(address: str, authkey: Optional[bytes] = None) -> Dict[str, Any]:
+    """Ask a running server for its pid, models and load stats."""
+    client = ModelServerClient(address, authkey)
+    try:
+        return client.call("info")
+    finally:
+        client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="FactReal model server")
+    parser.add_argument(
+        "--address",
+        default=settings.MODEL_SERVER_ADDRESS or DEFAULT_ADDRESS,
+        help="UNIX socket path (default) or host:port",
+    )
+    args = parser.parse_args()
+    server = ModelServer(args.address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@
 
 Uses a text-to-text model (e.g., FLAN-T5) to generate short natural language
 explanations for a given text and predicted label. If transformers/models are
-unavailable, falls back to a template-based heuristic explanation.
+unavailable, falls back to a template-based heuristic explanation. The runtime
+(PyTorch, int8, ONNX) is chosen by ``INFERENCE_BACKEND``; see ``backends.py``.
 """
 from __future__ import annotations
 
@@ -11,6 +12,7 @@ from typing import Optional
 
 from ..utils.config import settings
 from ..utils.logger import get_logger
+from ..utils.metrics import INFERENCE_BATCH_SIZE
 
 logger = get_logger(__name__)
 
@@ -21,17 +23,18 @@ class ReasoningResult:
 
 
 class ReasoningModel:
-    def __init__(self, model_name: Optional[str] = None) -> None:
+    def __init__(
+        self, model_name: Optional[str] = None, backend: Optional[str] = None
+    ) -> None:
         self.model_name = model_name or settings.MODEL_REASONING
         self.pipeline = None
+        self.backend = "heuristic"
         try:
-            from transformers import pipeline
+            from .backends import build_pipeline
 
             logger.info("Loading reasoning model: %s", self.model_name)
-            self.pipeline = pipeline(
-                "text2text-generation",
-                model=self.model_name,
-                device_map="auto",
+            self.pipeline, self.backend = build_pipeline(
+                "text2text-generation", self.model_name, backend
             )
         except Exception as e:  # noqa: BLE001
             logger.warning(
@@ -54,6 +57,7 @@ class ReasoningModel:
             )
             return ReasoningResult(explanation=explanation)
 
+        INFERENCE_BATCH_SIZE.observe(1, model="reasoning")
         try:
             outs = self.pipeline(prompt, max_new_tokens=80, num_return_sequences=1)
             if isinstance(outs, list) and outs:
@@ -0,0 +1,161 @@
+"""Process-wide registry of loaded models.
+
+Every service asks the registry for its model instead of constructing one, so
+each transformer is loaded at most once per process no matter how many
+controllers exist. Models load lazily on first use, or eagerly via
+``warm_up()`` (run at startup when ``PRELOAD_MODELS`` is set). Load time and the
+resident-memory growth observed while loading are recorded per model.
+
+When ``MODEL_SERVER_ADDRESS`` is set the registry hands out proxies to a shared
+model server process (see ``model_server.py``) instead of loading weights.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, TypeVar
+
+from ..utils.config import settings
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ModelLoadStats:
+    key: str
+    model_name: str
+    load_seconds: float
+    rss_before_bytes: int
+    rss_after_bytes: int
+    backend: str = ""
+
+    @property
+    def rss_delta_bytes(self) -> int:
+        return max(0, self.rss_after_bytes - self.rss_before_bytes)
+
+
+def current_rss_bytes() -> int:
+    """Best-effort resident set size of this process, in bytes."""
+    try:
+        import psutil  # optional dependency
+
+        return int(psutil.Process(os.getpid()).memory_info().rss)
+    except Exception:  # noqa: BLE001 fall through to /proc or resource
+        pass
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except Exception:  # noqa: BLE001
+        pass
+    try:
+        import resource
+        import sys
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and kilobytes elsewhere
+        return int(peak if sys.platform == "darwin" else peak * 1024)
+    except Exception:  # noqa: BLE001
+        return 0
+
+
+class ModelRegistry:
+    """Loads each model once and hands out the shared instance."""
+
+    def __init__(self, use_model_server: bool = True) -> None:
+        self.use_model_server = use_model_server
+        self._instances: Dict[str, Any] = {}
+        self._stats: Dict[str, ModelLoadStats] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: str, factory: Callable[[], T], model_name: str = "") -> T:
+        """Return the instance for ``key``, building it with ``factory`` once."""
+        inst = self._instances.get(key)
+        if inst is not None:
+            return inst
+        with self._lock:
+            inst = self._instances.get(key)
+            if inst is None:
+                rss_before = current_rss_bytes()
+                start = time.perf_counter()
+                inst = factory()
+                stats = ModelLoadStats(
+                    key=key,
+                    model_name=model_name or getattr(inst, "model_name", ""),
+                    load_seconds=time.perf_counter() - start,
+                    rss_before_bytes=rss_before,
+                    rss_after_bytes=current_rss_bytes(),
+                    backend=getattr(inst, "backend", ""),
+                )
+                self._instances[key] = inst
+                self._stats[key] = stats
+                logger.info(
+                    "Loaded %s (%s) in %.2fs, +%.1f MiB RSS",
+                    key,
+                    stats.model_name,
+                    stats.load_seconds,
+                    stats.rss_delta_bytes / 2**20,
+                )
+            return inst
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._instances
+
+    @property
+    def remote(self) -> bool:
+        return self.use_model_server and bool(settings.MODEL_SERVER_ADDRESS)
+
+    def bias_model(self) -> Any:
+        """Shared zero-shot bias classifier."""
+        if self.remote:
+            from .model_server import RemoteBiasModel
+
+            return self.get("bias", RemoteBiasModel)
+        from .bias_model import BiasModel
+
+        return self.get("bias", BiasModel)
+
+    def reasoning_model(self) -> Any:
+        """Shared explanation generator."""
+        if self.remote:
+            from .model_server import RemoteReasoningModel
+
+            return self.get("reasoning", RemoteReasoningModel)
+        from .reasoning_model import ReasoningModel
+
+        return self.get("reasoning", ReasoningModel)
+
+    def bias_scheduler(self) -> Any:
+        """Shared micro-batching scheduler around the shared bias model."""
+        from ..services.batching_service import BatchScheduler
+
+        model = self.bias_model()
+        return self.get("bias_scheduler", lambda: BatchScheduler(model), "batcher")
+
+    def warm_up(self) -> List[Dict[str, Any]]:
+        """Eagerly load every model and return the load report."""
+        self.bias_model()
+        self.reasoning_model()
+        return self.stats()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-model load time and memory growth, in load order."""
+        with self._lock:
+            return [
+                {**asdict(s), "rss_delta_bytes": s.rss_delta_bytes}
+                for s in self._stats.values()
+            ]
+
+    def clear(self) -> None:
+        """Forget every instance (used by tests and model reloads)."""
+        with self._lock:
+            self._instances.clear()
+            self._stats.clear()
+
+
+registry = ModelRegistry()
@@ -0,0 +1,22 @@
+"""FastAPI router for result cache statistics."""
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from ..controllers.cache_controller import CacheController, CacheStatsResponse
+
+
+router = APIRouter(prefix="/cache", tags=["cache"])
+controller = CacheController()
+
+
+@router.get("/stats", response_model=CacheStatsResponse)
+def cache_stats() -> CacheStatsResponse:
+    """Return hit/miss counters and tier sizes of the analysis cache."""
+    return controller.stats()
+
+
+@router.delete("", response_model=CacheStatsResponse)
+def cache_clear() -> CacheStatsResponse:
+    """Drop every cached analysis and reset the counters."""
+    return controller.clear()
@@ -1,13 +1,71 @@
 """FastAPI router for classification endpoints."""
 from __future__ import annotations
 
+from typing import AsyncIterator, Callable
+
+import anyio
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+from fastapi.concurrency import run_in_threadpool
 
 from ..controllers.classify_controller import (
     ClassifyController,
     ClassifyRequest,
     ClassifyResponse,
 )
+from ..utils.config import settings
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse that keeps reading the request body while it streams.
+
+    Starlette's default implementation listens for client disconnects on
+    ``receive`` (for ASGI < 2.4), which would swallow request body messages.
+    Here a single listener owns ``receive``: it forwards body chunks to
+    ``produce`` and, on ``http.disconnect`` (during or after the upload),
+    cancels the stream so the remaining records are not classified.
+    """
+
+    def __init__(
+        self,
+        produce: Callable[[AsyncIterator[bytes]], AsyncIterator[bytes]],
+        media_type: str | None = None,
+    ) -> None:
+        super().__init__((), media_type=media_type)
+        self.produce = produce
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # One chunk of buffering keeps backpressure on the upload
+        chunks_in, chunks_out = anyio.create_memory_object_stream(1)
+
+        async def body() -> AsyncIterator[bytes]:
+            async with chunks_out:
+                async for chunk in chunks_out:
+                    yield chunk
+
+        async def listen(cancel_scope: anyio.CancelScope) -> None:
+            async with chunks_in:
+                while True:
+                    message = await receive()
+                    if message["type"] == "http.disconnect":
+                        cancel_scope.cancel()
+                        return
+                    if message.get("body"):
+                        await chunks_in.send(message["body"])
+                    if not message.get("more_body", False):
+                        break
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            cancel_scope.cancel()
+
+        self.body_iterator = self.produce(body())
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(listen, tg.cancel_scope)
+            await self.stream_response(send)
+            tg.cancel_scope.cancel()
+        if self.background is not None:
+            await self.background()
 
 
 router = APIRouter(prefix="/classify", tags=["classify"])
@@ -15,6 +73,20 @@ controller = ClassifyController()
 
 
 @router.post("", response_model=ClassifyResponse)
-def classify(req: ClassifyRequest) -> ClassifyResponse:
+async def classify(req: ClassifyRequest) -> ClassifyResponse:
     """Classify input text and return label, scores, and explanation."""
-    return controller.classify(req)
+    if settings.ASYNC_MODE:
+        return await controller.aclassify(req)
+    return await run_in_threadpool(controller.classify, req)
+
+
+@router.post("/batch", response_class=StreamingResponse)
+async def classify_batch() -> StreamingResponse:
+    """Classify a JSON array or NDJSON body, streaming one NDJSON line per text.
+
+    The body is read incrementally and results are written as each model-sized
+    chunk completes, so memory stays bounded regardless of input size.
+    """
+    return _DuplexStreamingResponse(
+        controller.classify_bulk, media_type="application/x-ndjson"
+    )
@@ -1,13 +1,16 @@
 """FastAPI router for explanation endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 from ..controllers.explain_controller import (
     ExplainController,
     ExplainRequest,
     ExplainResponse,
+    ExplanationTicketResponse,
 )
+from ..utils.config import settings
 
 
 router = APIRouter(prefix="/explain", tags=["explain"])
@@ -15,6 +18,17 @@ controller = ExplainController()
 
 
 @router.post("", response_model=ExplainResponse)
-def explain(req: ExplainRequest) -> ExplainResponse:
+async def explain(req: ExplainRequest) -> ExplainResponse:
     """Generate an explanation for a text and label."""
-    return controller.explain(req)
+    if settings.ASYNC_MODE:
+        return await controller.aexplain(req)
+    return await run_in_threadpool(controller.explain, req)
+
+
+@router.get("/{ticket}", response_model=ExplanationTicketResponse)
+def explanation_ticket(ticket: str) -> ExplanationTicketResponse:
+    """Fetch a deferred explanation created by /classify."""
+    res = controller.ticket(ticket)
+    if res is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired ticket")
+    return res
@@ -0,0 +1,16 @@
+"""FastAPI router exposing Prometheus metrics."""
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from ..utils.metrics import CONTENT_TYPE, render_metrics
+
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Return stage, request, batch, cache and fact-check metrics."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
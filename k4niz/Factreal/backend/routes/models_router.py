@@ -0,0 +1,23 @@
+"""FastAPI router for model load statistics and warm-up."""
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+
+from ..controllers.models_controller import ModelsController, ModelsResponse
+
+
+router = APIRouter(prefix="/models", tags=["models"])
+controller = ModelsController()
+
+
+@router.get("", response_model=ModelsResponse)
+def models() -> ModelsResponse:
+    """Return load time and resident memory growth for each loaded model."""
+    return controller.stats()
+
+
+@router.post("/warmup", response_model=ModelsResponse)
+async def warm_up() -> ModelsResponse:
+    """Load every model now (no-op for models that are already loaded)."""
+    return await run_in_threadpool(controller.warm_up)
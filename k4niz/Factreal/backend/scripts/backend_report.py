@@ -0,0 +1,127 @@
+"""Parity and latency report for the inference backends.
+
+Loads BiasModel and ReasoningModel once per backend, runs the same texts through
+each, and compares the results with the PyTorch reference:
+
+- bias: top-label agreement and the largest absolute per-label score difference
+- reasoning: exact-match rate of the generated explanations
+
+Latency is the mean/median wall time per call after one warm-up call.
+
+Usage (from the project root):
+    python -m backend.scripts.backend_report --backends pytorch onnx onnx-int8 \
+        --out backend_report.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ..models.backends import BACKENDS
+from ..models.bias_model import BiasModel, BiasPrediction
+from ..models.reasoning_model import ReasoningModel
+
+DEFAULT_DATA = Path(__file__).resolve().parents[1] / "data" / "sample_dataset.jsonl"
+
+
+def load_texts(path: Path) -> List[str]:
+    """Read the ``text`` field of every JSONL record."""
+    with path.open(encoding="utf-8") as fh:
+        return [json.loads(line)["text"] for line in fh if line.strip()]
+
+
+def timed(fn: Any, *args: Any) -> tuple[Any, float]:
+    """Call ``fn`` and return (result, seconds)."""
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def latency(samples: List[float]) -> Dict[str, float]:
+    return {
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": statistics.median(samples) * 1000,
+    }
+
+
+def bias_parity(ref: List[BiasPrediction], got: List[BiasPrediction]) -> Dict[str, float]:
+    """Label agreement and max absolute per-label score difference."""
+    agree = sum(r.label == g.label for r, g in zip(ref, got))
+    diff = max(
+        (
+            abs(r.details.get(lbl, 0.0) - g.details.get(lbl, 0.0))
+            for r, g in zip(ref, got)
+            for lbl in set(r.details) | set(g.details)
+        ),
+        default=0.0,
+    )
+    return {"label_agreement": agree / max(1, len(ref)), "max_score_diff": diff}
+
+
+def run_backend(backend: str, texts: List[str]) -> Dict[str, Any]:
+    """Load both models on ``backend`` and time every text."""
+    bias, bias_load = timed(BiasModel, None, backend)
+    reasoning, reasoning_load = timed(ReasoningModel, None, backend)
+
+    bias.predict(texts[0])  # warm-up
+    reasoning.explain(texts[0], "neutral")
+
+    preds, bias_times, explanations, reasoning_times = [], [], [], []
+    for text in texts:
+        pred, secs = timed(bias.predict, text)
+        preds.append(pred)
+        bias_times.append(secs)
+        exp, secs = timed(reasoning.explain, text, pred.label)
+        explanations.append(exp.explanation)
+        reasoning_times.append(secs)
+
+    return {
+        "requested": backend,
+        "bias_backend": bias.backend,
+        "reasoning_backend": reasoning.backend,
+        "load_seconds": {"bias": bias_load, "reasoning": reasoning_load},
+        "bias_latency": latency(bias_times),
+        "reasoning_latency": latency(reasoning_times),
+        "_preds": preds,
+        "_explanations": explanations,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA)
+    parser.add_argument("--out", type=Path, default=None, help="Write JSON report here")
+    args = parser.parse_args()
+
+    texts = load_texts(args.data)
+    backends = ["pytorch"] + [b for b in args.backends if b != "pytorch"]
+    results = [run_backend(b, texts) for b in backends]
+
+    ref = results[0]
+    for res in results:
+        res["bias_parity"] = bias_parity(ref["_preds"], res["_preds"])
+        matches = sum(a == b for a, b in zip(ref["_explanations"], res["_explanations"]))
+        res["reasoning_exact_match"] = matches / max(1, len(texts))
+    for res in results:
+        del res["_preds"], res["_explanations"]
+
+    print(f"{'backend':<14}{'bias ms':>10}{'reason ms':>11}{'agree':>8}{'max diff':>10}")
+    for res in results:
+        print(
+            f"{res['requested']:<14}"
+            f"{res['bias_latency']['mean_ms']:>10.1f}"
+            f"{res['reasoning_latency']['mean_ms']:>11.1f}"
+            f"{res['bias_parity']['label_agreement']:>8.2f}"
+            f"{res['bias_parity']['max_score_diff']:>10.4f}"
+        )
+    if args.out:
+        args.out.write_text(json.dumps({"texts": len(texts), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
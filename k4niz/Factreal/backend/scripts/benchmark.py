@@ -0,0 +1,266 @@
+"""Load-test and latency benchmark for the FactReal API.
+
+Drives ``POST /classify`` (or any JSON endpoint) with a fixed number of
+concurrent clients and reports end-to-end latency percentiles, throughput and
+per-stage timings taken from the ``Server-Timing`` response header
+(preprocess, cache, classify, explain, fact_check).
+
+Targets:
+- in-process (default): the app is imported and driven through
+  ``httpx.ASGITransport``; no server or network needed.
+- ``--uvicorn``: a local uvicorn subprocess is started on a free port.
+- ``--url``: an already running server.
+
+For reproducible numbers without model downloads use ``--heuristic`` (sets
+``FORCE_HEURISTIC``) or point ``--model-bias``/``--model-reasoning`` at tiny
+local models. The result cache is disabled unless ``--cache`` is given, so
+repeated texts measure the models rather than cache hits.
+
+Results are written as JSON (``--out``) so releases can be diffed, e.g.:
+    python -m backend.scripts.benchmark --heuristic -c 16 -n 2000 --out new.json
+    python -m backend.scripts.benchmark --compare old.json new.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DATA = Path(__file__).resolve().parents[1] / "data" / "sample_dataset.jsonl"
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (``pct`` in 0..100) of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered)) - 1
+    return ordered[max(0, min(len(ordered) - 1, rank))]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds."""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": statistics.fmean(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+def load_texts(path: Path) -> List[str]:
+    with path.open(encoding="utf-8") as fh:
+        return [json.loads(line)["text"] for line in fh if line.strip()]
+
+
+async def drive(
+    client: Any, path: str, texts: List[str], requests: int, concurrency: int
+) -> Dict[str, Any]:
+    """Send ``requests`` POSTs with ``concurrency`` workers and collect timings."""
+    from ..utils.timing import parse_server_timing
+
+    latencies: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            payload = {"text": texts[i % len(texts)]}
+            start = time.perf_counter()
+            try:
+                resp = await client.post(path, json=payload)
+            except Exception:  # noqa: BLE001 count transport failures as errors
+                errors += 1
+                continue
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if resp.status_code != 200:
+                errors += 1
+                continue
+            latencies.append(elapsed_ms)
+            for name, ms in parse_server_timing(resp.headers.get("server-timing", "")).items():
+                stages.setdefault(name, []).append(ms)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_seconds": wall,
+        "throughput_rps": len(latencies) / wall if wall > 0 else 0.0,
+        "latency_ms": summarize(latencies),
+        "stages_ms": {name: summarize(vals) for name, vals in sorted(stages.items())},
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_ready(client: Any, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except Exception:  # noqa: BLE001 server still starting
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("server did not become ready")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    texts = load_texts(args.data)
+    proc: Optional[subprocess.Popen] = None
+    timeout = httpx.Timeout(args.timeout)
+
+    if args.url:
+        target = args.url
+        client = httpx.AsyncClient(base_url=args.url, timeout=timeout)
+    elif args.uvicorn:
+        port = _free_port()
+        target = f"uvicorn:127.0.0.1:{port}"
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port),
+             "--workers", str(args.workers), "--log-level", "warning"],
+            cwd=PROJECT_ROOT,
+            env=os.environ.copy(),
+        )
+        client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=timeout)
+    else:
+        from ..main import app
+
+        target = "in-process"
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=timeout
+        )
+
+    try:
+        await _wait_ready(client)
+        if args.warmup:
+            await drive(client, args.path, texts, args.warmup, min(args.warmup, args.concurrency))
+        result = await drive(client, args.path, texts, args.requests, args.concurrency)
+    finally:
+        await client.aclose()
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    from ..utils.config import settings
+
+    result["meta"] = {
+        "target": target,
+        "path": args.path,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            k: getattr(settings, k)
+            for k in (
+                "MODEL_BIAS", "MODEL_REASONING", "INFERENCE_BACKEND", "FORCE_HEURISTIC",
+                "ASYNC_MODE", "ENABLE_BATCHING", "EXPLANATION_POLICY", "CACHE_ENABLED",
+            )
+        },
+    }
+    return result
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    lat = result["latency_ms"]
+    print(
+        f"{result['meta']['target']}: {result['requests']} requests, "
+        f"concurrency {result['concurrency']}, errors {result['errors']}"
+    )
+    print(f"throughput: {result['throughput_rps']:.1f} req/s")
+    if lat.get("count"):
+        print(
+            f"latency ms: p50 {lat['p50']:.1f}  p95 {lat['p95']:.1f}  "
+            f"p99 {lat['p99']:.1f}  max {lat['max']:.1f}"
+        )
+    for name, s in result["stages_ms"].items():
+        print(f"  {name:<11} p50 {s['p50']:8.2f}  p95 {s['p95']:8.2f}  p99 {s['p99']:8.2f}")
+
+
+def compare(old_path: Path, new_path: Path) -> None:
+    """Print relative changes of throughput and latency percentiles."""
+    old = json.loads(old_path.read_text())
+    new = json.loads(new_path.read_text())
+
+    def delta(a: float, b: float) -> str:
+        return f"{a:10.2f} -> {b:10.2f} ({(b - a) / a * 100:+.1f}%)" if a else f"{b:.2f}"
+
+    print("throughput_rps", delta(old["throughput_rps"], new["throughput_rps"]))
+    for pct in ("p50", "p95", "p99"):
+        print(f"latency {pct}   ", delta(old["latency_ms"][pct], new["latency_ms"][pct]))
+    for name in sorted(set(old["stages_ms"]) | set(new["stages_ms"])):
+        a = old["stages_ms"].get(name, {}).get("p50", 0.0)
+        b = new["stages_ms"].get(name, {}).get("p50", 0.0)
+        print(f"stage {name:<10} p50", delta(a, b))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10, help="Unrecorded warm-up requests")
+    parser.add_argument("--path", default="/classify")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Benchmark an already running server")
+    target.add_argument("--uvicorn", action="store_true", help="Start a local uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--heuristic", action="store_true", help="Set FORCE_HEURISTIC")
+    parser.add_argument("--model-bias")
+    parser.add_argument("--model-reasoning")
+    parser.add_argument("--cache", action="store_true", help="Keep the result cache on")
+    parser.add_argument("--out", type=Path, help="Write JSON results here")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    # Settings are read at import time, so configure the environment first
+    if args.heuristic:
+        os.environ["FORCE_HEURISTIC"] = "true"
+    if args.model_bias:
+        os.environ["MODEL_BIAS"] = args.model_bias
+    if args.model_reasoning:
+        os.environ["MODEL_REASONING"] = args.model_reasoning
+    if not args.cache:
+        os.environ["CACHE_ENABLED"] = "false"
+
+    result = asyncio.run(run(args))
+    print_report(result)
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Accuracy and throughput of the BiasModel scoring modes.
+
+Compares the zero-shot NLI path (``BIAS_MODE=nli``) with the cached hypothesis
+embedding path (``BIAS_MODE=embedding``) on a labeled JSONL sample
+(``{"text": ..., "label": ...}``). The default sample ships with the tests.
+
+Usage (from the project root):
+    python -m backend.scripts.bias_mode_benchmark --batch-size 8 --out modes.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from ..models.bias_model import BiasModel
+
+DEFAULT_DATA = (
+    Path(__file__).resolve().parents[2] / "tests" / "data" / "bias_labeled_sample.jsonl"
+)
+MODES = ("nli", "embedding")
+
+
+def load_labeled(path: Path) -> List[Tuple[str, str]]:
+    """Read (text, label) pairs from a JSONL file."""
+    with path.open(encoding="utf-8") as fh:
+        rows = [json.loads(line) for line in fh if line.strip()]
+    return [(r["text"], r["label"]) for r in rows]
+
+
+def evaluate(
+    model: BiasModel, samples: List[Tuple[str, str]], batch_size: int = 8
+) -> Dict[str, Any]:
+    """Accuracy plus texts/second for ``model`` on ``samples``."""
+    texts = [t for t, _ in samples]
+    model.predict_batch(texts[:1])  # warm-up, also fills the hypothesis cache
+
+    preds = []
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        preds.extend(model.predict_batch(texts[i : i + batch_size]))
+    elapsed = time.perf_counter() - start
+
+    correct = sum(p.label == gold for p, (_, gold) in zip(preds, samples))
+    return {
+        "mode": model.mode,
+        "model": model.model_name,
+        "backend": model.backend,
+        "samples": len(samples),
+        "accuracy": correct / max(1, len(samples)),
+        "texts_per_second": len(samples) / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--out", type=Path, default=None, help="Write JSON results here")
+    args = parser.parse_args()
+
+    samples = load_labeled(args.data)
+    results = [evaluate(BiasModel(mode=m), samples, args.batch_size) for m in args.modes]
+
+    print(f"{'mode':<11}{'backend':<12}{'accuracy':>9}{'texts/s':>11}")
+    for res in results:
+        print(
+            f"{res['mode']:<11}{res['backend']:<12}"
+            f"{res['accuracy']:>9.2f}{res['texts_per_second']:>11.1f}"
+        )
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Multi-process launcher for the FactReal API.
+
+Modes (``--mode``):
+- ``replicated``: plain ``uvicorn --workers N``; every worker loads its own
+  copy of the models.
+- ``prefork``: the models are loaded once in this process, then ``N`` workers
+  are forked and share the weights copy-on-write (POSIX only).
+- ``model-server``: ``--model-servers K`` processes hold the weights and ``N``
+  thin API workers, forked without models, reach them round-robin over UNIX
+  sockets (see ``backend/models/model_server.py``). A random authkey is
+  generated for every launch and handed to the servers through the
+  environment.
+
+Every mode preloads models (``PRELOAD_MODELS``) so memory can be compared at
+steady state; ``backend/scripts/serving_report.py`` does that comparison.
+
+    python -m backend.scripts.serve --mode prefork --workers 4 --port 8000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import secrets
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from typing import Callable, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+MODES = ("replicated", "prefork", "model-server")
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(sock: socket.socket, args: argparse.Namespace) -> None:
+    """Serve the app on the inherited socket (runs in a forked child)."""
+    import uvicorn
+
+    from ..main import app
+
+    config = uvicorn.Config(app, host=args.host, port=args.port, log_level=args.log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _fork_workers(
+    sock: socket.socket,
+    args: argparse.Namespace,
+    before: Optional[Callable[[int], None]] = None,
+) -> List[int]:
+    pids = []
+    for i in range(args.workers):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                if before is not None:
+                    before(i)
+                _run_worker(sock, args)
+            except BaseException:  # noqa: BLE001 never return into the parent's code
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        pids.append(pid)
+    return pids
+
+
+def _supervise(pids: List[int], procs: List[subprocess.Popen]) -> int:
+    """Wait for the workers; forward SIGTERM/SIGINT to every child.
+
+    ``procs`` are helpers stopped once the workers exit; without forked
+    workers the first of them is the one waited for.
+    """
+
+    def stop(signum: int, _frame: object) -> None:
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for proc in procs:
+            proc.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    if not pids:
+        return procs[0].wait()
+    status = 0
+    for pid in pids:
+        _, code = os.waitpid(pid, 0)
+        status = status or os.waitstatus_to_exitcode(code)
+    for proc in procs:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return status
+
+
+def run_replicated(args: argparse.Namespace) -> int:
+    cmd = [
+        sys.executable, "-m", "uvicorn", "backend.main:app",
+        "--host", args.host, "--port", str(args.port),
+        "--workers", str(args.workers), "--log-level", args.log_level,
+    ]
+    proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT)
+    return _supervise([], [proc])
+
+
+def run_prefork(args: argparse.Namespace) -> int:
+    from ..models.registry import registry
+
+    registry.warm_up()
+    # Move everything loaded so far out of the collector's reach so that GC
+    # passes in the workers do not touch (and thus copy) the shared pages.
+    gc.collect()
+    gc.freeze()
+    sock = _bind(args.host, args.port)
+    return _supervise(_fork_workers(sock, args), [])
+
+
+def run_model_server(args: argparse.Namespace) -> int:
+    from ..models.model_server import server_info
+
+    authkey = secrets.token_hex(32)
+    sockdir = tempfile.mkdtemp(prefix="factreal-models-")
+    addresses = [os.path.join(sockdir, f"models-{k}.sock") for k in range(args.model_servers)]
+    servers = [
+        subprocess.Popen(
+            [sys.executable, "-m", "backend.models.model_server", "--address", addr],
+            cwd=PROJECT_ROOT,
+            env={**os.environ, "MODEL_SERVER_AUTHKEY": authkey},
+        )
+        for addr in addresses
+    ]
+    try:
+        deadline = time.monotonic() + args.ready_timeout
+        for addr in addresses:
+            while True:
+                try:
+                    server_info(addr, authkey.encode())
+                    break
+                except (OSError, EOFError):
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"model server at {addr} did not start")
+                    time.sleep(0.25)
+
+        def connect(i: int) -> None:
+            from ..utils.config import settings
+
+            addr = addresses[i % len(addresses)]
+            os.environ["MODEL_SERVER_ADDRESS"] = addr
+            settings.MODEL_SERVER_ADDRESS = addr
+            settings.MODEL_SERVER_AUTHKEY = authkey
+
+        sock = _bind(args.host, args.port)
+        return _supervise(_fork_workers(sock, args, before=connect), servers)
+    finally:
+        for proc in servers:
+            if proc.poll() is None:
+                proc.terminate()
+        shutil.rmtree(sockdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=MODES, default="prefork")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--model-servers", type=int, default=1, help="Model server processes (model-server mode)"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--log-level", default="warning")
+    parser.add_argument("--ready-timeout", type=float, default=600.0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("PRELOAD_MODELS", "true")
+    runner = {
+        "replicated": run_replicated,
+        "prefork": run_prefork,
+        "model-server": run_model_server,
+    }[args.mode]
+    sys.exit(runner(args))
+
+
+if __name__ == "__main__":
+    main()
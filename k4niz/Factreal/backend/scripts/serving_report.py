@@ -0,0 +1,213 @@
+"""Memory-per-worker and throughput-per-core report for the serving modes.
+
+Starts ``backend/scripts/serve.py`` once per mode (replicated, prefork,
+model-server) with the same number of API workers, drives it with the load
+generator from ``benchmark.py`` and then reads, for every process in the tree:
+
+- RSS, which counts pages shared copy-on-write once per process,
+- PSS (proportional set size), which splits shared pages between the
+  processes mapping them, so the PSS total is the real memory footprint,
+- USS (private pages), the memory a process would free on exit.
+
+Throughput is reported per wall-clock second and per CPU-second consumed by
+the whole process tree ("requests per core-second"). Memory figures come from
+``/proc/<pid>/smaps_rollup`` (Linux) or ``psutil`` when installed.
+
+    python -m backend.scripts.serving_report --workers 4 -n 2000 -c 32 --out serving.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .benchmark import DEFAULT_DATA, PROJECT_ROOT, _free_port, _wait_ready, drive, load_texts
+from .serve import MODES
+
+MIB = 2**20
+
+
+def process_tree(root: int) -> List[int]:
+    """``root`` and all of its descendants."""
+    try:
+        import psutil  # optional dependency
+
+        proc = psutil.Process(root)
+        return [root] + [p.pid for p in proc.children(recursive=True)]
+    except ImportError:
+        pass
+    parents: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii") as fh:
+                ppid = int(fh.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        parents.setdefault(ppid, []).append(int(entry))
+    tree, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(parents.get(pid, []))
+    return tree
+
+
+def memory_info(pid: int) -> Dict[str, int]:
+    """RSS, PSS and USS of ``pid`` in bytes."""
+    try:
+        fields: Dict[str, int] = {}
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as fh:
+            for line in fh:
+                key, _, rest = line.partition(":")
+                parts = rest.split()
+                if len(parts) == 2 and parts[1] == "kB":
+                    fields[key] = int(parts[0]) * 1024
+        return {
+            "rss": fields.get("Rss", 0),
+            "pss": fields.get("Pss", 0),
+            "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        }
+    except OSError:
+        import psutil
+
+        full = psutil.Process(pid).memory_full_info()
+        return {"rss": full.rss, "pss": getattr(full, "pss", full.rss), "uss": full.uss}
+
+
+def cpu_seconds(pids: List[int]) -> float:
+    """User + system CPU time consumed so far by ``pids``."""
+    tick = os.sysconf("SC_CLK_TCK")
+    total = 0.0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", encoding="ascii") as fh:
+                fields = fh.read().rsplit(")", 1)[1].split()
+            total += (int(fields[11]) + int(fields[12])) / tick
+        except (OSError, ValueError, IndexError):
+            continue
+    return total
+
+
+def _describe(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as fh:
+            args = fh.read().split(b"\0")
+        text = " ".join(a.decode(errors="replace") for a in args if a)
+    except OSError:
+        text = ""
+    if "model_server" in text:
+        return "model-server"
+    if "multiprocessing" in text:
+        return "uvicorn-worker"
+    return "launcher" if "backend.scripts.serve" in text else text[:40]
+
+
+async def measure(mode: str, args: argparse.Namespace, texts: List[str]) -> Dict[str, Any]:
+    import httpx
+
+    port = _free_port()
+    cmd = [
+        sys.executable, "-m", "backend.scripts.serve", "--mode", mode,
+        "--workers", str(args.workers), "--model-servers", str(args.model_servers),
+        "--port", str(port),
+    ]
+    proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT, env=os.environ.copy(), start_new_session=True)
+    client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=args.timeout)
+    try:
+        await _wait_ready(client, timeout=args.ready_timeout)
+        # Let every worker finish loading before the warm-up and the run
+        await asyncio.sleep(args.settle)
+        if args.warmup:
+            await drive(client, args.path, texts, args.warmup, args.concurrency)
+        pids = process_tree(proc.pid)
+        cpu_before = cpu_seconds(pids)
+        result = await drive(client, args.path, texts, args.requests, args.concurrency)
+        cpu_used = cpu_seconds(pids) - cpu_before
+        processes = []
+        for pid in process_tree(proc.pid):
+            try:
+                processes.append({"pid": pid, "role": _describe(pid), **memory_info(pid)})
+            except Exception:  # noqa: BLE001 process exited meanwhile
+                continue
+    finally:
+        await client.aclose()
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        try:
+            proc.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+
+    total_pss = sum(p["pss"] for p in processes)
+    served = result["latency_ms"].get("count", 0)
+    return {
+        "mode": mode,
+        "workers": args.workers,
+        "model_servers": args.model_servers if mode == "model-server" else 0,
+        "processes": processes,
+        "total_rss_mib": sum(p["rss"] for p in processes) / MIB,
+        "total_pss_mib": total_pss / MIB,
+        "pss_per_worker_mib": total_pss / MIB / max(1, args.workers),
+        "throughput_rps": result["throughput_rps"],
+        "cpu_seconds": cpu_used,
+        "requests_per_core_second": served / cpu_used if cpu_used > 0 else 0.0,
+        "benchmark": result,
+    }
+
+
+def print_report(rows: List[Dict[str, Any]]) -> None:
+    print(
+        f"{'mode':<13}{'procs':>6}{'RSS MiB':>10}{'PSS MiB':>10}{'PSS/worker':>12}"
+        f"{'req/s':>9}{'req/core-s':>12}{'p95 ms':>9}"
+    )
+    for r in rows:
+        p95 = r["benchmark"]["latency_ms"].get("p95", 0.0)
+        print(
+            f"{r['mode']:<13}{len(r['processes']):>6}{r['total_rss_mib']:>10.1f}"
+            f"{r['total_pss_mib']:>10.1f}{r['pss_per_worker_mib']:>12.1f}"
+            f"{r['throughput_rps']:>9.1f}{r['requests_per_core_second']:>12.1f}{p95:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--model-servers", type=int, default=1)
+    parser.add_argument("-n", "--requests", type=int, default=500)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--path", default="/classify")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--ready-timeout", type=float, default=600.0)
+    parser.add_argument("--settle", type=float, default=2.0)
+    parser.add_argument("--heuristic", action="store_true", help="Set FORCE_HEURISTIC")
+    parser.add_argument("--out", type=Path, help="Write JSON results here")
+    args = parser.parse_args()
+
+    # Measure the models, not the result cache
+    os.environ["CACHE_ENABLED"] = "false"
+    if args.heuristic:
+        os.environ["FORCE_HEURISTIC"] = "true"
+
+    texts = load_texts(args.data)
+    rows = [asyncio.run(measure(mode, args, texts)) for mode in args.modes]
+    print_report(rows)
+    if args.out:
+        args.out.write_text(json.dumps({"timestamp": time.time(), "results": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
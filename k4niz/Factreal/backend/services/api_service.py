@@ -3,14 +3,26 @@ explanation, and optional fact checking.
 """
 from __future__ import annotations
 
+import asyncio
+import queue
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from .preprocessing_service import preprocess_text
 from .classification_service import ClassificationService, ClassificationResult
 from .explainability_service import ExplainabilityService
+from .cache_service import ResultCache, get_result_cache, make_cache_key
+from .explanation_queue import ExplanationQueue, get_explanation_queue
 from ..models.fact_checker import FactChecker, FactCheckResult
 from ..utils.config import settings
+from ..utils.executor import run_inference
+from ..utils.logger import get_logger
+from ..utils.timing import stage
+
+logger = get_logger(__name__)
+
+NOT_FLAGGED_EXPLANATION = "No explanation generated because the text was not flagged."
+QUEUE_FULL_EXPLANATION = "Explanation queue is full; request /explain directly."
 
 
 @dataclass
@@ -18,6 +30,7 @@ class FullAnalysis:
     classification: ClassificationResult
     explanation: str
     fact_check: Dict[str, Any] | None
+    explanation_ticket: Optional[str] = None
 
     def to_json(self) -> Dict[str, Any]:
         payload = {
@@ -26,8 +39,20 @@ class FullAnalysis:
         }
         if self.fact_check is not None:
             payload["fact_check"] = self.fact_check
+        if self.explanation_ticket is not None:
+            payload["explanation_ticket"] = self.explanation_ticket
         return payload
 
+    @classmethod
+    def from_json(cls, payload: Dict[str, Any]) -> "FullAnalysis":
+        """Rebuild an analysis from the output of ``to_json``."""
+        return cls(
+            classification=ClassificationResult(**payload["classification"]),
+            explanation=payload["explanation"],
+            fact_check=payload.get("fact_check"),
+            explanation_ticket=payload.get("explanation_ticket"),
+        )
+
 
 class ApiService:
     def __init__(
@@ -35,23 +60,157 @@ class ApiService:
         classifier: Optional[ClassificationService] = None,
         explainer: Optional[ExplainabilityService] = None,
         fact_checker: Optional[FactChecker] = None,
+        cache: Optional[ResultCache] = None,
+        explanations: Optional[ExplanationQueue] = None,
     ) -> None:
         self.classifier = classifier or ClassificationService()
         self.explainer = explainer or ExplainabilityService()
         self.fact_checker = fact_checker or FactChecker()
+        if cache is None and settings.CACHE_ENABLED:
+            cache = get_result_cache()
+        self.cache = cache
+        self._explanations = explanations
+
+    @property
+    def explanations(self) -> ExplanationQueue:
+        if self._explanations is None:
+            self._explanations = get_explanation_queue()
+        return self._explanations
 
     def analyze(self, text: str) -> FullAnalysis:
-        pre = preprocess_text(text)
-        cls: ClassificationResult = self.classifier.classify(pre.text)
-        exp = self.explainer.explain(pre.text, cls.label)
+        with stage("preprocess"):
+            pre = preprocess_text(text)
+        key, cached = self._lookup(pre.text)
+        if cached is not None:
+            return self._attach_ticket(pre.text, cached)
+
+        analysis = self._run(pre.text)
+        self._store(key, analysis)
+        return analysis
+
+    async def aanalyze(self, text: str) -> FullAnalysis:
+        """Async variant of ``analyze``.
+
+        Model inference runs on the bounded inference pool while fact-check
+        I/O runs on the event loop, so both proceed concurrently.
+        """
+        with stage("preprocess"):
+            pre = preprocess_text(text)
+        key, cached = self._lookup(pre.text)
+        if cached is not None:
+            return self._attach_ticket(pre.text, cached)
+
+        analysis = await self._arun(pre.text)
+        self._store(key, analysis)
+        return analysis
+
+    def _lookup(self, text: str) -> Tuple[Optional[str], Optional[FullAnalysis]]:
+        """Return (cache key, cached analysis) for preprocessed ``text``."""
+        if self.cache is None:
+            return None, None
+        with stage("cache"):
+            key = make_cache_key(text, self._model_backends())
+            cached = self.cache.get(key)
+        return key, FullAnalysis.from_json(cached) if cached is not None else None
+
+    def _model_backends(self) -> Tuple[str, ...]:
+        """Backends of the models whose output a cached analysis contains."""
+        models = [getattr(self.classifier, "model", None)]
+        if settings.EXPLANATION_POLICY in ("always", "flagged"):
+            models.append(getattr(self.explainer, "model", None))
+        return tuple(getattr(model, "backend", "") for model in models)
+
+    def _store(self, key: Optional[str], analysis: FullAnalysis) -> None:
+        """Cache an analysis; deferred explanations are stored without a ticket.
+
+        Tickets are per-process and expire, so only the classification and
+        fact check are cached and ``_attach_ticket`` resolves the explanation
+        again on every hit.
+        """
+        if key is None:
+            return
+        payload = analysis.to_json()
+        if settings.EXPLANATION_POLICY == "deferred":
+            payload["explanation"] = ""
+            payload.pop("explanation_ticket", None)
+        self.cache.set(key, payload)
+
+    def _attach_ticket(self, text: str, cached: FullAnalysis) -> FullAnalysis:
+        """Give a cached deferred-policy result a live explanation ticket."""
+        if settings.EXPLANATION_POLICY != "deferred":
+            return cached
+        cached.explanation, cached.explanation_ticket = self._skip_or_defer(
+            text, cached.classification
+        )
+        return cached
+
+    async def _arun(self, text: str) -> FullAnalysis:
+        """Classify+explain and fact check one preprocessed text concurrently."""
+
+        async def classify_and_explain():
+            with stage("classify"):
+                cls: ClassificationResult = await run_inference(
+                    self.classifier.classify, text
+                )
+            with stage("explain"):
+                if self._should_generate(cls):
+                    exp = await run_inference(self.explainer.explain, text, cls.label)
+                    return cls, (exp.text, None)
+                return cls, self._skip_or_defer(text, cls)
+
+        async def fact_check():
+            with stage("fact_check"):
+                return await self.fact_checker.acheck(text)
 
         fc: Dict[str, Any] | None = None
         if settings.ENABLE_FACT_CHECK:
-            fr: FactCheckResult = self.fact_checker.check(pre.text)
+            (cls, exp), fr = await asyncio.gather(classify_and_explain(), fact_check())
+            fc = {"veracity": fr.veracity, "sources": fr.sources, "notes": fr.notes}
+        else:
+            cls, exp = await classify_and_explain()
+
+        return FullAnalysis(
+            classification=cls, explanation=exp[0], fact_check=fc, explanation_ticket=exp[1]
+        )
+
+    def _run(self, text: str) -> FullAnalysis:
+        """Run the full pipeline on preprocessed text, bypassing the cache."""
+        with stage("classify"):
+            cls: ClassificationResult = self.classifier.classify(text)
+        with stage("explain"):
+            if self._should_generate(cls):
+                exp_text, ticket = self.explainer.explain(text, cls.label).text, None
+            else:
+                exp_text, ticket = self._skip_or_defer(text, cls)
+
+        fc: Dict[str, Any] | None = None
+        if settings.ENABLE_FACT_CHECK:
+            with stage("fact_check"):
+                fr: FactCheckResult = self.fact_checker.check(text)
             fc = {
                 "veracity": fr.veracity,
                 "sources": fr.sources,
                 "notes": fr.notes,
             }
 
-        return FullAnalysis(classification=cls, explanation=exp.text, fact_check=fc)
+        return FullAnalysis(
+            classification=cls, explanation=exp_text, fact_check=fc, explanation_ticket=ticket
+        )
+
+    @staticmethod
+    def _should_generate(cls: ClassificationResult) -> bool:
+        """Whether EXPLANATION_POLICY asks for an inline explanation."""
+        policy = settings.EXPLANATION_POLICY
+        return policy == "always" or (policy == "flagged" and cls.flagged)
+
+    def _skip_or_defer(
+        self, text: str, cls: ClassificationResult
+    ) -> Tuple[str, Optional[str]]:
+        """Return (explanation, ticket) when no inline explanation is generated."""
+        if settings.EXPLANATION_POLICY != "deferred":
+            return NOT_FLAGGED_EXPLANATION, None
+        try:
+            return "", self.explanations.submit(text, cls.label)
+        except queue.Full:
+            logger.warning("Explanation queue full; returning without a ticket")
+            return QUEUE_FULL_EXPLANATION, None
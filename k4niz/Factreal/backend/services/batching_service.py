@@ -0,0 +1,118 @@
+"""Micro-batching scheduler for the BiasModel.
+
+Concurrent requests submit their texts to a shared queue. A background thread
+collects up to ``max_batch_size`` texts, waiting at most ``max_wait_ms`` after
+the first one arrives, and sends them through ``BiasModel.predict_batch`` in a
+single pipeline call. Each caller receives its own ``BiasPrediction`` through a
+``Future``.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from ..models.bias_model import BiasModel, BiasPrediction
+from ..utils.config import settings
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_Item = Tuple[str, "Future[BiasPrediction]"]
+
+
+class BatchScheduler:
+    """Groups concurrent predict calls into small batches."""
+
+    def __init__(
+        self,
+        model: BiasModel,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ) -> None:
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size or settings.BATCH_MAX_SIZE)
+        wait_ms = settings.BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        self.max_wait = max(0.0, wait_ms) / 1000.0
+        self._queue: "queue.Queue[_Item | None]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self._closed = False
+
+    def submit(self, text: str) -> "Future[BiasPrediction]":
+        """Queue a text for classification and return a future for its result."""
+        fut: "Future[BiasPrediction]" = Future()
+        # Under the lock close() takes, so no item can land behind its sentinel
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchScheduler is closed")
+            self._start_worker()
+            self._queue.put((text, fut))
+        return fut
+
+    def predict(self, text: str) -> BiasPrediction:
+        """Blocking helper with the same signature as ``BiasModel.predict``."""
+        return self.submit(text).result()
+
+    def close(self) -> None:
+        """Stop the worker after it drains the items already queued."""
+        with self._lock:
+            self._closed = True
+            worker, self._worker = self._worker, None
+            if worker is not None:
+                self._queue.put(None)
+        if worker is not None:
+            worker.join()
+
+    def _start_worker(self) -> None:
+        """Start the background thread on first use (caller holds ``_lock``)."""
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run, name="bias-batcher", daemon=True
+            )
+            self._worker.start()
+
+    def _collect(self, first: _Item) -> Tuple[List[_Item], bool]:
+        """Gather a batch starting with ``first``; report whether to stop."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        """Worker loop: collect, predict, and resolve futures."""
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stop = self._collect(first)
+            texts = [text for text, _ in batch]
+            try:
+                preds = list(self.model.predict_batch(texts))
+                if len(preds) != len(batch):
+                    raise RuntimeError(
+                        f"predict_batch returned {len(preds)} predictions "
+                        f"for {len(batch)} texts"
+                    )
+            except Exception as e:  # noqa: BLE001 surface errors to callers
+                logger.error("Batch prediction failed: %s", str(e))
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            for (_, fut), pred in zip(batch, preds):
+                fut.set_result(pred)
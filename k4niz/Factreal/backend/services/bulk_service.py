@@ -0,0 +1,158 @@
+"""Streaming bulk classification.
+
+Parses a request body that is either a JSON array or NDJSON, incrementally and
+without holding more than one record (plus one model chunk) in memory. Records
+are classified in chunks of ``BULK_CHUNK_SIZE`` through
+``ClassificationService.classify_batch`` and each result is emitted as one
+NDJSON line as soon as its chunk completes.
+
+Each record is ``{"text": "...", "id": <optional, echoed back>}`` or a bare
+string. Output lines carry the record ``index`` and either the classification
+fields or an ``error`` message.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Tuple
+
+from .classification_service import ClassificationService
+from .preprocessing_service import preprocess_text
+from ..utils.config import settings
+from ..utils.executor import run_inference
+
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+
+class BulkInputError(ValueError):
+    """Raised when the request body is not a JSON array or NDJSON."""
+
+
+async def iter_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """Yield decoded records from a JSON array or NDJSON byte stream."""
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    it = chunks.__aiter__()
+    buf = ""
+    eof = False
+
+    async def fill() -> None:
+        """Append the next body chunk to ``buf`` (sets ``eof`` at the end)."""
+        nonlocal buf, eof
+        if len(buf) > settings.BULK_MAX_RECORD_BYTES:
+            raise BulkInputError(
+                f"Record exceeds {settings.BULK_MAX_RECORD_BYTES} bytes"
+            )
+        try:
+            chunk = await it.__anext__()
+        except StopAsyncIteration:
+            buf += utf8.decode(b"", final=True)
+            eof = True
+            return
+        buf += utf8.decode(chunk)
+
+    while not buf.strip(_WHITESPACE) and not eof:
+        await fill()
+    buf = buf.lstrip(_WHITESPACE)
+    if not buf:
+        return
+
+    if buf[0] != "[":
+        # NDJSON: one record per line
+        while True:
+            nl = buf.find("\n")
+            if nl < 0:
+                if not eof:
+                    await fill()
+                    continue
+                line, buf = buf, ""
+            else:
+                line, buf = buf[:nl], buf[nl + 1 :]
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise BulkInputError(f"Invalid NDJSON line: {e}") from e
+            if eof and not buf:
+                return
+
+    # JSON array: decode one element at a time
+    buf = buf[1:]
+    while True:
+        buf = buf.lstrip(_WHITESPACE + ",")
+        if buf.startswith("]"):
+            return
+        if buf:
+            try:
+                record, end = _decoder.raw_decode(buf)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise BulkInputError(f"Invalid JSON array: {e}") from e
+            else:
+                buf = buf[end:]
+                yield record
+                continue
+        if eof:
+            raise BulkInputError("Unterminated JSON array")
+        await fill()
+
+
+def _record_text(record: Any) -> Tuple[str, Any]:
+    """Return (text, id) for one input record."""
+    if isinstance(record, str):
+        return record, None
+    if isinstance(record, dict) and isinstance(record.get("text"), str):
+        return record["text"], record.get("id")
+    raise BulkInputError("Each record must be a string or an object with 'text'")
+
+
+async def classify_stream(
+    classifier: ClassificationService,
+    chunks: AsyncIterable[bytes],
+    chunk_size: int | None = None,
+) -> AsyncIterator[bytes]:
+    """Classify a streamed body and yield NDJSON result lines."""
+    size = max(1, chunk_size or settings.BULK_CHUNK_SIZE)
+    pending: List[Tuple[int, Any, str]] = []
+    index = 0
+
+    async def flush() -> AsyncIterator[bytes]:
+        texts = [text for _, _, text in pending]
+        results = await run_inference(classifier.classify_batch, texts)
+        for (i, rid, _), res in zip(pending, results):
+            line: Dict[str, Any] = {"index": i, "id": rid}
+            line.update(
+                label=res.label,
+                confidence=res.confidence,
+                scores=res.scores,
+                flagged=res.flagged,
+            )
+            yield _dump(line)
+        pending.clear()
+
+    try:
+        async for record in iter_records(chunks):
+            try:
+                text, rid = _record_text(record)
+            except BulkInputError as e:
+                yield _dump({"index": index, "error": str(e)})
+            else:
+                pending.append((index, rid, preprocess_text(text).text))
+            index += 1
+            if len(pending) >= size:
+                async for line in flush():
+                    yield line
+    except BulkInputError as e:
+        if pending:
+            async for line in flush():
+                yield line
+        yield _dump({"index": index, "error": str(e), "fatal": True})
+        return
+
+    if pending:
+        async for line in flush():
+            yield line
+
+
+def _dump(obj: Dict[str, Any]) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
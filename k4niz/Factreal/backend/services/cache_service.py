@@ -0,0 +1,184 @@
+"""Content-addressed cache for full analysis results.
+
+Keys are a SHA-256 digest of the preprocessed text together with every setting
+that changes the output (model names, bias mode, inference backend, forced
+heuristic, threshold, chunking, fact-check toggle, explanation policy) and the
+backends the models actually loaded with, so neither a configuration change nor
+a heuristic fallback after a failed model load serves or stores results under
+another setup's key. Entries live in an in-memory LRU tier and, when
+``CACHE_DB_PATH`` is set, in a SQLite tier that survives restarts. Both tiers
+honour ``CACHE_TTL_SECONDS``. Payloads are copied in and out, so callers may
+mutate what they get.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from ..utils.config import settings
+from ..utils.logger import get_logger
+from ..utils.metrics import CACHE_LOOKUPS
+
+logger = get_logger(__name__)
+
+
+def make_cache_key(normalized_text: str, backends: Sequence[str] = ()) -> str:
+    """Return the cache key for a preprocessed text under current settings.
+
+    ``backends`` are the backends the producing models actually loaded with
+    (e.g. ``"heuristic"`` after a failed load), not just the requested one.
+    """
+    material = json.dumps(
+        [
+            normalized_text,
+            settings.MODEL_BIAS,
+            settings.BIAS_MODE,
+            settings.MODEL_EMBEDDING,
+            settings.MODEL_REASONING,
+            settings.INFERENCE_BACKEND,
+            settings.FORCE_HEURISTIC,
+            list(backends),
+            settings.THRESHOLD_BIAS,
+            settings.CHUNK_MAX_TOKENS,
+            settings.CHUNK_OVERLAP_TOKENS,
+            settings.CHUNK_AGGREGATION,
+            settings.ENABLE_FACT_CHECK,
+            settings.EXPLANATION_POLICY,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Two-tier (memory LRU + optional SQLite) cache of JSON payloads."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        db_path: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        self.max_entries = max(1, max_entries or settings.CACHE_MAX_ENTRIES)
+        self.ttl = settings.CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.db_path = db_path if db_path is not None else settings.CACHE_DB_PATH
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.db_path:
+            self._open_db()
+
+    def _open_db(self) -> None:
+        """Open (and create if needed) the SQLite tier."""
+        try:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Disk cache unavailable, using memory only: %s", str(e))
+            self._db = None
+
+    def _expiry(self) -> float:
+        """Absolute expiry timestamp for an entry stored now."""
+        return time.time() + self.ttl if self.ttl > 0 else float("inf")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for ``key`` or None on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    CACHE_LOOKUPS.inc(result="hit")
+                    return copy.deepcopy(entry[1])
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT payload, expires_at FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    payload = json.loads(row[0])
+                    self._remember(key, row[1], copy.deepcopy(payload))
+                    self.hits += 1
+                    self.disk_hits += 1
+                    CACHE_LOOKUPS.inc(result="disk_hit")
+                    return payload
+                if row is not None:
+                    self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            CACHE_LOOKUPS.inc(result="miss")
+            return None
+
+    def set(self, key: str, payload: Dict[str, Any]) -> None:
+        """Store ``payload`` in every configured tier."""
+        expires_at = self._expiry()
+        with self._lock:
+            self._remember(key, expires_at, copy.deepcopy(payload))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, payload, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, json.dumps(payload, ensure_ascii=False), expires_at),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, expires_at: float, payload: Dict[str, Any]) -> None:
+        """Insert into the memory tier, evicting the least recently used entry."""
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_enabled": self._db is not None,
+                "ttl_seconds": self.ttl,
+            }
+
+
+_default_cache: ResultCache | None = None
+_default_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide cache shared by every ApiService."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
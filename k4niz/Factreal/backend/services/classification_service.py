@@ -1,13 +1,19 @@
 """Classification service that wraps the BiasModel.
 
 Responsible for applying thresholds, shaping the response, and logging.
+Long texts are split into overlapping token windows (see ``chunk_text``); all
+windows go through the model as one batch and their scores are combined with
+``aggregate_predictions`` using ``CHUNK_AGGREGATION``.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 
 from ..models.bias_model import BiasModel, BiasPrediction
+from ..models.registry import registry
+from .batching_service import BatchScheduler
+from .preprocessing_service import TextChunk, chunk_text
 from ..utils.config import settings
 
 
@@ -17,15 +23,123 @@ class ClassificationResult:
     confidence: float
     scores: Dict[str, float]
     flagged: bool
+    chunks: int = 1
+
+
+def aggregate_predictions(
+    preds: Sequence[BiasPrediction],
+    weights: Optional[Sequence[float]] = None,
+    strategy: Optional[str] = None,
+) -> BiasPrediction:
+    """Combine per-window predictions into one document-level prediction.
+
+    - ``max``: the document takes the scores of its most biased window (the
+      highest non-neutral score), so one strongly biased passage flags the
+      whole document however calm the rest of it is.
+    - ``mean``: plain average of the window scores.
+    - ``weighted``: average weighted by ``weights`` (window token counts).
+
+    Labels missing from a window's details count as 0 for that window.
+    """
+    if len(preds) == 1:
+        return preds[0]
+    strategy = strategy or settings.CHUNK_AGGREGATION
+    if strategy == "max":
+        worst = max(
+            preds,
+            key=lambda p: max(
+                (s for lbl, s in p.details.items() if lbl != "neutral"), default=0.0
+            ),
+        )
+        scores = dict(worst.details)
+    else:
+        labels = list(dict.fromkeys(lbl for p in preds for lbl in p.details))
+        if strategy == "weighted" and weights is not None:
+            w = [float(x) for x in weights]
+        else:
+            w = [1.0] * len(preds)
+        total = sum(w) or 1.0
+        scores = {
+            lbl: sum(wi * p.details.get(lbl, 0.0) for wi, p in zip(w, preds)) / total
+            for lbl in labels
+        }
+    ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    return BiasPrediction(label=ranked[0][0], score=ranked[0][1], details=dict(ranked))
 
 
 class ClassificationService:
-    def __init__(self, model: Optional[BiasModel] = None) -> None:
-        self.model = model or BiasModel()
+    def __init__(
+        self,
+        model: Optional[BiasModel] = None,
+        scheduler: Optional[BatchScheduler] = None,
+    ) -> None:
+        # Models resolve lazily so that constructing services is cheap and the
+        # shared registry instance is loaded only on first use.
+        self._model = model
+        self._scheduler = scheduler
+
+    @property
+    def model(self) -> BiasModel:
+        if self._model is None:
+            self._model = registry.bias_model()
+        return self._model
+
+    @property
+    def scheduler(self) -> Optional[BatchScheduler]:
+        if self._scheduler is None and settings.ENABLE_BATCHING:
+            if self._model is None:
+                self._scheduler = registry.bias_scheduler()
+            else:
+                self._scheduler = BatchScheduler(self._model)
+        return self._scheduler
+
+    def _chunk(self, text: str) -> List[TextChunk]:
+        return chunk_text(text, tokenizer=self.model.tokenizer)
 
     def classify(self, text: str) -> ClassificationResult:
-        pred: BiasPrediction = self.model.predict(text)
+        chunks = self._chunk(text)
+        windows = [c.text for c in chunks]
+        scheduler = self.scheduler
+        if scheduler is not None:
+            # Windows join the shared queue, batching with concurrent requests
+            futures = [scheduler.submit(w) for w in windows]
+            preds: List[BiasPrediction] = [f.result() for f in futures]
+        elif len(windows) == 1:
+            preds = [self.model.predict(text)]
+        else:
+            preds = self.model.predict_batch(windows)
+        return self._to_result(
+            aggregate_predictions(preds, [c.tokens for c in chunks]), len(chunks)
+        )
+
+    def classify_batch(self, texts: List[str]) -> List[ClassificationResult]:
+        """Classify several texts with one model call, preserving order.
+
+        The windows of all texts are flattened into that single call.
+        """
+        per_text = [self._chunk(t) for t in texts]
+        flat = [c.text for chunks in per_text for c in chunks]
+        preds = self.model.predict_batch(flat)
+        results: List[ClassificationResult] = []
+        pos = 0
+        for chunks in per_text:
+            window_preds = preds[pos:pos + len(chunks)]
+            pos += len(chunks)
+            results.append(
+                self._to_result(
+                    aggregate_predictions(window_preds, [c.tokens for c in chunks]),
+                    len(chunks),
+                )
+            )
+        return results
+
+    @staticmethod
+    def _to_result(pred: BiasPrediction, chunks: int = 1) -> ClassificationResult:
         flagged = pred.score >= settings.THRESHOLD_BIAS and pred.label != "neutral"
         return ClassificationResult(
-            label=pred.label, confidence=pred.score, scores=pred.details, flagged=flagged
+            label=pred.label,
+            confidence=pred.score,
+            scores=pred.details,
+            flagged=flagged,
+            chunks=chunks,
         )
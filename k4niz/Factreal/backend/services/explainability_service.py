@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 from ..models.reasoning_model import ReasoningModel, ReasoningResult
+from ..models.registry import registry
 
 
 @dataclass
@@ -14,7 +15,14 @@ class Explanation:
 
 class ExplainabilityService:
     def __init__(self, model: Optional[ReasoningModel] = None) -> None:
-        self.model = model or ReasoningModel()
+        self._model = model
+
+    @property
+    def model(self) -> ReasoningModel:
+        # Resolved lazily from the shared registry on first use
+        if self._model is None:
+            self._model = registry.reasoning_model()
+        return self._model
 
     def explain(self, text: str, label: str) -> Explanation:
         res: ReasoningResult = self.model.explain(text, label)
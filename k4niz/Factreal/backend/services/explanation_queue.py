@@ -0,0 +1,150 @@
+"""Background queue for deferred explanation generation.
+
+With ``EXPLANATION_POLICY=deferred`` the classify response returns a ticket
+instead of waiting for FLAN-T5. Worker threads generate the explanation and the
+client fetches it later from ``GET /explain/{ticket}``. Finished tickets are
+kept for ``EXPLANATION_TICKET_TTL_SECONDS`` and at most
+``EXPLANATION_MAX_TICKETS`` are retained. Submitting the same text and label
+again while its ticket is pending or done returns that ticket instead of
+queueing a second job, so cached classify results can hand out a ticket on
+every hit without regenerating the explanation. A reissued ticket gets a fresh
+TTL, so a client is never handed a ticket that is about to expire.
+"""
+from __future__ import annotations
+
+import hashlib
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .explainability_service import ExplainabilityService
+from ..utils.config import settings
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ExplanationTicket:
+    ticket: str
+    status: str  # "pending", "done" or "failed"
+    explanation: Optional[str] = None
+    created_at: float = 0.0
+    job_key: Optional[str] = None
+
+
+class ExplanationQueue:
+    """Bounded job queue with a small pool of explanation workers."""
+
+    def __init__(
+        self,
+        explainer: Optional[ExplainabilityService] = None,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        self.explainer = explainer or ExplainabilityService()
+        self.workers = max(1, workers or settings.EXPLANATION_WORKERS)
+        self._jobs: "queue.Queue[tuple[str, str, str]]" = queue.Queue(
+            maxsize=max_pending or settings.EXPLANATION_QUEUE_SIZE
+        )
+        self._tickets: "OrderedDict[str, ExplanationTicket]" = OrderedDict()
+        self._by_job: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def submit(self, text: str, label: str) -> str:
+        """Queue an explanation job and return its ticket id.
+
+        Reuses the live ticket of an identical job unless it failed.
+        Raises ``queue.Full`` when the backlog is at capacity.
+        """
+        self._ensure_workers()
+        job_key = hashlib.sha256(f"{label}\0{text}".encode("utf-8")).hexdigest()
+        ticket = uuid.uuid4().hex
+        with self._lock:
+            self._prune()
+            existing = self._tickets.get(self._by_job.get(job_key, ""))
+            if existing is not None and existing.status != "failed":
+                existing.created_at = time.time()
+                self._tickets.move_to_end(existing.ticket)  # keep oldest-first order
+                return existing.ticket
+            self._tickets[ticket] = ExplanationTicket(
+                ticket=ticket, status="pending", created_at=time.time(), job_key=job_key
+            )
+            self._by_job[job_key] = ticket
+        try:
+            self._jobs.put_nowait((ticket, text, label))
+        except queue.Full:
+            with self._lock:
+                self._forget(ticket)
+            raise
+        return ticket
+
+    def get(self, ticket: str) -> Optional[ExplanationTicket]:
+        """Return the ticket state, or None if unknown or expired."""
+        with self._lock:
+            self._prune()
+            return self._tickets.get(ticket)
+
+    def pending(self) -> int:
+        return self._jobs.qsize()
+
+    def _prune(self) -> None:
+        """Drop expired tickets and keep the table within its size limit."""
+        cutoff = time.time() - settings.EXPLANATION_TICKET_TTL_SECONDS
+        while self._tickets:
+            oldest = next(iter(self._tickets.values()))
+            too_many = len(self._tickets) >= settings.EXPLANATION_MAX_TICKETS
+            if oldest.created_at >= cutoff and not too_many:
+                break
+            self._forget(oldest.ticket)
+
+    def _forget(self, ticket: str) -> None:
+        """Drop a ticket and its job index entry."""
+        entry = self._tickets.pop(ticket, None)
+        if entry is not None and self._by_job.get(entry.job_key) == ticket:
+            del self._by_job[entry.job_key]
+
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(
+                    target=self._run, name=f"explainer-{i}", daemon=True
+                )
+                t.start()
+                self._threads.append(t)
+
+    def _run(self) -> None:
+        """Worker loop: generate explanations and record them on the ticket."""
+        while True:
+            ticket, text, label = self._jobs.get()
+            try:
+                explanation: Optional[str] = self.explainer.explain(text, label).text
+                status = "done"
+            except Exception as e:  # noqa: BLE001 keep the worker alive
+                logger.error("Deferred explanation failed: %s", str(e))
+                explanation, status = None, "failed"
+            with self._lock:
+                entry = self._tickets.get(ticket)
+                if entry is not None:
+                    entry.status = status
+                    entry.explanation = explanation
+
+
+_default_queue: ExplanationQueue | None = None
+_default_lock = threading.Lock()
+
+
+def get_explanation_queue() -> ExplanationQueue:
+    """Return the process-wide explanation queue."""
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = ExplanationQueue()
+        return _default_queue
@@ -2,10 +2,18 @@
 
 Keeps preprocessing minimal and transparent. Contributors can add more advanced
 normalization, token cleaning, or language detection here.
+
+``chunk_text`` splits long documents into overlapping windows of at most
+``CHUNK_MAX_TOKENS`` tokens so the classifier sees the whole text instead of
+silently truncating it at the model's maximum length.
 """
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from ..utils.config import settings
 
 
 @dataclass
@@ -20,3 +28,55 @@ def preprocess_text(text: str) -> PreprocessResult:
     """
     cleaned = " ".join(text.split())
     return PreprocessResult(text=cleaned)
+
+
+@dataclass
+class TextChunk:
+    text: str
+    start: int  # index of the first token of the window
+    tokens: int
+
+
+def _token_spans(text: str, tokenizer: Any = None) -> List[Tuple[int, int]]:
+    """Character spans of the tokens of ``text``.
+
+    Uses the model tokenizer's offset mapping when available (fast tokenizers)
+    and falls back to whitespace-separated words otherwise.
+    """
+    if tokenizer is not None:
+        try:
+            enc = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+            return [tuple(span) for span in enc["offset_mapping"]]
+        except Exception:  # noqa: BLE001 slow tokenizers have no offsets
+            pass
+    return [m.span() for m in re.finditer(r"\S+", text)]
+
+
+def chunk_text(
+    text: str,
+    tokenizer: Any = None,
+    max_tokens: Optional[int] = None,
+    overlap: Optional[int] = None,
+) -> List[TextChunk]:
+    """Split ``text`` into token-bounded windows overlapping by ``overlap`` tokens.
+
+    Texts that fit in one window are returned unchanged as a single chunk.
+    Windows are cut at token boundaries of the original string, so the cost is
+    one tokenization plus a number of windows linear in the text length.
+    """
+    max_tokens = max(1, max_tokens or settings.CHUNK_MAX_TOKENS)
+    overlap = settings.CHUNK_OVERLAP_TOKENS if overlap is None else overlap
+    stride = max(1, max_tokens - max(0, overlap))
+
+    spans = _token_spans(text, tokenizer)
+    if len(spans) <= max_tokens:
+        return [TextChunk(text=text, start=0, tokens=len(spans))]
+
+    chunks: List[TextChunk] = []
+    for start in range(0, len(spans), stride):
+        end = min(start + max_tokens, len(spans))
+        window = text[spans[start][0]:spans[end - 1][1]]
+        chunks.append(TextChunk(text=window, start=start, tokens=end - start))
+        if end == len(spans):
+            break
+    return chunks
@@ -4,6 +4,8 @@ This centralizes environment-based settings for model names,
 thresholds, and optional feature toggles. Safe defaults are provided
 to keep the app usable even without external configuration.
 """
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -19,6 +21,46 @@ class Settings(BaseSettings):
         description="Text-to-text model for explanation generation.",
     )
 
+    MODEL_EMBEDDING: str = Field(
+        default="sentence-transformers/all-MiniLM-L6-v2",
+        description="Sentence encoder used when BIAS_MODE=embedding.",
+    )
+    BIAS_MODE: Literal["nli", "embedding"] = Field(
+        default="nli",
+        description=(
+            "nli: zero-shot NLI (one pass per label); embedding: cached label "
+            "hypothesis embeddings and one encoder pass per text."
+        ),
+    )
+
+    FORCE_HEURISTIC: bool = Field(
+        default=False,
+        description="Skip transformer loading and use the heuristic fallbacks.",
+    )
+
+    # Inference runtime: pytorch | pytorch-int8 | onnx | onnx-int8
+    INFERENCE_BACKEND: Literal["pytorch", "pytorch-int8", "onnx", "onnx-int8"] = Field(
+        default="pytorch", description="Runtime used for the transformer models."
+    )
+    ONNX_CACHE_DIR: str = Field(
+        default=".onnx_cache", description="Where ONNX exports are stored and reused."
+    )
+
+    # Long-document chunking
+    CHUNK_MAX_TOKENS: int = Field(
+        default=384, description="Largest window, in tokens, sent to the classifier."
+    )
+    CHUNK_OVERLAP_TOKENS: int = Field(
+        default=64, description="Tokens shared by consecutive windows."
+    )
+    CHUNK_AGGREGATION: Literal["max", "mean", "weighted"] = Field(
+        default="max",
+        description=(
+            "How window scores combine into one result: the most biased window, mean, "
+            "or mean weighted by window length."
+        ),
+    )
+
     # Thresholds
     THRESHOLD_BIAS: float = Field(
         default=0.55, description="Confidence threshold to mark text as flagged."
@@ -29,8 +71,128 @@ class Settings(BaseSettings):
         default=False, description="Enable optional external fact checking."
     )
 
+    # Explanation policy
+    EXPLANATION_POLICY: Literal["always", "flagged", "deferred"] = Field(
+        default="always",
+        description=(
+            "always: explain every text inline; flagged: only flagged texts; "
+            "deferred: return a ticket and explain in the background."
+        ),
+    )
+    EXPLANATION_WORKERS: int = Field(
+        default=1, description="Background workers for deferred explanations."
+    )
+    EXPLANATION_QUEUE_SIZE: int = Field(
+        default=1000, description="Maximum pending deferred explanation jobs."
+    )
+    EXPLANATION_MAX_TICKETS: int = Field(
+        default=10000, description="Maximum explanation tickets retained."
+    )
+    EXPLANATION_TICKET_TTL_SECONDS: float = Field(
+        default=3600.0, description="How long finished tickets can be fetched."
+    )
+
+    # Model loading
+    PRELOAD_MODELS: bool = Field(
+        default=False,
+        description="Load every model at startup instead of on first request.",
+    )
+
+    # Shared model server (multi-process serving)
+    MODEL_SERVER_ADDRESS: str | None = Field(
+        default=None,
+        description="UNIX socket or host:port of a model server; workers load no models.",
+    )
+    MODEL_SERVER_AUTHKEY: str | None = Field(
+        default=None,
+        description=(
+            "Shared secret for model server connections; required, there is no "
+            "default because the server unpickles what clients send."
+        ),
+    )
+
+    # Micro-batching of concurrent classification requests
+    ENABLE_BATCHING: bool = Field(
+        default=False,
+        description="Group concurrent /classify calls into one pipeline call.",
+    )
+    BATCH_MAX_SIZE: int = Field(
+        default=8, description="Maximum number of texts per inference batch."
+    )
+    BATCH_MAX_WAIT_MS: float = Field(
+        default=10.0,
+        description="Maximum time to wait for a batch to fill, in milliseconds.",
+    )
+
+    # Bulk classification (/classify/batch)
+    BULK_CHUNK_SIZE: int = Field(
+        default=32, description="Texts per model call in the bulk endpoint."
+    )
+    BULK_MAX_RECORD_BYTES: int = Field(
+        default=1_048_576, description="Largest single record accepted in bulk input."
+    )
+
+    # Request execution
+    ASYNC_MODE: bool = Field(
+        default=True,
+        description="Serve requests on the event loop, offloading inference to a pool.",
+    )
+    INFERENCE_WORKERS: int = Field(
+        default=4, description="Size of the bounded model inference thread pool."
+    )
+
+    # Observability
+    TRACE_SAMPLE_RATE: float = Field(
+        default=0.0, description="Fraction of requests whose stage timings are logged."
+    )
+    TRACE_SLOW_MS: float = Field(
+        default=0.0,
+        description="Always log stage timings of requests slower than this (0 = off).",
+    )
+
+    # Result cache
+    CACHE_ENABLED: bool = Field(
+        default=True, description="Cache full analysis results by content hash."
+    )
+    CACHE_MAX_ENTRIES: int = Field(
+        default=1024, description="Maximum entries in the in-memory LRU tier."
+    )
+    CACHE_TTL_SECONDS: float = Field(
+        default=86400.0, description="Entry lifetime in seconds (0 disables expiry)."
+    )
+    CACHE_DB_PATH: str | None = Field(
+        default=None, description="SQLite file for the optional on-disk cache tier."
+    )
+
     # External APIs
     NEWS_API_KEY: str | None = Field(default=None, description="NewsAPI key.")
+    NEWS_API_URL: str = Field(
+        default="https://newsapi.org/v2/everything", description="NewsAPI search endpoint."
+    )
+    WIKIPEDIA_API_URL: str = Field(
+        default="https://en.wikipedia.org/w/api.php", description="MediaWiki API endpoint."
+    )
+
+    # Fact checking
+    FACT_CHECK_SOURCES: str = Field(
+        default="newsapi,wikipedia",
+        description="Comma-separated sources queried concurrently.",
+    )
+    FACT_CHECK_TIMEOUT_SECONDS: float = Field(
+        default=6.0, description="Overall deadline for one fact check."
+    )
+    FACT_CHECK_CACHE_TTL_SECONDS: float = Field(
+        default=3600.0, description="Lifetime of cached per-query source results."
+    )
+    FACT_CHECK_CACHE_MAX_ENTRIES: int = Field(
+        default=2048, description="Maximum cached per-query source results."
+    )
+    FACT_CHECK_BREAKER_THRESHOLD: int = Field(
+        default=5, description="Consecutive failures before a source is skipped (0 = off)."
+    )
+    FACT_CHECK_BREAKER_COOLDOWN_SECONDS: float = Field(
+        default=30.0, description="How long a tripped source is skipped before a retry."
+    )
 
     # Pydantic v2 settings configuration
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
@@ -0,0 +1,53 @@
+"""Bounded worker pool for blocking model inference.
+
+Transformer pipelines are synchronous and CPU-heavy. Async request handlers
+offload them to this pool so the event loop keeps serving other requests, and
+the pool size caps how many inferences run at once.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from .config import settings
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def get_inference_executor() -> ThreadPoolExecutor:
+    """Return the process-wide inference pool, creating it on first use."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.INFERENCE_WORKERS),
+                thread_name_prefix="inference",
+            )
+        return _executor
+
+
+async def run_inference(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the inference pool and await its result.
+
+    The caller's context variables (e.g. the request trace) are propagated.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    return await loop.run_in_executor(get_inference_executor(), call)
+
+
+def shutdown_inference_executor() -> None:
+    """Stop the pool; a later call to get_inference_executor() recreates it."""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
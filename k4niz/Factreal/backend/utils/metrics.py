@@ -0,0 +1,215 @@
+"""Minimal Prometheus metrics for FactReal.
+
+A small, dependency-free implementation of counters, gauges and histograms that
+renders the Prometheus text exposition format served at ``GET /metrics``.
+Instrumented code imports the module-level metrics below and calls
+``observe``/``inc`` with label values as keyword arguments.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+_LabelKey = Tuple[str, ...]
+M = TypeVar("M", bound="_Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> _LabelKey:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _labels(self, key: _LabelKey, extra: Iterable[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    def render(self) -> List[str]:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[_LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{self._labels(k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Gauge whose value is read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._fn: Callable[[], float] | None = None
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._fn = fn
+
+    def render(self) -> List[str]:
+        if self._fn is None:
+            return []
+        return self.header() + [f"{self.name} {_fmt(self._fn())}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # per label set: [bucket counts..., sum, count]
+        self._values: Dict[_LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def count(self, **labels: str) -> float:
+        row = self._values.get(self._key(labels))
+        return row[-1] if row else 0.0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = self.header()
+        for key, row in items:
+            for bound, n in zip(self.buckets, row):
+                le = self._labels(key, [("le", _fmt(bound))])
+                lines.append(f"{self.name}_bucket{le} {_fmt(n)}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_fmt(row[-2])}")
+            lines.append(f"{self.name}_count{self._labels(key)} {_fmt(row[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+REQUEST_DURATION = metrics_registry.register(
+    Histogram(
+        "factreal_http_request_duration_seconds",
+        "HTTP request latency by route template and status.",
+        ("method", "route", "status"),
+    )
+)
+STAGE_DURATION = metrics_registry.register(
+    Histogram(
+        "factreal_stage_duration_seconds",
+        "Time spent in each analysis stage.",
+        ("stage",),
+    )
+)
+INFERENCE_BATCH_SIZE = metrics_registry.register(
+    Histogram(
+        "factreal_inference_batch_size",
+        "Number of texts per model pipeline call.",
+        ("model",),
+        buckets=SIZE_BUCKETS,
+    )
+)
+CACHE_LOOKUPS = metrics_registry.register(
+    Counter(
+        "factreal_cache_lookups_total",
+        "Result cache lookups by outcome (hit, disk_hit, miss).",
+        ("result",),
+    )
+)
+CACHE_HIT_RATIO = metrics_registry.register(
+    Gauge("factreal_cache_hit_ratio", "Result cache hits / lookups since start.")
+)
+FACT_CHECK_DURATION = metrics_registry.register(
+    Histogram(
+        "factreal_fact_check_request_duration_seconds",
+        "Outbound fact-check HTTP latency by source and outcome.",
+        ("source", "outcome"),
+    )
+)
+
+
+def _cache_hit_ratio() -> float:
+    hits = CACHE_LOOKUPS.value(result="hit") + CACHE_LOOKUPS.value(result="disk_hit")
+    total = hits + CACHE_LOOKUPS.value(result="miss")
+    return hits / total if total else 0.0
+
+
+CACHE_HIT_RATIO.set_function(_cache_hit_ratio)
+
+
+def render_metrics() -> str:
+    """Current metrics in Prometheus text format."""
+    return metrics_registry.render()
@@ -0,0 +1,145 @@
+"""Per-request stage timings.
+
+``ServerTimingMiddleware`` opens a trace for every HTTP request. Code inside the
+request wraps its phases in ``with stage("classify"):`` and the durations are
+collected into that trace, then returned to the client in a standard
+``Server-Timing`` header (e.g. ``classify;dur=12.3, explain;dur=80.1``), which
+browsers' dev tools and the benchmark harness both understand.
+
+Every stage is also observed in the ``factreal_stage_duration_seconds``
+histogram, and the middleware records per-route request latency. With
+``TRACE_SAMPLE_RATE`` > 0 (or for requests slower than ``TRACE_SLOW_MS``) the
+full stage breakdown of a request is logged, slowest stage first.
+"""
+from __future__ import annotations
+
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .logger import get_logger
+from .metrics import REQUEST_DURATION, STAGE_DURATION
+
+logger = get_logger(__name__)
+
+_trace: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "factreal_trace", default=None
+)
+
+
+def start_trace() -> Dict[str, float]:
+    """Begin collecting stage timings in the current context."""
+    timings: Dict[str, float] = {}
+    _trace.set(timings)
+    return timings
+
+
+def current_trace() -> Optional[Dict[str, float]]:
+    """Timings collected so far for the active request, if any."""
+    return _trace.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block, record it in metrics and the active trace."""
+    timings = _trace.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_DURATION.observe(elapsed, stage=name)
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    """Render timings as a ``Server-Timing`` header value (milliseconds)."""
+    return ", ".join(f"{name};dur={secs * 1000:.3f}" for name, secs in timings.items())
+
+
+def parse_server_timing(value: str) -> Dict[str, float]:
+    """Parse a ``Server-Timing`` header back into {stage: milliseconds}."""
+    out: Dict[str, float] = {}
+    for part in value.split(","):
+        name, _, params = part.strip().partition(";")
+        for param in params.split(";"):
+            key, _, val = param.strip().partition("=")
+            if name and key == "dur":
+                try:
+                    out[name] = float(val)
+                except ValueError:
+                    pass
+    return out
+
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware adding a ``Server-Timing`` header to responses.
+
+    Implemented without ``BaseHTTPMiddleware`` so streaming endpoints keep
+    direct access to the request body.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_trace()
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timings["total"] = time.perf_counter() - start
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (b"server-timing", format_server_timing(timings).encode("latin-1"))
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_DURATION.observe(
+                elapsed, method=scope["method"], route=route, status=str(status)
+            )
+            _maybe_log_trace(scope["method"], route, status, elapsed, timings)
+
+
+def _maybe_log_trace(
+    method: str, route: str, status: int, elapsed: float, timings: Dict[str, float]
+) -> None:
+    """Log the stage breakdown for sampled or slow requests."""
+    slow = settings.TRACE_SLOW_MS > 0 and elapsed * 1000 >= settings.TRACE_SLOW_MS
+    sampled = settings.TRACE_SAMPLE_RATE > 0 and random.random() < settings.TRACE_SAMPLE_RATE
+    if not (slow or sampled):
+        return
+    stages = sorted(
+        ((k, v) for k, v in timings.items() if k != "total"),
+        key=lambda kv: kv[1],
+        reverse=True,
+    )
+    breakdown = " ".join(f"{k}={v * 1000:.1f}ms" for k, v in stages) or "-"
+    logger.info(
+        "trace %s %s status=%s total=%.1fms%s stages: %s",
+        method,
+        route,
+        status,
+        elapsed * 1000,
+        " SLOW" if slow else "",
+        breakdown,
+    )
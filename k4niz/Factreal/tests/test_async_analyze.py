@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+from backend.models.fact_checker import FactCheckResult
+from backend.services.api_service import ApiService
+from backend.services.classification_service import ClassificationResult
+from backend.services.explainability_service import Explanation
+from backend.utils.config import settings
+
+
+class SlowClassifier:
+    def classify(self, text):
+        time.sleep(0.2)
+        return ClassificationResult(label="biased", confidence=0.8, scores={}, flagged=True)
+
+
+class StubExplainer:
+    def explain(self, text, label):
+        return Explanation(text=label)
+
+
+class SlowFactChecker:
+    async def acheck(self, text):
+        await asyncio.sleep(0.2)
+        return FactCheckResult(veracity="supported", sources=["https://example.org"])
+
+
+def test_classification_and_fact_check_run_concurrently(monkeypatch):
+    monkeypatch.setattr(settings, "ENABLE_FACT_CHECK", True)
+    monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+    api = ApiService(
+        classifier=SlowClassifier(),
+        explainer=StubExplainer(),
+        fact_checker=SlowFactChecker(),
+    )
+
+    start = time.perf_counter()
+    result = asyncio.run(api.aanalyze("Some claim"))
+    elapsed = time.perf_counter() - start
+
+    assert result.classification.label == "biased"
+    assert result.fact_check["veracity"] == "supported"
+    assert elapsed < 0.35
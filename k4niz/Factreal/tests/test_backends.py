@@ -0,0 +1,100 @@
+import os
+import sys
+import types
+
+import pytest
+
+from backend.models import backends
+from backend.models.bias_model import BiasModel
+from backend.utils.config import settings
+
+
+class FakeORTModel:
+    exports = 0
+    fail_export = False
+
+    @classmethod
+    def from_pretrained(cls, name, export=False):
+        if export:
+            cls.exports += 1
+        model = cls()
+        model.source = name
+        return model
+
+    def save_pretrained(self, out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+        with open(os.path.join(out_dir, "model.onnx"), "w") as fh:
+            fh.write("onnx")
+        if self.fail_export:
+            raise RuntimeError("export crashed after writing model.onnx")
+
+
+class FakeTokenizer:
+    @classmethod
+    def from_pretrained(cls, name):
+        return cls()
+
+    def save_pretrained(self, out_dir):
+        with open(os.path.join(out_dir, "tokenizer.json"), "w") as fh:
+            fh.write("{}")
+
+
+@pytest.fixture
+def fake_libs(monkeypatch, tmp_path):
+    """Minimal transformers/optimum stand-ins recording how pipelines are built."""
+    calls = []
+
+    def pipeline(task, model=None, **kwargs):
+        calls.append((task, model))
+        return ("pipeline", task, model)
+
+    transformers = types.ModuleType("transformers")
+    transformers.pipeline = pipeline
+    transformers.AutoTokenizer = FakeTokenizer
+    optimum = types.ModuleType("optimum")
+    onnxruntime = types.ModuleType("optimum.onnxruntime")
+    onnxruntime.ORTModelForFeatureExtraction = FakeORTModel
+    optimum.onnxruntime = onnxruntime
+    monkeypatch.setitem(sys.modules, "transformers", transformers)
+    monkeypatch.setitem(sys.modules, "optimum", optimum)
+    monkeypatch.setitem(sys.modules, "optimum.onnxruntime", onnxruntime)
+    monkeypatch.setattr(settings, "FORCE_HEURISTIC", False)
+    monkeypatch.setattr(settings, "ONNX_CACHE_DIR", str(tmp_path / "onnx"))
+    monkeypatch.setattr(FakeORTModel, "exports", 0)
+    monkeypatch.setattr(FakeORTModel, "fail_export", False)
+    return calls
+
+
+def test_unknown_backend_falls_back_to_pytorch(fake_libs):
+    pipe, used = backends.build_pipeline("feature-extraction", "org/model", "tensorrt")
+    assert used == "pytorch"
+    assert fake_libs == [("feature-extraction", "org/model")]
+
+
+def test_force_heuristic_skips_transformers(fake_libs, monkeypatch):
+    monkeypatch.setattr(settings, "FORCE_HEURISTIC", True)
+    with pytest.raises(RuntimeError):
+        backends.build_pipeline("feature-extraction", "org/model", "pytorch")
+    assert BiasModel().backend == "heuristic"
+    assert fake_libs == []
+
+
+def test_onnx_export_is_reused(fake_libs):
+    _, used = backends.build_pipeline("feature-extraction", "org/model", "onnx")
+    _, again = backends.build_pipeline("feature-extraction", "org/model", "onnx")
+    target = backends.export_dir("org/model", "onnx")
+    assert used == again == "onnx"
+    assert FakeORTModel.exports == 1
+    assert sorted(os.listdir(target)) == ["model.onnx", "tokenizer.json"]
+    assert os.listdir(settings.ONNX_CACHE_DIR) == [os.path.basename(target)]
+
+
+def test_crashed_export_leaves_nothing_behind(fake_libs):
+    FakeORTModel.fail_export = True
+    _, used = backends.build_pipeline("feature-extraction", "org/model", "onnx")
+    assert used == "pytorch"
+    assert os.listdir(settings.ONNX_CACHE_DIR) == []
+    FakeORTModel.fail_export = False
+    _, used = backends.build_pipeline("feature-extraction", "org/model", "onnx")
+    assert used == "onnx"
+    assert FakeORTModel.exports == 2
@@ -0,0 +1,90 @@
+import threading
+
+from backend.models.bias_model import BiasPrediction
+from backend.services.batching_service import BatchScheduler
+
+
+class RecordingModel:
+    """Fake BiasModel that records the size of every batch it receives."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_batch(self, texts):
+        self.batches.append(list(texts))
+        return [BiasPrediction(label=t, score=1.0, details={t: 1.0}) for t in texts]
+
+
+def test_concurrent_requests_share_a_batch():
+    model = RecordingModel()
+    scheduler = BatchScheduler(model, max_batch_size=4, max_wait_ms=200)
+    results = {}
+    barrier = threading.Barrier(4)
+
+    def call(text):
+        barrier.wait()
+        results[text] = scheduler.predict(text)
+
+    threads = [threading.Thread(target=call, args=(f"t{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    scheduler.close()
+
+    assert sum(len(b) for b in model.batches) == 4
+    assert len(model.batches) < 4
+    for text, pred in results.items():
+        assert pred.label == text
+
+
+def test_batch_errors_reach_every_caller():
+    class FailingModel:
+        def predict_batch(self, texts):
+            raise ValueError("boom")
+
+    scheduler = BatchScheduler(FailingModel(), max_batch_size=2, max_wait_ms=0)
+    fut = scheduler.submit("x")
+    try:
+        fut.result(timeout=5)
+    except ValueError as e:
+        assert str(e) == "boom"
+    else:
+        raise AssertionError("expected ValueError")
+    scheduler.close()
+
+
+def test_short_prediction_list_fails_every_caller():
+    class ShortModel:
+        def predict_batch(self, texts):
+            return [BiasPrediction(label="neutral", score=1.0, details={})]
+
+    scheduler = BatchScheduler(ShortModel(), max_batch_size=2, max_wait_ms=200)
+    futures = [scheduler.submit("a"), scheduler.submit("b")]
+    for fut in futures:
+        try:
+            fut.result(timeout=5)
+        except RuntimeError as e:
+            assert "1 predictions for 2 texts" in str(e)
+        else:
+            raise AssertionError("expected RuntimeError")
+    scheduler.close()
+
+
+def test_submit_racing_close_never_strands_a_future():
+    scheduler = BatchScheduler(RecordingModel(), max_batch_size=4, max_wait_ms=0)
+    scheduler.predict("warm up")  # start the worker
+    queue_put = scheduler._queue.put
+    closer = threading.Thread(target=scheduler.close)
+
+    def put_after_close_started(item):
+        if item is not None and not closer.is_alive():
+            # close() runs between submit's closed check and its enqueue
+            closer.start()
+            closer.join(timeout=0.2)
+        queue_put(item)
+
+    scheduler._queue.put = put_after_close_started
+    fut = scheduler.submit("late")
+    closer.join()
+    assert fut.result(timeout=5).label == "late"
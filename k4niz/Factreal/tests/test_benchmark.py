@@ -0,0 +1,34 @@
+import asyncio
+
+import httpx
+
+from backend.main import app
+from backend.scripts.benchmark import drive, percentile
+from backend.utils.timing import parse_server_timing
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+def test_in_process_run_reports_stage_timings():
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await drive(client, "/classify", ["a text", "another one"], 6, 2)
+
+    result = asyncio.run(run())
+    assert result["errors"] == 0
+    assert result["latency_ms"]["count"] == 6
+    assert "total" in result["stages_ms"] and "preprocess" in result["stages_ms"]
+
+
+def test_server_timing_round_trip():
+    assert parse_server_timing("classify;dur=1.5, explain;dur=2") == {
+        "classify": 1.5,
+        "explain": 2.0,
+    }
@@ -0,0 +1,71 @@
+from backend.models.bias_model import BiasModel
+from backend.scripts.bias_mode_benchmark import DEFAULT_DATA, evaluate, load_labeled
+
+
+class FakeTokenizer:
+    padding_side = "right"
+
+    def __call__(self, texts, truncation=False):
+        return {"attention_mask": [[1] * len(text.split()) for text in texts]}
+
+
+class FakeEncoder:
+    """feature-extraction stand-in: one token vector per word, padded per batch."""
+
+    PAD = [0.0, 0.0, 0.0, 5.0]
+
+    def __init__(self):
+        self.calls = []
+        self.tokenizer = FakeTokenizer()
+
+    def __call__(self, texts, batch_size=None, truncation=False):
+        self.calls.append(list(texts))
+        longest = max(len(text.split()) for text in texts)
+        return [
+            [[self._vec(w) for w in text.lower().split()]
+             + [self.PAD] * (longest - len(text.split()))]
+            for text in texts
+        ]
+
+    @staticmethod
+    def _vec(word):
+        keys = ["neutral", "biased", "misleading", "propaganda"]
+        return [1.0 if k in word else 0.01 for k in keys]
+
+
+def _embedding_model():
+    model = BiasModel(mode="embedding")
+    model.pipeline = FakeEncoder()
+    return model
+
+
+def test_embedding_mode_caches_label_hypotheses():
+    model = _embedding_model()
+    model.predict_batch(["pure propaganda piece", "a neutral report"])
+    model.predict_batch(["biased take"])
+
+    hypothesis_calls = [c for c in model.pipeline.calls if c[0].startswith("This example")]
+    assert len(hypothesis_calls) == 1
+    # one encoder pass per predict_batch, plus the single hypothesis pass
+    assert len(model.pipeline.calls) == 3
+
+
+def test_embedding_mode_scores_rank_labels():
+    pred = _embedding_model().predict("pure propaganda piece")
+    assert pred.label == "propaganda"
+    assert abs(sum(pred.details.values()) - 1.0) < 1e-6
+
+
+def test_embedding_ignores_batch_padding():
+    model = _embedding_model()
+    alone = model._embed(["a neutral report"])[0]
+    batched = model._embed(["a neutral report", "one two three four five six seven"])[0]
+    assert alone == batched
+
+
+def test_benchmark_runs_on_shipped_sample():
+    samples = load_labeled(DEFAULT_DATA)
+    assert {label for _, label in samples} == set(BiasModel.CANDIDATE_LABELS)
+    res = evaluate(BiasModel(), samples, batch_size=8)
+    assert res["samples"] == len(samples)
+    assert 0.0 <= res["accuracy"] <= 1.0
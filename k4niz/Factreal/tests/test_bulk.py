@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services.bulk_service import iter_records
+
+
+client = TestClient(app)
+
+
+def _collect(chunks):
+    async def gen():
+        for c in chunks:
+            yield c
+
+    async def run():
+        return [r async for r in iter_records(gen())]
+
+    return asyncio.run(run())
+
+
+def test_iter_records_handles_split_chunks():
+    body = '[{"text": "a"}, "b", {"text": "café"}]'.encode("utf-8")
+    chunks = [body[i : i + 3] for i in range(0, len(body), 3)]
+    assert _collect(chunks) == [{"text": "a"}, "b", {"text": "café"}]
+
+    nd = b'{"text": "x"}\n\n{"text": "y"}'
+    assert _collect([nd[:5], nd[5:]]) == [{"text": "x"}, {"text": "y"}]
+
+
+def test_batch_endpoint_streams_ndjson():
+    body = "\n".join(
+        json.dumps({"id": i, "text": t})
+        for i, t in enumerate(["The sky is blue.", "This is a hoax.", "Water is wet."])
+    )
+    r = client.post("/classify/batch", content=body)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [line["id"] for line in lines] == [0, 1, 2]
+    assert all("label" in line and "flagged" in line for line in lines)
+
+
+def test_batch_endpoint_reports_bad_records():
+    r = client.post("/classify/batch", json=[{"text": "ok"}, {"nope": 1}])
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    errors = [line for line in lines if "error" in line]
+    assert len(lines) == 2 and errors[0]["index"] == 1
+
+
+def test_batch_stream_stops_when_client_disconnects():
+    from backend.routes.classify_router import _DuplexStreamingResponse
+
+    seen = []
+    sent = []
+    messages = [
+        {"type": "http.request", "body": b'{"text": "a"}\n', "more_body": True},
+        {"type": "http.disconnect"},
+    ]
+
+    async def produce(body):
+        async for chunk in body:
+            seen.append(chunk)
+            yield b"line\n"
+        seen.append("eof")
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(60)
+
+    async def send(message):
+        sent.append(message)
+
+    response = _DuplexStreamingResponse(produce, media_type="application/x-ndjson")
+    asyncio.run(asyncio.wait_for(response({"type": "http"}, receive, send), 5))
+
+    assert "eof" not in seen
+    assert not any(m.get("more_body") is False for m in sent)
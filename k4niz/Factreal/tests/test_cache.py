@@ -0,0 +1,95 @@
+import time
+
+from backend.services.api_service import ApiService
+from backend.services.cache_service import ResultCache, make_cache_key
+
+
+class CountingClassifier:
+    def __init__(self):
+        self.calls = 0
+
+    def classify(self, text):
+        from backend.services.classification_service import ClassificationResult
+
+        self.calls += 1
+        return ClassificationResult(label="neutral", confidence=0.9, scores={}, flagged=False)
+
+
+class StubExplainer:
+    def explain(self, text, label):
+        from backend.services.explainability_service import Explanation
+
+        return Explanation(text=f"{label}: {text}")
+
+
+def test_repeated_text_hits_cache():
+    classifier = CountingClassifier()
+    cache = ResultCache(max_entries=4)
+    api = ApiService(classifier=classifier, explainer=StubExplainer(), cache=cache)
+
+    first = api.analyze("Breaking   news today")
+    second = api.analyze(" Breaking news today ")
+
+    assert classifier.calls == 1
+    assert first.to_json() == second.to_json()
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_and_disk_tier(tmp_path):
+    db = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(max_entries=1, db_path=db)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.stats()["memory_entries"] == 1
+
+    # "a" was evicted from memory but is still on disk
+    assert cache.get("a") == {"v": 1}
+    assert cache.stats()["disk_hits"] == 1
+
+    reopened = ResultCache(max_entries=1, db_path=db)
+    assert reopened.get("b") == {"v": 2}
+
+
+def test_expired_entries_are_misses():
+    cache = ResultCache(ttl_seconds=0.001)
+    cache.set("k", {"v": 1})
+    time.sleep(0.01)
+    assert cache.get("k") is None
+
+
+def test_key_depends_on_text():
+    assert make_cache_key("a") != make_cache_key("b")
+
+
+def test_key_depends_on_forced_heuristic_and_loaded_backend(monkeypatch):
+    from backend.utils.config import settings
+
+    base = make_cache_key("a", ["pytorch"])
+    assert make_cache_key("a", ["heuristic"]) != base
+    monkeypatch.setattr(settings, "FORCE_HEURISTIC", not settings.FORCE_HEURISTIC)
+    assert make_cache_key("a", ["pytorch"]) != base
+
+
+def test_heuristic_fallback_does_not_serve_model_results():
+    class Model:
+        def __init__(self, backend):
+            self.backend = backend
+
+    classifier = CountingClassifier()
+    cache = ResultCache(max_entries=4)
+    api = ApiService(classifier=classifier, explainer=StubExplainer(), cache=cache)
+    classifier.model = Model("heuristic")  # the model failed to load
+    api.analyze("Breaking news today")
+    classifier.model = Model("pytorch")
+    api.analyze("Breaking news today")
+    assert classifier.calls == 2
+
+
+def test_cached_payloads_are_copies():
+    cache = ResultCache(max_entries=4)
+    payload = {"scores": {"neutral": 0.9}}
+    cache.set("k", payload)
+    payload["scores"]["neutral"] = 0.0
+    hit = cache.get("k")
+    hit["scores"]["neutral"] = 0.5
+    assert cache.get("k") == {"scores": {"neutral": 0.9}}
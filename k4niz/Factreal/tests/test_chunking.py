@@ -0,0 +1,82 @@
+from backend.models.bias_model import BiasPrediction
+from backend.services.classification_service import (
+    ClassificationService,
+    aggregate_predictions,
+)
+from backend.services.preprocessing_service import chunk_text
+
+
+class RecordingModel:
+    """Fake BiasModel: 'hoax' windows score as propaganda; records batches."""
+
+    tokenizer = None
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_batch(self, texts):
+        self.batches.append(list(texts))
+        out = []
+        for t in texts:
+            p = 0.9 if "hoax" in t else 0.1
+            out.append(
+                BiasPrediction(
+                    label="propaganda" if p > 0.5 else "neutral",
+                    score=max(p, 1 - p),
+                    details={"propaganda": p, "neutral": 1 - p},
+                )
+            )
+        return out
+
+    def predict(self, text):
+        return self.predict_batch([text])[0]
+
+
+def test_short_text_is_one_chunk():
+    chunks = chunk_text("a short text", max_tokens=10, overlap=2)
+    assert [c.text for c in chunks] == ["a short text"]
+
+
+def test_windows_are_bounded_and_overlap():
+    words = [f"w{i}" for i in range(25)]
+    chunks = chunk_text(" ".join(words), max_tokens=10, overlap=3)
+    assert [c.start for c in chunks] == [0, 7, 14, 21]
+    assert all(c.tokens <= 10 for c in chunks)
+    assert chunks[0].text.split()[-3:] == chunks[1].text.split()[:3]
+    assert chunks[-1].text.split()[-1] == "w24"
+
+
+def test_aggregation_strategies():
+    preds = [
+        BiasPrediction("propaganda", 0.9, {"propaganda": 0.9, "neutral": 0.1}),
+        BiasPrediction("neutral", 0.8, {"propaganda": 0.2, "neutral": 0.8}),
+    ]
+    assert aggregate_predictions(preds, strategy="max").label == "propaganda"
+    calm = BiasPrediction("neutral", 0.97, {"neutral": 0.97, "propaganda": 0.03})
+    biased = BiasPrediction("propaganda", 0.85, {"propaganda": 0.85, "neutral": 0.15})
+    worst = aggregate_predictions([calm, calm, calm, biased], strategy="max")
+    assert worst.label == "propaganda" and worst.score == 0.85
+    mean = aggregate_predictions(preds, strategy="mean")
+    assert mean.details["propaganda"] == 0.55
+    weighted = aggregate_predictions(preds, [1, 3], strategy="weighted")
+    assert weighted.label == "neutral"
+    assert weighted.details["neutral"] == (0.1 + 3 * 0.8) / 4
+
+
+def test_long_document_is_classified_in_one_batch(monkeypatch):
+    from backend.utils.config import settings
+
+    monkeypatch.setattr(settings, "CHUNK_MAX_TOKENS", 50)
+    monkeypatch.setattr(settings, "CHUNK_OVERLAP_TOKENS", 10)
+    monkeypatch.setattr(settings, "CHUNK_AGGREGATION", "max")
+    model = RecordingModel()
+    service = ClassificationService(model=model)
+    text = " ".join(["calm"] * 200 + ["hoax"])
+    result = service.classify(text)
+    assert len(model.batches) == 1
+    assert result.chunks == len(model.batches[0]) == 5
+    assert result.label == "propaganda" and result.flagged
+
+    results = service.classify_batch(["short one", text])
+    assert len(model.batches) == 2
+    assert [r.chunks for r in results] == [1, 5]
@@ -0,0 +1,93 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services.api_service import ApiService, NOT_FLAGGED_EXPLANATION
+from backend.services.cache_service import ResultCache
+from backend.services.classification_service import ClassificationResult
+from backend.services.explainability_service import Explanation
+from backend.services.explanation_queue import ExplanationQueue
+from backend.utils.config import settings
+
+
+client = TestClient(app)
+
+
+class CountingClassifier:
+    def __init__(self):
+        self.calls = 0
+
+    def classify(self, text):
+        self.calls += 1
+        return ClassificationResult(label="biased", confidence=0.9, scores={}, flagged=True)
+
+
+class StubExplainer:
+    def explain(self, text, label):
+        return Explanation(text=f"{label}: {text}")
+
+
+def test_flagged_policy_skips_neutral_texts(monkeypatch):
+    monkeypatch.setattr(settings, "EXPLANATION_POLICY", "flagged")
+    r = client.post("/classify", json={"text": "The sky is blue on a clear day."})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["flagged"] is False
+    assert data["explanation"] == NOT_FLAGGED_EXPLANATION
+
+
+def test_deferred_policy_returns_ticket(monkeypatch):
+    monkeypatch.setattr(settings, "EXPLANATION_POLICY", "deferred")
+    r = client.post("/classify", json={"text": "This vaccine is a hoax."})
+    assert r.status_code == 200
+    ticket = r.json()["explanation_ticket"]
+    assert ticket
+
+    for _ in range(100):
+        data = client.get(f"/explain/{ticket}").json()
+        if data["status"] != "pending":
+            break
+        time.sleep(0.02)
+    assert data["status"] == "done"
+    assert data["explanation"]
+
+
+def test_unknown_ticket_is_404():
+    assert client.get("/explain/does-not-exist").status_code == 404
+
+
+def test_deferred_results_are_cached_and_reuse_the_ticket(monkeypatch):
+    monkeypatch.setattr(settings, "EXPLANATION_POLICY", "deferred")
+    classifier = CountingClassifier()
+    cache = ResultCache(max_entries=4)
+    explanations = ExplanationQueue(explainer=StubExplainer(), workers=1, max_pending=4)
+    api = ApiService(
+        classifier=classifier, explainer=StubExplainer(), cache=cache, explanations=explanations
+    )
+
+    first = api.analyze("Breaking news today")
+    second = api.analyze("Breaking news today")
+
+    assert classifier.calls == 1
+    assert cache.stats()["hits"] == 1
+    assert first.explanation_ticket and second.explanation_ticket == first.explanation_ticket
+
+
+def test_reissued_ticket_gets_a_fresh_ttl(monkeypatch):
+    from types import SimpleNamespace
+
+    from backend.services import explanation_queue
+
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(explanation_queue, "time", SimpleNamespace(time=lambda: clock.now))
+    monkeypatch.setattr(settings, "EXPLANATION_TICKET_TTL_SECONDS", 60)
+    explanations = ExplanationQueue(explainer=StubExplainer(), workers=1, max_pending=4)
+
+    ticket = explanations.submit("Breaking news today", "biased")
+    other = explanations.submit("Other news", "biased")
+    clock.now += 50
+    assert explanations.submit("Breaking news today", "biased") == ticket
+    clock.now += 50  # 100s after the first issue, 50s after the reissue
+    assert explanations.get(ticket) is not None
+    assert explanations.get(other) is None
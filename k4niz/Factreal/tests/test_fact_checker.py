@@ -0,0 +1,174 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.models import fact_checker as fc
+from backend.models.fact_checker import CircuitBreaker, FactChecker, QueryCache
+from backend.utils.config import settings
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers /news like NewsAPI and /w/api.php like the MediaWiki search API."""
+
+    def do_GET(self):  # noqa: N802
+        server = self.server
+        route = "news" if self.path.startswith("/news") else "wiki"
+        server.hits[route] += 1
+        if server.barrier is not None:
+            server.barrier.wait()
+        server.gate[route].wait(5)
+        status = server.status[route]
+        if route in server.body:
+            body = server.body[route]
+        elif route == "news":
+            body = {"articles": [{"url": "https://news.example/a"}]}
+        else:
+            body = {"query": {"search": [{"title": "Climate change"}]}}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.hits = {"news": 0, "wiki": 0}
+    server.barrier = None  # set to require concurrent requests
+    server.gate = {"news": threading.Event(), "wiki": threading.Event()}
+    for gate in server.gate.values():
+        gate.set()
+    server.status = {"news": 200, "wiki": 200}
+    server.body = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(settings, "ENABLE_FACT_CHECK", True)
+    monkeypatch.setattr(settings, "NEWS_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "NEWS_API_URL", base + "/news")
+    monkeypatch.setattr(settings, "WIKIPEDIA_API_URL", base + "/w/api.php")
+    yield server
+    for gate in server.gate.values():
+        gate.set()
+    server.shutdown()
+    server.server_close()
+
+
+def make_checker(**kwargs):
+    kwargs.setdefault("cache", QueryCache(max_entries=100, ttl_seconds=60))
+    kwargs.setdefault("breakers", {})
+    return FactChecker(**kwargs)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sources_are_queried_concurrently_and_merged(stub):
+    # Neither request is answered until both have arrived
+    stub.barrier = threading.Barrier(2, timeout=5)
+    result = make_checker(timeout=10).check("Climate change is accelerating")
+    assert result.veracity == "supported"
+    assert result.sources == [
+        "https://news.example/a",
+        "https://en.wikipedia.org/wiki/Climate_change",
+    ]
+    assert result.notes is None
+
+
+def test_results_are_cached_per_query(stub):
+    checker = make_checker()
+    first = checker.check("Climate change is accelerating")
+    second = checker.check("Climate change is accelerating")
+    assert first.sources == second.sources
+    assert stub.hits == {"news": 1, "wiki": 1}
+
+
+def test_deadline_returns_partial_result(stub):
+    stub.gate["wiki"].clear()  # never answers before the deadline
+    result = make_checker(timeout=0.3).check("Climate change is accelerating")
+    assert result.sources == ["https://news.example/a"]
+    assert result.notes == "wikipedia: timeout"
+
+
+def test_breaker_stops_calling_failing_source(stub):
+    stub.status["news"] = 500
+    breakers = {"newsapi": CircuitBreaker(threshold=2, cooldown_seconds=60)}
+    checker = make_checker(breakers=breakers, cache=QueryCache(max_entries=0))
+    for _ in range(3):
+        result = checker.check("Climate change is accelerating")
+    assert stub.hits["news"] == 2
+    assert result.veracity == "supported"
+    assert result.notes == "newsapi: open"
+    assert breakers["newsapi"].state == "open"
+
+
+def test_breaker_half_open_trial_closes_on_success():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, cooldown_seconds=30, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial call at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_malformed_body_fails_the_half_open_trial(stub):
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, cooldown_seconds=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 30
+    stub.body["wiki"] = {"query": {"search": [{"no": "title"}]}}
+    checker = make_checker(sources=["wikipedia"], breakers={"wikipedia": breaker})
+    result = checker.check("Climate change is accelerating")
+    assert result.notes == "wikipedia: error"
+    assert breaker.state == "open"
+    clock.now += 30
+    del stub.body["wiki"]
+    result = checker.check("Climate change is accelerating")
+    assert result.veracity == "supported"
+    assert breaker.state == "closed"
+
+
+def test_failed_submit_releases_the_half_open_trial(stub, monkeypatch):
+    class BrokenPool:
+        def submit(self, *args):
+            raise RuntimeError("cannot schedule new futures after shutdown")
+
+    monkeypatch.setattr(fc, "_get_fanout_executor", lambda: BrokenPool())
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, cooldown_seconds=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 30
+    checker = make_checker(sources=["wikipedia"], breakers={"wikipedia": breaker})
+    assert checker.check("Climate change is accelerating").notes == "offline"
+    assert breaker.allow()  # the trial is available again
+
+
+def test_async_check_matches_sync(stub):
+    sync = make_checker().check("Climate change is accelerating")
+
+    async def run():
+        try:
+            return await make_checker().acheck("Climate change is accelerating")
+        finally:
+            await fc.aclose_async_client()
+
+    assert asyncio.run(run()) == sync
+    assert stub.hits == {"news": 2, "wiki": 2}
@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.utils.metrics import Histogram
+
+
+client = TestClient(app)
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    h.observe(0.05, stage="a")
+    h.observe(0.5, stage="a")
+    text = "\n".join(h.render())
+    assert 'demo_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="a",le="1"} 2' in text
+    assert 'demo_seconds_bucket{stage="a",le="+Inf"} 2' in text
+    assert 'demo_seconds_count{stage="a"} 2' in text
+
+
+def test_metrics_endpoint_exposes_stages_and_cache():
+    client.post("/classify", json={"text": "Metrics endpoint check."})
+    client.post("/classify", json={"text": "Metrics endpoint check."})
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    assert 'factreal_stage_duration_seconds_count{stage="classify"}' in body
+    assert 'factreal_http_request_duration_seconds_count{method="POST",route="/classify"' in body
+    assert 'factreal_cache_lookups_total{result="hit"}' in body
+    assert 'factreal_inference_batch_size_count{model="bias"}' in body
@@ -0,0 +1,87 @@
+import os
+import stat
+import threading
+from multiprocessing import AuthenticationError
+
+import pytest
+
+from backend.models import model_server
+from backend.models.bias_model import BiasModel
+from backend.models.model_server import (
+    ModelServer,
+    ModelServerClient,
+    ModelServerError,
+    RemoteBiasModel,
+    RemoteReasoningModel,
+)
+from backend.models.registry import ModelRegistry
+from backend.utils.config import settings
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_SERVER_AUTHKEY", "test-secret")
+    address = str(tmp_path / "models.sock")
+    srv = ModelServer(address)
+    srv.start()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield address
+    srv.close()
+
+
+def test_remote_models_match_local(server):
+    client = ModelServerClient(server)
+    texts = ["This is a hoax!", "The meeting is on Tuesday.", ""]
+    remote = RemoteBiasModel(client)
+    assert remote.backend == "remote:heuristic"
+    assert remote.predict_batch(texts) == BiasModel().predict_batch(texts)
+    explanation = RemoteReasoningModel(client).explain("This is a hoax!", "propaganda")
+    assert "propaganda" in explanation.explanation
+
+    with pytest.raises(ModelServerError):
+        client.call("nope")
+    # the connection stays usable after a server-side error
+    assert remote.predict("calm text").label == "neutral"
+    client.close()
+
+
+def test_registry_hands_out_proxies(server, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_SERVER_ADDRESS", server)
+    monkeypatch.setattr(model_server, "_client", None)
+    registry = ModelRegistry()
+    assert isinstance(registry.bias_model(), RemoteBiasModel)
+    assert isinstance(registry.reasoning_model(), RemoteReasoningModel)
+    # the server's own registry never proxies to itself
+    assert isinstance(ModelRegistry(use_model_server=False).bias_model(), BiasModel)
+    model_server._client.close()
+
+
+def test_socket_is_private_and_needs_the_key(server):
+    assert stat.S_IMODE(os.stat(server).st_mode) == 0o600
+    with pytest.raises(AuthenticationError):
+        ModelServerClient(server, authkey=b"wrong").call("info")
+    # a rejected client does not stop the server
+    assert ModelServerClient(server).call("info")["pid"] == os.getpid()
+
+
+def test_authkey_is_required(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_SERVER_AUTHKEY", None)
+    with pytest.raises(RuntimeError):
+        ModelServer(str(tmp_path / "models.sock"))
+    with pytest.raises(RuntimeError):
+        ModelServerClient(str(tmp_path / "models.sock"))
+
+
+def test_stalled_handshake_does_not_block_other_clients(server):
+    from multiprocessing.connection import Client
+
+    stalled = Client(server)  # connects but never answers the challenge
+    result = {}
+    caller = threading.Thread(
+        target=lambda: result.update(info=ModelServerClient(server).call("info")), daemon=True
+    )
+    caller.start()
+    caller.join(timeout=10)
+    stalled.close()
+    assert result["info"]["pid"] == os.getpid()
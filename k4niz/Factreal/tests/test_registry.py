@@ -0,0 +1,27 @@
+from backend.models.registry import ModelRegistry
+from backend.services.classification_service import ClassificationService
+
+
+class FakeModel:
+    model_name = "fake/model"
+    instances = 0
+
+    def __init__(self):
+        FakeModel.instances += 1
+
+
+def test_registry_loads_each_model_once():
+    reg = ModelRegistry()
+    first = reg.get("fake", FakeModel)
+    second = reg.get("fake", FakeModel)
+
+    assert first is second
+    assert FakeModel.instances == 1
+    [stats] = reg.stats()
+    assert stats["key"] == "fake" and stats["model_name"] == "fake/model"
+    assert stats["load_seconds"] >= 0 and stats["rss_delta_bytes"] >= 0
+
+
+def test_services_share_the_registry_model():
+    a, b = ClassificationService(), ClassificationService()
+    assert a.model is b.model